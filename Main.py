@@ -14,13 +14,19 @@ from views.user_dashboard import UserDashboard
 from views.slot_machine import SlotMachine
 from views.bets_window import BetsWindow
 from views.transaction_window import TransactionsWindow
+from views.diagnostics_window import DiagnosticsWindow
+from views.lazy_tabs import LazyTabs
 
 # Importamos las clases de los Modelos
 from models.Database.database_manager import DatabaseConnector
-from models.user_model import UserModel
+from models.Database.db_executor import DatabaseExecutor
+from models.Database.migrator import MigrationRunner
+from models.config.settings import Config
 from models.game_model import GameModel
-from models.bet_model import BetModel
-from models.transaction_model import TransactionModel
+from models.game_catalog import GameCatalog
+from models.avatar_ingest import AvatarIngest
+from models.ledger_model import LedgerModel
+from models.bet_journal import BetJournal
 
 # Importamos las clases de los Controladores
 from controllers.login_controller import LoginController
@@ -29,10 +35,15 @@ from controllers.dashboard_controller import DashboardController
 from controllers.slot_machine_controller import SlotMachineController
 from controllers.bet_controller import BetController
 from controllers.transaction_controller import TransactionController
+from controllers.report_engine import ReportEngine
+from controllers.session import UserSession
+from controllers.login_prefetch import LoginPrefetch
 
 
-# --- Función Principal de la Aplicación ---
-def main():
+# --- Construcción de la Aplicación ---
+# Crea la ventana principal con todas sus pestañas y devuelve la ventana raíz, sin iniciar
+# el bucle de eventos (así benchmarks/startup.py puede medir cuánto tarda en aparecer).
+def create_app():
     root = tk.Tk()
     root.title("Casino Vicario")
     root.geometry("800x600")
@@ -68,59 +79,138 @@ def main():
 
     db_connector = DatabaseConnector()
 
-    user_model = UserModel(db_connector)
-    game_model = GameModel(db_connector)
-    bet_model = BetModel(db_connector)
-    transaction_model = TransactionModel(db_connector)
-
-    login_frame = ttk.Frame(notebook, width=400, height=280)
-    register_frame = ttk.Frame(notebook, width=400, height=280)
-    dashboard_frame = ttk.Frame(notebook, width=400, height=280)
-    slot_machine_frame = ttk.Frame(notebook, width=400, height=280)
-    bets_frame = ttk.Frame(notebook, width=400, height=280)
-    transactions_frame = ttk.Frame(notebook, width=400, height=280)
-
-    login_frame.pack(fill="both", expand=True)
-    register_frame.pack(fill="both", expand=True)
-    dashboard_frame.pack(fill="both", expand=True)
-    slot_machine_frame.pack(fill="both", expand=True)
-    bets_frame.pack(fill="both", expand=True)
-    transactions_frame.pack(fill="both", expand=True)
-
-    notebook.add(login_frame, text="Login")
-    notebook.add(register_frame, text="Register")
-    notebook.add(dashboard_frame, text="Dashboard")
-    notebook.add(slot_machine_frame, text="Slot Machine")
-    notebook.add(bets_frame, text="Bets")
-    notebook.add(transactions_frame, text="Transactions")
-
-    dashboard_view = UserDashboard(dashboard_frame, db_connector, None, notebook)
-    dashboard_controller = dashboard_view.controller
-
-    slot_machine_view = SlotMachine(slot_machine_frame, db_connector, None, notebook)
-    slot_machine_controller = slot_machine_view.controller
+    # --- Menú de Diagnóstico (oculto) ---
+    # Estadísticas de las consultas a la base de datos (latencias, filas, errores, consultas lentas
+    # y desde qué pantalla se hicieron). Es para desarrollo: el menú aparece junto a "Tema" con
+    # Ctrl+Shift+D (o desde el inicio con DIAGNOSTICS_MENU=1).
+    diagnostics_menu = tk.Menu(menubar, tearoff=0)
+    diagnostics_menu.add_command(label="Consultas a la base de datos...",
+                                 command=lambda: DiagnosticsWindow(root, db_connector.stats))
+
+    def show_diagnostics_menu(event=None):
+        root.unbind_all("<Control-Shift-D>") # Se agrega una sola vez.
+        menubar.add_cascade(label="Diagnóstico", menu=diagnostics_menu)
+
+    if Config.QUERY_STATS_CONFIG['show_menu']:
+        show_diagnostics_menu()
+    else:
+        root.bind_all("<Control-Shift-D>", show_diagnostics_menu)
+    # Llevamos el esquema a la última versión antes de que cualquier vista lo consulte.
+    if Config.DB_AUTO_MIGRATE:
+        MigrationRunner(db_connector).upgrade()
+    # Ejecutor en segundo plano: las consultas de los controladores no bloquean el bucle de Tk.
+    db_executor = DatabaseExecutor(root)
+    # Motor de reportes PDF: cada reporte se genera en un proceso aparte.
+    report_engine = ReportEngine(root)
+
+    # Catálogo de juegos compartido: se carga una vez al iniciar y se refresca en segundo plano.
+    # Los demás modelos los crea cada pestaña al construirse.
+    game_catalog = GameCatalog(GameModel(db_connector))
+
+    # Sesión compartida: un solo 'usuario actual' para toda la aplicación. Los controladores
+    # se suscriben a sus eventos (inicio de sesión, saldo, apuesta o transacción nueva)
+    # y aplican solo lo que cambió, en lugar de recargarse unos a otros.
+    session = UserSession()
+    # Al iniciar sesión, las primeras páginas de los historiales y la imagen de perfil se piden
+    # todas a la vez y una sola vez; los controladores toman esas cargas en lugar de repetirlas.
+    login_prefetch = LoginPrefetch(db_connector)
+    login_prefetch.db_executor = db_executor
+    login_prefetch.attach_session(session)
+    # Las imágenes de perfil se preparan en un proceso aparte mientras el usuario completa el formulario.
+    avatar_ingest = AvatarIngest()
+    # Diario local de apuestas: cada jugada se anota en disco y se guarda en la base de datos
+    # en tandas, en segundo plano. Al iniciar reenvía lo que quedó sin guardar la vez anterior.
+    # Sus avisos llegan desde el hilo del diario: pasan al hilo de Tk y, si son de la sesión
+    # actual, los recibe el controlador de la tragamonedas (que se construye si hace falta).
+    def journal_event(method):
+        def deliver(user_id, *args):
+            if session.user_id == user_id:
+                getattr(tabs.controller("slot_machine"), method)(user_id, *args)
+        return lambda *args: db_executor.post(deliver, *args)
+
+    bet_journal = BetJournal(LedgerModel(db_connector),
+                             on_flushed=journal_event("on_journal_flushed"),
+                             on_rejected=journal_event("on_journal_rejected"))
+
+    # --- Pestañas ---
+    # Cada pestaña se construye (vista, modelos y controlador) la primera vez que se selecciona,
+    # o cuando su controlador hace falta para un evento: una pestaña que no se abre no cuesta nada.
+    # Al construirse, cada controlador recibe los servicios compartidos y se conecta a la sesión
+    # (si ya hay un usuario logueado, carga sus datos en ese momento).
+    tabs = LazyTabs(notebook)
+
+    def build_login(frame):
+        view = LoginWindow(frame, db_connector, notebook)
+        view.controller.session = session
+        view.controller.prefetch = login_prefetch
+        return view
+
+    def build_register(frame):
+        view = RegisterWindow(frame, db_connector)
+        view.controller.avatar_ingest = avatar_ingest
+        view.controller.db_executor = db_executor
+        return view
+
+    def build_dashboard(frame):
+        view = UserDashboard(frame, db_connector, None, notebook)
+        view.controller.db_executor = db_executor
+        view.controller.prefetch = login_prefetch
+        view.controller.attach_session(session)
+        return view
+
+    def build_slot_machine(frame):
+        view = SlotMachine(frame, db_connector, None, notebook)
+        view.controller.db_executor = db_executor
+        view.controller.game_catalog = game_catalog
+        view.controller.bet_journal = bet_journal
+        view.controller.attach_session(session)
+        return view
+
+    def build_bets(frame):
+        view = BetsWindow(frame, db_connector, None, notebook)
+        view.controller.db_executor = db_executor
+        view.controller.prefetch = login_prefetch
+        view.controller.report_engine = report_engine
+        view.controller.attach_session(session)
+        return view
+
+    def build_transactions(frame):
+        view = TransactionsWindow(frame, db_connector, None, notebook)
+        view.controller.db_executor = db_executor
+        view.controller.prefetch = login_prefetch
+        view.controller.report_engine = report_engine
+        view.controller.attach_session(session)
+        return view
+
+    tabs.add("login", "Login", build_login)
+    tabs.add("register", "Register", build_register)
+    tabs.add("dashboard", "Dashboard", build_dashboard)
+    tabs.add("slot_machine", "Slot Machine", build_slot_machine)
+    tabs.add("bets", "Bets", build_bets)
+    tabs.add("transactions", "Transactions", build_transactions)
+    tabs.view("login") # La pestaña visible al iniciar se construye de inmediato.
+
+    bet_journal.start()
+    db_executor.submit(game_catalog.load, key="game_catalog")
+    game_catalog.start_background_refresh(root, db_executor)
+
+    # Al cerrar la ventana, detenemos los reportes en curso, dejamos terminar las escrituras
+    # pendientes y liberamos las conexiones.
+    def on_close():
+        report_engine.shutdown()
+        avatar_ingest.shutdown()
+        bet_journal.close() # Lo que no alcance a guardarse queda en el diario para la próxima vez.
+        db_executor.shutdown()
+        db_connector.disconnect()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    return root
 
-    bets_view = BetsWindow(bets_frame, db_connector, None, notebook)
-    bet_controller = bets_view.controller
-
-    transactions_view = TransactionsWindow(transactions_frame, db_connector, None, notebook)
-    transaction_controller = transactions_view.controller
-    transaction_controller.dashboard_controller = dashboard_controller
-
-    dashboard_controller.slot_machine_controller = slot_machine_controller
-    dashboard_controller.bet_controller = bet_controller
-    dashboard_controller.transaction_controller = transaction_controller
-
-    slot_machine_view.controller.dashboard_controller = dashboard_controller
-
-    login_view = LoginWindow(login_frame, db_connector, notebook)
-    login_view.controller.dashboard_controller = dashboard_controller
-    login_view.controller.slot_machine_controller = slot_machine_controller
-    login_view.controller.bet_controller = bet_controller
-    login_view.controller.transaction_controller = transaction_controller
-
-    register_view = RegisterWindow(register_frame, db_connector)
 
+# --- Función Principal de la Aplicación ---
+def main():
+    root = create_app()
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,7 @@
+# benchmarks/__main__.py
+# Permite ejecutar los benchmarks con 'python -m benchmarks' (ver runner.py).
+import sys
+
+from benchmarks.runner import main
+
+sys.exit(main())
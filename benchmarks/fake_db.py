@@ -0,0 +1,100 @@
+# benchmarks/fake_db.py
+# Este archivo define el conector de base de datos de los benchmarks: un DatabaseConnector
+# con el motor SQLite sobre una base en memoria (mismo esquema que la aplicación), así los
+# controladores y modelos se ejecutan sin cambios y sin servidor.
+# Cada viaje a la base de datos (cada sentencia, y el inicio y el fin de cada transacción)
+# espera 'latency_ms' milisegundos, para simular la red de un servidor MySQL: un cambio que
+# ahorra consultas se nota en los tiempos aunque SQLite en memoria responda al instante.
+
+# --- Importación de Bibliotecas ---
+import datetime # Para las fechas del historial de ejemplo.
+import time # Para simular la latencia de cada viaje a la base de datos.
+from decimal import Decimal # Montos del usuario y del historial de ejemplo.
+
+from models.config.settings import Config # Configuración del pool (tamaño de la caché de sentencias).
+from models.Database.database_manager import DatabaseConnector
+from models.Database.sqlite_backend import SQLiteBackend, SQLiteStatements, MEMORY_PATH
+
+# Usuario de los benchmarks (se crea con un saldo que alcanza para todas las jugadas).
+BENCH_USER = {
+    'nombre': 'Benchmark',
+    'correo': 'benchmark@casino.test',
+    'contraseña': 'benchmark123',
+    'saldo': Decimal('10000000.00'),
+}
+
+
+# --- Definición de la Clase SimulatedLatencyBackend ---
+# Motor SQLite en memoria que espera 'latency_ms' en cada viaje a la base de datos.
+class SimulatedLatencyBackend(SQLiteBackend):
+    def __init__(self, latency_ms=0.5):
+        super().__init__({'path': MEMORY_PATH, 'busy_timeout': 0}, Config.DB_POOL_CONFIG)
+        self.latency = latency_ms / 1000
+
+    # Método que simula la demora de un viaje a la base de datos.
+    def round_trip(self):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def statements(self, cnx):
+        return SimulatedLatencyStatements(cnx, self.round_trip)
+
+    def begin(self, cnx):
+        self.round_trip()
+        super().begin(cnx)
+
+    def commit(self, cnx):
+        self.round_trip()
+        super().commit(cnx)
+
+
+# --- Definición de la Clase SimulatedLatencyStatements ---
+# Como en MySQL, un INSERT con muchas filas ('execute_many') es un solo viaje.
+class SimulatedLatencyStatements(SQLiteStatements):
+    def __init__(self, cnx, round_trip):
+        super().__init__(cnx)
+        self.round_trip = round_trip
+
+    def execute(self, sql, params=None):
+        self.round_trip()
+        return super().execute(sql, params)
+
+    def execute_many(self, sql, seq_params):
+        self.round_trip()
+        return super().execute_many(sql, seq_params)
+
+
+# --- Definición de la Clase FakeDatabaseConnector ---
+# - latency_ms: espera de cada viaje a la base de datos (0 para medir solo el código).
+class FakeDatabaseConnector(DatabaseConnector):
+    def __init__(self, latency_ms=0.5):
+        super().__init__(backend=SimulatedLatencyBackend(latency_ms))
+
+    # Método para crear el usuario de los benchmarks con un historial de 'bets' apuestas y
+    # 'transactions' transacciones (una por minuto hacia atrás). Devuelve el usuario creado.
+    # Las consultas de la carga no quedan en las estadísticas.
+    def seed(self, bets=2000, transactions=500):
+        now = datetime.datetime.now().replace(microsecond=0)
+        with self.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO usuarios (nombre, tipo_usuario, saldo, correo, edad, estado, contraseña) "
+                "VALUES (%s, 'usuario', %s, %s, 30, 'activo', %s)",
+                (BENCH_USER['nombre'], BENCH_USER['saldo'], BENCH_USER['correo'], BENCH_USER['contraseña'])
+            )
+            user_id = cursor.lastrowid
+            cursor.execute("SELECT idjuego FROM juegos WHERE nombre = 'tragamonedas'")
+            game_id = cursor.fetchone()['idjuego']
+            cursor.executemany(
+                "INSERT INTO apuestas (idcedula, idjuego, monto, resultado, ganancia, fecha_apuesta) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                [(user_id, game_id, Decimal('10.00'), 1 if i % 4 == 0 else 0,
+                  Decimal('20.00') if i % 4 == 0 else Decimal('0.00'),
+                  now - datetime.timedelta(minutes=i)) for i in range(bets, 0, -1)]
+            )
+            cursor.executemany(
+                "INSERT INTO transacciones (idcedula, tipo, metododepago, monto_transaccion, estado, fecha_transaccion) "
+                "VALUES (%s, 'deposito', 'PSE', %s, 'completado', %s)",
+                [(user_id, Decimal('100.00'), now - datetime.timedelta(minutes=i)) for i in range(transactions, 0, -1)]
+            )
+        self.stats.reset()
+        return dict(BENCH_USER, idcedula=user_id)
@@ -0,0 +1,143 @@
+# benchmarks/headless.py
+# Este archivo arma los controladores de la aplicación sin ventanas de Tk, para los benchmarks.
+# Las vistas se reemplazan por vistas sin pantalla que solo guardan lo que se les pide mostrar
+# (la tabla de un historial pide su primera página igual que PagedTreeview) y los mensajes
+# emergentes por un HeadlessUIPort. Los controladores, los modelos y la sesión son los reales.
+
+# --- Importación de Bibliotecas ---
+from collections import Counter # Para contar las llamadas que recibe cada vista.
+
+from controllers.bet_controller import BetController
+from controllers.login_controller import LoginController
+from controllers.login_prefetch import LoginPrefetch
+from controllers.session import UserSession
+from controllers.slot_machine_controller import SlotMachineController
+from controllers.transaction_controller import TransactionController
+from controllers.ui_port import HeadlessUIPort
+from models.bet_model import BetModel
+from models.game_catalog import GameCatalog
+from models.game_model import GameModel
+from models.transaction_model import TransactionModel
+from models.user_model import UserModel
+
+
+# --- Definición de la Clase HeadlessTable ---
+# Tabla de historial sin pantalla: pide y guarda las filas como PagedTreeview (primera página
+# al mostrar, solo los cambios al refrescar, filas nuevas arriba, como máximo 'max_rows'), sin desplazamiento.
+class HeadlessTable:
+    def __init__(self, row_key, page_size=100, max_rows=300):
+        self.row_key = row_key
+        self.page_size = page_size
+        self.max_rows = max_rows
+        self.rows = []
+        self.page_loader = None
+        self.sync_loader = None
+
+    def reset(self, page_loader, sync_loader=None):
+        self.page_loader = page_loader
+        self.sync_loader = sync_loader
+        self.rows = []
+        page_loader(None, False, self.page_size, self._on_page)
+
+    def refresh(self):
+        if self.sync_loader is None:
+            return
+        newest = max((self.row_key(row) for row in self.rows), default=None)
+        self.sync_loader(newest, [self.row_key(row) for row in self.rows], self.page_size, self._on_sync)
+
+    def add_newest(self, row):
+        if self.page_loader is not None:
+            self.rows.insert(0, row)
+            del self.rows[self.max_rows:]
+
+    def _on_page(self, rows):
+        self.rows.extend(rows or [])
+
+    def _on_sync(self, result):
+        new_rows, current_rows = result or ([], [])
+        current = {self.row_key(row): row for row in current_rows or []}
+        self.rows = list(new_rows or []) + [current[self.row_key(row)] for row in self.rows
+                                            if self.row_key(row) in current]
+
+
+# --- Definición de la Clase HeadlessView ---
+# Vista sin pantalla con los métodos que llaman los controladores de login, tragamonedas,
+# apuestas y transacciones. Cuenta las llamadas en 'calls'.
+class HeadlessView:
+    def __init__(self, row_key=None):
+        self.calls = Counter()
+        self.table = HeadlessTable(row_key) if row_key else None
+        self.saldo = None
+        self.results = None
+
+    def on_login_success(self, user):
+        self.calls['on_login_success'] += 1
+
+    def update_saldo(self, saldo):
+        self.calls['update_saldo'] += 1
+        self.saldo = saldo
+
+    def display_results(self, results, message):
+        self.calls['display_results'] += 1
+        self.results = (results, message)
+
+    def display_bets(self, page_loader, sync_loader=None):
+        self.calls['display'] += 1
+        self.table.reset(page_loader, sync_loader)
+
+    def refresh_bets(self):
+        self.calls['refresh'] += 1
+        self.table.refresh()
+
+    def add_bet(self, bet):
+        self.calls['add'] += 1
+        self.table.add_newest(bet)
+
+    # Las transacciones usan la misma tabla que las apuestas.
+    display_transactions = display_bets
+    refresh_transactions = refresh_bets
+    add_transaction = add_bet
+
+    def show_export_progress(self, *args, **kwargs):
+        self.calls['show_export_progress'] += 1
+
+    def hide_export_progress(self, *args, **kwargs):
+        self.calls['hide_export_progress'] += 1
+
+
+# --- Definición de la Clase HeadlessApp ---
+# Los cuatro controladores conectados a una sesión compartida, como en Main, sobre el conector
+# que se indique (FakeDatabaseConnector o DatabaseConnector). Sin ejecutor de BD ni diario de
+# apuestas: cada acción corre entera en el hilo que la llama, así su duración es la de la acción.
+class HeadlessApp:
+    def __init__(self, db):
+        self.db = db
+        self.ui = HeadlessUIPort()
+        self.session = UserSession()
+
+        user_model = UserModel(db)
+        game_model = GameModel(db)
+        game_catalog = GameCatalog(game_model)
+
+        self.login_view = HeadlessView()
+        self.slot_view = HeadlessView()
+        self.bets_view = HeadlessView(row_key=lambda bet: bet['idapuesta'])
+        self.transactions_view = HeadlessView(row_key=lambda trans: trans['idtransaccion'])
+
+        self.login_controller = LoginController(self.login_view, user_model)
+        self.slot_controller = SlotMachineController(self.slot_view, game_model, user_model)
+        self.slot_controller.game_catalog = game_catalog
+        self.bet_controller = BetController(self.bets_view, BetModel(db), user_model, game_model)
+        self.transaction_controller = TransactionController(self.transactions_view, TransactionModel(db), user_model)
+
+        # Precarga del login, como en Main: las primeras páginas de los historiales se piden una sola vez.
+        self.login_prefetch = LoginPrefetch(db)
+        self.login_prefetch.attach_session(self.session)
+
+        self.login_controller.session = self.session
+        for controller in (self.login_controller, self.bet_controller, self.transaction_controller):
+            controller.prefetch = self.login_prefetch
+        for controller in (self.login_controller, self.slot_controller, self.bet_controller, self.transaction_controller):
+            controller.ui = self.ui
+        for controller in (self.slot_controller, self.bet_controller, self.transaction_controller):
+            controller.attach_session(self.session)
@@ -0,0 +1,223 @@
+# benchmarks/runner.py
+# Este archivo define los benchmarks de los controladores y modelos, sin interfaz gráfica.
+# Cada acción del usuario (iniciar sesión, jugar, cargar o refrescar un historial, depositar)
+# se ejecuta a través de su controlador real y se mide:
+#   - latencia: mediana y p95 de la duración de la acción (milisegundos),
+#   - consultas: sentencias enviadas a la base de datos por acción (según QueryStats),
+#   - memoria: pico de memoria asignada durante la acción y memoria retenida después (tracemalloc).
+# La base de datos es, por defecto, un sustituto en memoria que simula la latencia de la red
+# (ver fake_db.py); con --mysql se usa la base de datos configurada en .env.
+# Los resultados se pueden guardar como línea base y comparar con una ejecución posterior:
+# una acción que hace más consultas, o cuya mediana empeora más que el umbral, es una regresión.
+#
+# Uso:
+#     python -m benchmarks                          # mide y muestra los resultados
+#     python -m benchmarks --save                   # guarda benchmarks/baseline.json
+#     python -m benchmarks --compare                # compara con benchmarks/baseline.json
+#     python -m benchmarks --mysql --email ... --password ...   # contra MySQL (usar una base de pruebas)
+
+# --- Importación de Bibliotecas ---
+import argparse # Para leer los parámetros de la línea de comandos.
+import datetime # Para la fecha de cada ejecución.
+import json # Para guardar y leer la línea base.
+import os # Para la ruta de la línea base.
+import platform # Para anotar en qué máquina se midió.
+import sys # Para el código de salida.
+import time # Para medir la duración de cada acción.
+import tracemalloc # Para medir la memoria asignada por cada acción.
+
+from benchmarks.headless import HeadlessApp # Controladores reales con vistas sin pantalla.
+
+# Línea base por defecto (se guarda junto a este archivo).
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Monto de cada jugada de los benchmarks (el mínimo de la tragamonedas).
+BET_AMOUNT = 10
+
+
+# Acciones medidas: nombre -> función que la ejecuta sobre una HeadlessApp con la sesión iniciada.
+# Las jugadas y los depósitos escriben en la base de datos (en el sustituto en memoria, o en MySQL con --mysql).
+def _actions(email, password):
+    return {
+        'login': lambda app: app.login_controller.login_user(email, password),
+        'spin': lambda app: app.slot_controller.play_slot_machine(BET_AMOUNT),
+        'autoplay_100': lambda app: app.slot_controller.autoplay(BET_AMOUNT, 100),
+        'bets_first_page': lambda app: app.bet_controller.load_user_bets(),
+        'bets_refresh': lambda app: app.bet_controller.refresh_user_bets(),
+        'deposit': lambda app: app.transaction_controller.request_deposit("50", "PSE"),
+        'transactions_first_page': lambda app: app.transaction_controller.load_user_transactions(),
+        'transactions_refresh': lambda app: app.transaction_controller.refresh_user_transactions(),
+    }
+
+
+# Función que devuelve cuántas sentencias lleva registradas el conector.
+def _query_count(db):
+    return sum(statement['calls'] for statement in db.stats.snapshot())
+
+
+# Función privada que ejecuta una acción y verifica que no haya mostrado errores al usuario.
+def _run(app, name, action):
+    action(app)
+    errors = app.ui.of_kind('error')
+    app.ui.clear()
+    if errors:
+        raise RuntimeError(f"La acción '{name}' falló: {errors[0][1]}")
+
+
+# Función que mide una acción. Devuelve un diccionario con sus resultados.
+# - repeat: cantidad de ejecuciones medidas (después de 'warmup' ejecuciones sin medir).
+# - alloc_repeat: ejecuciones medidas con tracemalloc (aparte: tracemalloc hace más lento el código).
+def measure_action(app, name, action, repeat=50, warmup=3, alloc_repeat=5):
+    for _ in range(warmup):
+        _run(app, name, action)
+
+    queries_before = _query_count(app.db)
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _run(app, name, action)
+        durations.append((time.perf_counter() - start) * 1000)
+    queries = (_query_count(app.db) - queries_before) / repeat
+
+    peak, retained = 0, 0
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_repeat):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            _run(app, name, action)
+            after, action_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, action_peak - before)
+            retained += after - before
+    finally:
+        tracemalloc.stop()
+
+    durations.sort()
+    return {
+        'median_ms': round(durations[len(durations) // 2], 3),
+        'p95_ms': round(durations[min(len(durations) - 1, int(0.95 * len(durations)))], 3),
+        'queries': round(queries, 2),
+        'peak_kib': round(peak / 1024, 1),
+        'retained_kib': round(retained / alloc_repeat / 1024, 1),
+    }
+
+
+# Función que ejecuta todos los benchmarks (o los de 'only') sobre un conector.
+# La sesión se inicia antes de medir, así cada acción parte de un usuario logueado.
+def run_benchmarks(db, email, password, repeat=50, only=None):
+    app = HeadlessApp(db)
+    actions = _actions(email, password)
+    if not app.login_controller.login_user(email, password):
+        raise RuntimeError(f"No se pudo iniciar sesión como {email}.")
+    app.ui.clear()
+    results = {}
+    for name, action in actions.items():
+        if only and name not in only:
+            continue
+        results[name] = measure_action(app, name, action, repeat)
+    return results
+
+
+# Función que compara unos resultados con la línea base.
+# Devuelve una lista de tuplas (acción, métrica, valor base, valor actual, es_regresión).
+# - threshold: empeoramiento relativo de la mediana que se considera regresión (0.25 = 25 %).
+def compare(baseline, results, threshold=0.25):
+    rows = []
+    for name, current in results.items():
+        base = baseline.get('actions', {}).get(name)
+        if base is None:
+            continue
+        rows.append((name, 'queries', base['queries'], current['queries'], current['queries'] > base['queries']))
+        rows.append((name, 'median_ms', base['median_ms'], current['median_ms'],
+                     current['median_ms'] > base['median_ms'] * (1 + threshold)))
+        rows.append((name, 'peak_kib', base['peak_kib'], current['peak_kib'],
+                     current['peak_kib'] > base['peak_kib'] * (1 + threshold) + 16))
+    return rows
+
+
+# Función que arma la tabla de resultados para la consola.
+def format_results(results):
+    lines = [f"{'Acción':<26}{'mediana ms':>12}{'p95 ms':>10}{'consultas':>11}{'pico KiB':>10}{'retenido KiB':>14}"]
+    for name, r in results.items():
+        lines.append(f"{name:<26}{r['median_ms']:>12.3f}{r['p95_ms']:>10.3f}{r['queries']:>11.2f}"
+                     f"{r['peak_kib']:>10.1f}{r['retained_kib']:>14.1f}")
+    return "\n".join(lines)
+
+
+# Función que arma la tabla de la comparación con la línea base.
+def format_comparison(rows):
+    lines = [f"{'Acción':<26}{'métrica':<12}{'base':>12}{'actual':>12}{'cambio':>10}"]
+    for name, metric, base, current, regression in rows:
+        change = f"{(current - base) / base * 100:+.0f}%" if base else "-"
+        lines.append(f"{name:<26}{metric:<12}{base:>12}{current:>12}{change:>10}{'  REGRESIÓN' if regression else ''}")
+    return "\n".join(lines)
+
+
+# Función privada que crea el conector pedido: el sustituto en memoria (con su usuario e
+# historial de ejemplo) o el DatabaseConnector real. Devuelve (conector, email, contraseña, descripción).
+def _connect(args):
+    if args.mysql:
+        # Importamos el conector aquí para que sin --mysql no haga falta un servidor.
+        from models.Database.database_manager import DatabaseConnector
+        if not args.email or not args.password:
+            raise SystemExit("Con --mysql hay que indicar --email y --password de un usuario de pruebas.")
+        return DatabaseConnector(), args.email, args.password, "mysql"
+
+    from benchmarks.fake_db import FakeDatabaseConnector
+    db = FakeDatabaseConnector(latency_ms=args.latency_ms)
+    user = db.seed(bets=args.history, transactions=args.history // 4)
+    return db, user['correo'], user['contraseña'], f"memoria (latencia {args.latency_ms} ms, historial {args.history})"
+
+
+# --- Punto de Entrada de la Línea de Comandos ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de los controladores y modelos, sin interfaz gráfica.")
+    parser.add_argument("--repeat", type=int, default=50, help="ejecuciones medidas por acción")
+    parser.add_argument("--only", default=None, help="acciones a medir, separadas por comas (ej. login,spin)")
+    parser.add_argument("--latency-ms", type=float, default=0.5, help="latencia simulada por viaje a la base de datos")
+    parser.add_argument("--history", type=int, default=2000, help="apuestas de ejemplo del usuario (y un cuarto de transacciones)")
+    parser.add_argument("--mysql", action="store_true", help="usar la base de datos MySQL configurada (escribe jugadas y depósitos)")
+    parser.add_argument("--email", default=None, help="usuario de pruebas (con --mysql)")
+    parser.add_argument("--password", default=None, help="contraseña del usuario de pruebas (con --mysql)")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="guardar los resultados como línea base (por defecto benchmarks/baseline.json)")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="comparar con una línea base (por defecto benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="empeoramiento relativo que se considera regresión")
+    args = parser.parse_args(argv)
+
+    db, email, password, backend = _connect(args)
+    try:
+        only = set(args.only.split(",")) if args.only else None
+        results = run_benchmarks(db, email, password, args.repeat, only)
+    finally:
+        db.disconnect()
+
+    print(f"Base de datos: {backend}. {args.repeat} ejecuciones por acción.\n")
+    print(format_results(results))
+
+    if args.save:
+        data = {
+            'generated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'backend': backend,
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'actions': results,
+        }
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"\nLínea base guardada en {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(baseline, results, args.threshold)
+        print(f"\nComparación con {args.compare} ({baseline.get('generated_at')}, {baseline.get('backend')}):")
+        print(format_comparison(rows))
+        if any(regression for *_, regression in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+# benchmarks/startup.py
+# Este archivo define el benchmark del arranque de la aplicación.
+# Inicia Main.py en un intérprete nuevo (con 'python -X importtime') y mide:
+#   - primera ventana: desde que se lanza el proceso hasta que la ventana principal,
+#     con todas sus pestañas, termina de dibujarse (el primer 'root.update()'),
+#   - importaciones: desde que se lanza el proceso hasta que termina 'import Main',
+#   - módulos: cuántos módulos se importaron, y cuáles son los más pesados (según -X importtime).
+# Las librerías pesadas (PDF, Excel, calendario, imágenes) se cargan la primera vez que se usan;
+# si alguna vuelve a importarse al iniciar, el benchmark lo marca como regresión.
+# Por defecto la aplicación usa una base SQLite temporal (no hace falta un servidor); con --mysql
+# usa la base de datos configurada en .env. Necesita una pantalla (la ventana se abre y se cierra).
+#
+# Uso:
+#     python -m benchmarks.startup                  # mide y muestra los resultados
+#     python -m benchmarks.startup --save           # guarda benchmarks/startup_baseline.json
+#     python -m benchmarks.startup --compare        # compara con benchmarks/startup_baseline.json
+#     python -m benchmarks.startup --imports-only   # solo las importaciones (sin pantalla)
+
+# --- Importación de Bibliotecas ---
+import argparse # Para leer los parámetros de la línea de comandos.
+import datetime # Para la fecha de cada ejecución.
+import json # Para guardar y leer la línea base.
+import os # Para las rutas y las variables de entorno del proceso.
+import platform # Para anotar en qué máquina se midió.
+import subprocess # Para iniciar la aplicación en un intérprete nuevo.
+import sys # Para el intérprete actual y el código de salida.
+import tempfile # Base de datos y diario de apuestas temporales.
+import time # Para medir los tiempos del arranque.
+
+# Carpeta del proyecto (donde está Main.py) y línea base por defecto (junto a este archivo).
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+# Librerías que no deben importarse al iniciar: se cargan al exportar, al abrir un
+# calendario o al procesar una imagen.
+DEFERRED_MODULES = ("fpdf", "openpyxl", "tkcalendar", "PIL", "numpy")
+# Cuántos de los módulos más pesados se muestran.
+HEAVIEST = 10
+
+# Programa que ejecuta el proceso medido: importa Main, crea la ventana, la dibuja y la cierra
+# como si el usuario la cerrara. Avisa cada etapa por su salida estándar.
+CHILD_PROGRAM = """
+import sys
+import Main
+print("@@imported", flush=True)
+if "--imports-only" not in sys.argv:
+    root = Main.create_app()
+    root.update()
+    print("@@window", flush=True)
+    root.tk.call(root.protocol("WM_DELETE_WINDOW"))
+"""
+
+
+# Función que lee la salida de 'python -X importtime'. Cada línea tiene la forma
+#     import time: <propio us> | <acumulado us> | <sangría><módulo>
+# y cada módulo aparece después de los que importó (con dos espacios más de sangría).
+# Devuelve (módulos importados, acumulado de 'Main' en us, [(acumulado us, módulo)] de lo que importó Main).
+def parse_importtime(text):
+    modules = set()
+    main_us = None
+    children = [] # Importaciones directas del último módulo de primer nivel.
+    main_children = []
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit(): # Encabezado de la tabla.
+            continue
+        name = name.rstrip()
+        module = name.strip()
+        modules.add(module)
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        if level == 1:
+            children.append((int(cumulative), module))
+        elif level == 0:
+            if module == "Main":
+                main_us = int(cumulative)
+                main_children = children
+            children = []
+    return modules, main_us, sorted(main_children, reverse=True)
+
+
+# Función que devuelve las librerías diferidas que aparecen entre los módulos importados.
+def deferred_loaded(modules):
+    return sorted({module.split(".")[0] for module in modules} & set(DEFERRED_MODULES))
+
+
+# Función privada que arma las variables de entorno del proceso medido.
+# Sin --mysql, la base de datos y el diario de apuestas van a una carpeta temporal.
+def _environment(workdir, use_mysql):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [PROJECT_DIR, env.get('PYTHONPATH')]))
+    if not use_mysql:
+        env['DB_BACKEND'] = 'sqlite'
+        env['SQLITE_PATH'] = os.path.join(workdir, "casino.db")
+    env['BET_JOURNAL_PATH'] = os.path.join(workdir, "bet_journal.jsonl")
+    return env
+
+
+# Función que inicia la aplicación una vez y mide su arranque. Devuelve un diccionario con los resultados.
+def measure_startup(imports_only=False, use_mysql=False, timeout=120):
+    with tempfile.TemporaryDirectory(prefix="casino_startup_") as workdir:
+        command = [sys.executable, "-X", "importtime", "-c", CHILD_PROGRAM]
+        if imports_only:
+            command.append("--imports-only")
+        # La salida de -X importtime (stderr) va a un archivo: es larga y llenaría el pipe.
+        with open(os.path.join(workdir, "importtime.txt"), "w+", encoding="utf-8") as err:
+            start = time.perf_counter()
+            process = subprocess.Popen(command, cwd=PROJECT_DIR, env=_environment(workdir, use_mysql),
+                                       stdout=subprocess.PIPE, stderr=err, text=True)
+            stages = {}
+            for line in process.stdout:
+                if line.startswith("@@"):
+                    stages[line.strip()[2:]] = (time.perf_counter() - start) * 1000
+            process.wait(timeout)
+            err.seek(0)
+            stderr = err.read()
+
+    if process.returncode != 0 or 'imported' not in stages:
+        errors = [line for line in stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("La aplicación no pudo iniciar:\n" + "\n".join(errors[-15:]))
+
+    modules, main_us, main_children = parse_importtime(stderr)
+    return {
+        'first_window_ms': round(stages['window'], 1) if 'window' in stages else None,
+        'imports_ms': round(stages['imported'], 1),
+        'main_import_ms': round(main_us / 1000, 1) if main_us is not None else None,
+        'modules': len(modules),
+        'deferred_loaded': deferred_loaded(modules),
+        'heaviest': [(module, round(us / 1000, 1)) for us, module in main_children[:HEAVIEST]],
+    }
+
+
+# Función que mide el arranque 'repeat' veces. Devuelve las medianas de los tiempos
+# y, de la última ejecución, los módulos importados.
+def run_startup(repeat=5, imports_only=False, use_mysql=False):
+    runs = [measure_startup(imports_only, use_mysql) for _ in range(repeat)]
+    result = dict(runs[-1])
+    for metric in ('first_window_ms', 'imports_ms', 'main_import_ms'):
+        values = sorted(run[metric] for run in runs if run[metric] is not None)
+        result[metric] = values[len(values) // 2] if values else None
+    return result
+
+
+# Función que compara unos resultados con la línea base.
+# Devuelve una lista de tuplas (métrica, valor base, valor actual, es_regresión).
+# - threshold: empeoramiento relativo que se considera regresión (0.25 = 25 %).
+def compare(baseline, result, threshold=0.25):
+    rows = []
+    base = baseline.get('startup', {})
+    for metric in ('first_window_ms', 'imports_ms', 'main_import_ms', 'modules'):
+        if base.get(metric) is None or result.get(metric) is None:
+            continue
+        rows.append((metric, base[metric], result[metric], result[metric] > base[metric] * (1 + threshold)))
+    return rows
+
+
+# Función que arma el resumen del arranque para la consola.
+def format_result(result):
+    def ms(value):
+        return f"{value:.1f} ms" if value is not None else "-"
+
+    lines = [
+        f"Primera ventana:        {ms(result['first_window_ms'])}",
+        f"Importaciones:          {ms(result['imports_ms'])} (import Main: {ms(result['main_import_ms'])})",
+        f"Módulos importados:     {result['modules']}",
+        f"Librerías diferidas:    {', '.join(result['deferred_loaded']) or 'ninguna cargada al iniciar'}",
+        "",
+        f"{'Importado por Main':<40}{'acumulado ms':>14}",
+    ]
+    for module, import_ms in result['heaviest']:
+        lines.append(f"{module:<40}{import_ms:>14.1f}")
+    return "\n".join(lines)
+
+
+# Función que arma la tabla de la comparación con la línea base.
+def format_comparison(rows):
+    lines = [f"{'métrica':<18}{'base':>12}{'actual':>12}{'cambio':>10}"]
+    for metric, base, current, regression in rows:
+        change = f"{(current - base) / base * 100:+.0f}%" if base else "-"
+        lines.append(f"{metric:<18}{base:>12}{current:>12}{change:>10}{'  REGRESIÓN' if regression else ''}")
+    return "\n".join(lines)
+
+
+# --- Punto de Entrada de la Línea de Comandos ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del arranque de la aplicación (tiempo hasta la primera ventana).")
+    parser.add_argument("--repeat", type=int, default=5, help="arranques medidos (se informa la mediana)")
+    parser.add_argument("--imports-only", action="store_true", help="medir solo las importaciones (no abre la ventana)")
+    parser.add_argument("--mysql", action="store_true", help="usar la base de datos MySQL configurada en lugar de una SQLite temporal")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="guardar los resultados como línea base (por defecto benchmarks/startup_baseline.json)")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="comparar con una línea base (por defecto benchmarks/startup_baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="empeoramiento relativo que se considera regresión")
+    args = parser.parse_args(argv)
+
+    try:
+        result = run_startup(args.repeat, args.imports_only, args.mysql)
+    except RuntimeError as e:
+        print(e)
+        return 2
+
+    print(f"Arranque de la aplicación ({args.repeat} ejecuciones, mediana):\n")
+    print(format_result(result))
+    failed = bool(result['deferred_loaded'])
+    if failed:
+        print(f"\nREGRESIÓN: se importan al iniciar librerías que deberían cargarse al usarlas: "
+              f"{', '.join(result['deferred_loaded'])}")
+
+    if args.save:
+        data = {
+            'generated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'startup': result,
+        }
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"\nLínea base guardada en {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(baseline, result, args.threshold)
+        print(f"\nComparación con {args.compare} ({baseline.get('generated_at')}):")
+        print(format_comparison(rows))
+        failed = failed or any(regression for *_, regression in rows)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
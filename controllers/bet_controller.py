@@ -4,9 +4,12 @@
 # y el Modelo (la lógica de datos y negocio).
 
 # --- Importación de Bibliotecas ---
-from fpdf import FPDF # Importamos FPDF para generar documentos PDF.
-import openpyxl       # Importamos openpyxl para trabajar con archivos Excel (.xlsx).
-from tkinter import messagebox # Para mostrar mensajes emergentes al usuario.
+from controllers.ui_port import TkUIPort # Mensajes emergentes al usuario (reemplazable sin pantalla).
+
+from models.Database.db_executor import submit_or_run, post_or_call # Para ejecutar las consultas fuera del hilo de Tk.
+from controllers.excel_exporter import stream_to_excel # Exportación a Excel fila a fila, con memoria constante.
+from controllers.report_engine import start_or_render # Reportes PDF generados en un proceso aparte.
+from controllers.session import UserSession, UserLoggedIn, BetPlaced # Sesión compartida y sus eventos.
 
 # --- Definición de la Clase BetController ---
 # Esta clase sigue el principio de Responsabilidad Única (SRP)
@@ -16,101 +19,176 @@ class BetController:
     # Esto es un ejemplo de Inyección de Dependencias.
     def __init__(self, view, bet_model, user_model, game_model):
         self.view = view             # La Vista asociada a este controlador (ej. BetsWindow).
+        self.ui = TkUIPort()         # Mensajes emergentes (un puerto sin pantalla en scripts y benchmarks).
         self.bet_model = bet_model   # El Modelo de Apuestas para interactuar con los datos de apuestas.
         self.user_model = user_model # El Modelo de Usuario para obtener información del usuario.
         self.game_model = game_model # El Modelo de Juego para obtener detalles de los juegos.
-        self.current_user = None     # Almacena los datos del usuario actualmente logueado.
+        self.db_executor = None      # Ejecutor en segundo plano para las consultas (se asigna desde Main).
+        self.date_filter = (None, None) # Último filtro de fechas aplicado (se reutiliza al exportar).
+        self.report_engine = None    # Motor de reportes PDF en segundo plano (se asigna desde Main).
+        self.prefetch = None         # Cargas hechas al iniciar sesión (se asigna desde Main).
+        # Sesión del usuario. Main la reemplaza por la sesión compartida de la aplicación.
+        self.attach_session(UserSession())
+
+    # Método para conectar el controlador a una sesión y suscribirse a sus eventos.
+    # Si la sesión ya tiene un usuario, el controlador se pone al día con él.
+    def attach_session(self, session):
+        self.session = session
+        session.bus.subscribe(UserLoggedIn, self._on_user_logged_in)
+        session.bus.subscribe(BetPlaced, self._on_bet_placed)
+        if session.is_logged_in: # La sesión ya empezó (ej. la pestaña se construyó después del login).
+            self._on_user_logged_in(UserLoggedIn(session.user))
+
+    # Datos del usuario actualmente logueado (los de la sesión compartida).
+    @property
+    def current_user(self):
+        return self.session.user
+
+    # Método privado que carga las apuestas del usuario que acaba de iniciar sesión.
+    def _on_user_logged_in(self, event):
+        self.load_user_bets()
 
-    # Método para establecer el usuario actual en el controlador.
-    # Se llama cuando un usuario inicia sesión.
-    def set_current_user(self, user_data):
-        self.current_user = user_data
-        self.load_user_bets() # Carga las apuestas del usuario una vez que se establece.
+    # Método privado que agrega una apuesta nueva al historial, sin volver a cargarlo.
+    # Si el filtro de fechas actual no incluye la apuesta, no se muestra.
+    def _on_bet_placed(self, event):
+        if self._matches_filter(event.bet['fecha_apuesta']):
+            self.view.add_bet(event.bet)
+
+    # Método privado que indica si una fecha cumple el filtro de fechas actual,
+    # con la misma comparación que hace la base de datos ('fecha <= AAAA-MM-DD' excluye ese día después de las 00:00).
+    def _matches_filter(self, fecha):
+        start_date, end_date = self.date_filter
+        fecha = str(fecha) # 'AAAA-MM-DD HH:MM:SS' se compara como texto con las fechas del filtro.
+        return (not start_date or fecha >= start_date) and (not end_date or fecha <= end_date)
 
     # Método para cargar y mostrar las apuestas del usuario, con opción de filtrar por fecha.
+    # La Vista pide las apuestas página a página a medida que el usuario se desplaza; aquí
+    # le entregamos la función que obtiene cada página en segundo plano. Si llega otra carga
+    # antes de que termine la anterior (ej. se aplica un nuevo filtro), la anterior se
+    # descarta gracias a la clave 'bets_page'.
     def load_user_bets(self, start_date=None, end_date=None):
         if self.current_user: # Verificamos que haya un usuario logueado.
-            # Obtenemos las apuestas del modelo, aplicando filtros de fecha si se proporcionan.
-            bets = self.bet_model.get_bets_by_user(self.current_user['idcedula'], start_date, end_date)
-            
-            # --- Mejora de Datos (Enriquecimiento) ---
-            # Para cada apuesta, obtenemos el nombre del juego asociado para mostrarlo en la vista.
-            enhanced_bets = []
-            for bet in bets:
-                game = self.game_model.get_game_by_id(bet['idjuego'])
-                bet['nombre_juego'] = game['nombre'] if game else 'Desconocido' # Asignamos el nombre del juego.
-                enhanced_bets.append(bet)
-            
-            # Le decimos a la Vista que muestre las apuestas mejoradas.
-            self.view.display_bets(enhanced_bets)
-
-    # Método para exportar la lista de apuestas a un archivo PDF.
-    # Utiliza la librería FPDF para crear el documento.
-    def export_bets_to_pdf(self, bets, filename="bets_report.pdf"):
-        if not bets: # Si no hay apuestas, mostramos un mensaje y salimos.
-            messagebox.showinfo("Exportar PDF", "No hay apuestas para exportar.")
-            return
+            self.date_filter = (start_date, end_date)
+            user_id = self.current_user['idcedula']
+
+            # El modelo devuelve cada apuesta ya con el nombre de su juego (un único JOIN en el servidor).
+            def load_page(cursor, before, limit, on_done):
+                def query():
+                    submit_or_run(
+                        self.db_executor, self.bet_model.get_bet_history_page,
+                        user_id, start_date, end_date, cursor, limit, before,
+                        on_success=on_done,
+                        key="bets_page"
+                    )
+                # La primera página sin filtro ya se pidió al iniciar sesión (ver LoginPrefetch).
+                if self.prefetch is not None and cursor is None and not (start_date or end_date):
+                    self.prefetch.take(user_id, "bets", on_done, query, limit)
+                else:
+                    query()
+
+            # Para refrescar, la tabla pide solo las apuestas nuevas y el estado de las que muestra.
+            def sync_page(since_id, bet_ids, limit, on_done):
+                submit_or_run(
+                    self.db_executor, self._sync_bets,
+                    user_id, start_date, end_date, since_id, bet_ids, limit,
+                    on_success=on_done,
+                    key="bets_sync"
+                )
 
-        pdf = FPDF()         # Creamos una nueva instancia de FPDF.
-        pdf.add_page()       # Añadimos una página al documento.
-        pdf.set_font("Arial", size=12) # Establecemos la fuente y el tamaño.
-
-        # Añadimos un título al reporte.
-        pdf.cell(200, 10, txt="Reporte de Apuestas", ln=True, align="C")
-        pdf.ln(10) # Añadimos un salto de línea.
-
-        # --- Encabezados de la Tabla PDF ---
-        pdf.set_font("Arial", size=10, style='B') # Fuente en negrita para los encabezados.
-        headers = ["ID", "Juego", "Monto", "Resultado", "Ganancia", "Fecha"]
-        col_widths = [15, 30, 25, 25, 25, 40] # Anchos de columna definidos manualmente.
-        for i, header in enumerate(headers):
-            pdf.cell(col_widths[i], 7, header, border=1, align="C") # Creamos una celda para cada encabezado.
-        pdf.ln() # Salto de línea después de los encabezados.
-
-        # --- Datos de la Tabla PDF ---
-        pdf.set_font("Arial", size=8) # Fuente normal para los datos.
-        for bet in bets: # Iteramos sobre cada apuesta para añadirla a la tabla.
-            pdf.cell(col_widths[0], 7, str(bet['idapuesta']), border=1)
-            pdf.cell(col_widths[1], 7, bet['nombre_juego'], border=1)
-            pdf.cell(col_widths[2], 7, f"${bet['monto']:.2f}", border=1)
-            pdf.cell(col_widths[3], 7, str(bet['resultado']), border=1)
-            pdf.cell(col_widths[4], 7, f"${bet['ganancia']:.2f}", border=1)
-            pdf.cell(col_widths[5], 7, str(bet['fecha_apuesta']), border=1)
-            pdf.ln() # Salto de línea después de cada fila de datos.
-
-        try:
-            pdf.output(filename) # Guardamos el documento PDF en el archivo especificado.
-            messagebox.showinfo("Exportar PDF", f"Reporte de apuestas exportado a {filename}")
-        except Exception as e:
-            messagebox.showerror("Error de Exportación", f"No se pudo exportar a PDF: {e}")
-
-    # Método para exportar la lista de apuestas a un archivo Excel (.xlsx).
-    # Utiliza la librería openpyxl para crear el libro de trabajo.
-    def export_bets_to_excel(self, bets, filename="bets_report.xlsx"):
-        if not bets: # Si no hay apuestas, mostramos un mensaje y salimos.
-            messagebox.showinfo("Exportar Excel", "No hay apuestas para exportar.")
+            self.view.display_bets(load_page, sync_page) # Le decimos a la Vista que muestre las apuestas.
+
+    # Método para refrescar las apuestas mostradas (ej. al volver a la pestaña), sin recargar la tabla:
+    # solo se agregan las apuestas nuevas y se actualizan o quitan las que cambiaron.
+    def refresh_user_bets(self):
+        if self.current_user:
+            self.view.refresh_bets()
+
+    # Método privado que obtiene los cambios del historial (se ejecuta en un hilo de trabajo).
+    # Devuelve una tupla (apuestas nuevas desde 'since_id', estado actual de las apuestas 'bet_ids').
+    def _sync_bets(self, user_id, start_date, end_date, since_id, bet_ids, limit):
+        new_bets = self.bet_model.get_bet_history_since(user_id, start_date, end_date, since_id, limit)
+        current_bets = self.bet_model.get_bet_history_by_ids(user_id, bet_ids, start_date, end_date)
+        return new_bets, current_bets
+
+    # Método para exportar las apuestas (con el filtro de fechas actual) a un archivo PDF.
+    # El reporte se genera en otro proceso (ver ReportEngine): lee las filas en bloques,
+    # repite los encabezados en cada página y termina con los totales por juego.
+    # La Vista muestra el progreso mientras tanto.
+    def export_bets_to_pdf(self, filename="bets_report.pdf"):
+        if not self.current_user:
+            self.ui.showinfo("Exportar PDF", "No hay apuestas para exportar.")
             return
+        start_date, end_date = self.date_filter
+        self.view.show_export_progress(0, None)
+        start_or_render(
+            self.report_engine, self.bet_model.db, "bets",
+            self.current_user['idcedula'], start_date, end_date, filename,
+            on_progress=self.view.show_export_progress,
+            on_done=lambda count: self._on_pdf_exported(count, filename),
+            on_error=self._on_pdf_failed
+        )
 
-        workbook = openpyxl.Workbook() # Creamos un nuevo libro de trabajo de Excel.
-        sheet = workbook.active        # Obtenemos la hoja activa (la primera por defecto).
-        sheet.title = "Reporte de Apuestas" # Establecemos el título de la hoja.
+    # Método privado que informa el final del reporte PDF (en el hilo de Tk).
+    def _on_pdf_exported(self, count, filename):
+        self.view.hide_export_progress()
+        if count == 0: # Si no hay apuestas, mostramos un mensaje.
+            self.ui.showinfo("Exportar PDF", "No hay apuestas para exportar.")
+        else:
+            self.ui.showinfo("Exportar PDF", f"Reporte de apuestas exportado a {filename} ({count} filas)")
 
-        # --- Encabezados de la Tabla Excel ---
-        headers = ["ID", "Juego", "Monto", "Resultado", "Ganancia", "Fecha"]
-        sheet.append(headers) # Añadimos los encabezados como la primera fila.
+    # Método privado que informa un error del reporte PDF (en el hilo de Tk).
+    def _on_pdf_failed(self, error):
+        self.view.hide_export_progress()
+        self.ui.showerror("Error de Exportación", f"No se pudo exportar a PDF: {error}")
 
-        # --- Datos de la Tabla Excel ---
-        for bet in bets: # Iteramos sobre cada apuesta para añadirla a la hoja.
-            sheet.append([
+    # Método para exportar las apuestas (con el filtro de fechas actual) a un archivo Excel (.xlsx).
+    # Las filas se leen de la base de datos en bloques y se escriben directamente en un libro de
+    # solo escritura, en segundo plano, así la memoria no crece con el tamaño del historial.
+    # La Vista muestra el progreso mientras tanto.
+    def export_bets_to_excel(self, filename="bets_report.xlsx"):
+        if not self.current_user:
+            self.ui.showinfo("Exportar Excel", "No hay apuestas para exportar.")
+            return
+        start_date, end_date = self.date_filter
+        self.view.show_export_progress(0, None)
+        submit_or_run(
+            self.db_executor, self._stream_bets_to_excel,
+            self.current_user['idcedula'], start_date, end_date, filename,
+            on_success=lambda count: self._on_excel_exported(count, filename),
+            on_error=self._on_excel_failed,
+            key="bets_excel"
+        )
+
+    # Método privado que hace la exportación (se ejecuta en un hilo de trabajo).
+    # Devuelve el número de apuestas exportadas.
+    def _stream_bets_to_excel(self, user_id, start_date, end_date, filename):
+        total = self.bet_model.count_bet_history_by_user(user_id, start_date, end_date)
+        if not total:
+            return 0
+        bets = self.bet_model.iter_bet_history_by_user(user_id, start_date, end_date)
+        return stream_to_excel(
+            bets, filename, "Reporte de Apuestas",
+            headers=["ID", "Juego", "Monto", "Resultado", "Ganancia", "Fecha"],
+            row_values=lambda bet: [
                 bet['idapuesta'],
                 bet['nombre_juego'],
                 bet['monto'],
                 bet['resultado'],
                 bet['ganancia'],
                 bet['fecha_apuesta']
-            ])
-        try:
-            workbook.save(filename) # Guardamos el libro de trabajo de Excel en el archivo especificado.
-            messagebox.showinfo("Exportar Excel", f"Reporte de apuestas exportado a {filename}")
-        except Exception as e:
-            messagebox.showerror("Error de Exportación", f"No se pudo exportar a Excel: {e}")
\ No newline at end of file
+            ],
+            progress=lambda count: post_or_call(self.db_executor, self.view.show_export_progress, count, total)
+        )
+
+    # Método privado que informa el final de la exportación (en el hilo de Tk).
+    def _on_excel_exported(self, count, filename):
+        self.view.hide_export_progress()
+        if count == 0: # Si no hay apuestas, mostramos un mensaje.
+            self.ui.showinfo("Exportar Excel", "No hay apuestas para exportar.")
+        else:
+            self.ui.showinfo("Exportar Excel", f"Reporte de apuestas exportado a {filename} ({count} filas)")
+
+    # Método privado que informa un error de la exportación (en el hilo de Tk).
+    def _on_excel_failed(self, error):
+        self.view.hide_export_progress()
+        self.ui.showerror("Error de Exportación", f"No se pudo exportar a Excel: {error}")
@@ -2,6 +2,10 @@
 # Este archivo define el controlador para el panel de usuario (Dashboard).
 # El Dashboard es la vista principal donde el usuario ve su información y opciones.
 
+from models.Database.db_executor import submit_or_run # Para ejecutar las consultas fuera del hilo de Tk.
+from models.avatar_store import DASHBOARD_AVATAR_SIZE # Tamaño de la imagen de perfil que muestra el Dashboard.
+from controllers.session import UserSession, UserLoggedIn, BalanceChanged # Sesión compartida y sus eventos.
+
 # --- Definición de la Clase DashboardController ---
 # Esta clase sigue el patrón de diseño MVC (Modelo-Vista-Controlador).
 # Su responsabilidad principal es gestionar la lógica del Dashboard,
@@ -12,43 +16,74 @@ class DashboardController:
     def __init__(self, view, user_model):
         self.view = view             # La Vista asociada a este controlador (UserDashboard).
         self.user_model = user_model # El Modelo de Usuario para interactuar con los datos del usuario.
-        self.current_user = None     # Almacena los datos del usuario actualmente logueado.
-        
-        # Referencias a otros controladores. Se inicializan como None y se asignan más tarde.
-        # Esto permite la comunicación entre diferentes partes de la aplicación (coordinación de controladores).
-        self.slot_machine_controller = None
-        self.bet_controller = None
-        self.transaction_controller = None
-
-    # Método para establecer el usuario actual en el controlador.
-    # Se llama cuando un usuario inicia sesión o cuando los datos del usuario se actualizan.
-    def set_current_user(self, user_data):
-        self.current_user = user_data       # Actualizamos el usuario actual en este controlador.
-        self.view.update_dashboard(user_data) # Le decimos a la Vista del Dashboard que se actualice con los nuevos datos.
-        
-        # --- Propagación de Datos del Usuario ---
-        # Es crucial que otros controladores también sepan quién es el usuario actual.
-        # Aquí, propagamos los datos del usuario a los controladores de la máquina tragamonedas, apuestas y transacciones.
-        # Esto es un ejemplo de comunicación entre controladores.
-        if self.slot_machine_controller:
-            self.slot_machine_controller.set_current_user(user_data)
-            # También pasamos referencias a los modelos y controladores de apuestas a la máquina tragamonedas.
-            # Esto es necesario para que la máquina tragamonedas pueda registrar apuestas y actualizar el saldo.
-            self.slot_machine_controller.bet_model = self.bet_controller.bet_model
-            self.slot_machine_controller.bet_controller = self.bet_controller
-        if self.bet_controller:
-            self.bet_controller.set_current_user(user_data)
-        if self.transaction_controller:
-            self.transaction_controller.set_current_user(user_data)
+        self.db_executor = None      # Ejecutor en segundo plano para las consultas (se asigna desde Main).
+        self.prefetch = None         # Cargas hechas al iniciar sesión (se asigna desde Main).
+        # Sesión del usuario. Main la reemplaza por la sesión compartida de la aplicación.
+        self.attach_session(UserSession())
+
+    # Método para conectar el controlador a una sesión y suscribirse a sus eventos.
+    # Si la sesión ya tiene un usuario, el controlador se pone al día con él.
+    # Los demás controladores se suscriben por su cuenta: el Dashboard ya no les reparte el usuario.
+    def attach_session(self, session):
+        self.session = session
+        session.bus.subscribe(UserLoggedIn, self._on_user_logged_in)
+        session.bus.subscribe(BalanceChanged, self._on_balance_changed)
+        if session.is_logged_in: # La sesión ya empezó (ej. la pestaña se construyó después del login).
+            self._on_user_logged_in(UserLoggedIn(session.user))
+
+    # Datos del usuario actualmente logueado (los de la sesión compartida).
+    @property
+    def current_user(self):
+        return self.session.user
+
+    # Método privado que muestra al usuario que acaba de iniciar sesión.
+    def _on_user_logged_in(self, event):
+        self.view.update_dashboard(event.user)
+        if self.prefetch is not None:
+            self.prefetch.mark("dashboard") # Etapa del login: el Dashboard ya muestra al usuario.
+
+    # Método privado que muestra el nuevo saldo. El resto de los datos no cambió,
+    # así que no hace falta volver a consultar al usuario.
+    def _on_balance_changed(self, event):
+        self.view.update_dashboard(self.current_user)
+
+    # Método para descargar la imagen de perfil de un usuario (en segundo plano).
+    # Las consultas de usuario solo traen la huella de la imagen; la Vista pide la imagen
+    # (en el tamaño exacto que muestra) solo cuando no la tiene en caché.
+    # Si la imagen ya se pidió al iniciar sesión (ver LoginPrefetch), se usa esa carga.
+    def load_avatar(self, user_id, image_hash):
+        on_done = lambda data: self.view.set_avatar(user_id, image_hash, data)
+
+        def query():
+            submit_or_run(
+                self.db_executor, self.user_model.avatar_store.get, image_hash, DASHBOARD_AVATAR_SIZE,
+                on_success=on_done,
+                key="avatar"
+            )
+
+        if self.prefetch is not None:
+            self.prefetch.take(user_id, "avatar", on_done, query)
+        else:
+            query()
 
     # Método para refrescar los datos del usuario desde la base de datos.
     # Se usa cuando el saldo o cualquier otra información del usuario puede haber cambiado (ej. después de un depósito).
     def refresh_user_data(self):
         if self.current_user: # Verificamos que haya un usuario logueado.
-            # Obtenemos la información más reciente del usuario desde el modelo.
-            updated_user = self.user_model.get_user_by_id(self.current_user['idcedula'])
-            if updated_user:
-                self.set_current_user(updated_user) # Si se obtienen datos, actualizamos el usuario actual.
-            else:
-                # Si no se pueden obtener los datos, imprimimos un error en la consola.
-                print("Error: No se pudieron refrescar los datos del usuario.")
\ No newline at end of file
+            # Obtenemos la información más reciente del usuario desde el modelo, en segundo plano.
+            # Si se piden varios refrescos seguidos, solo se aplica el último (clave 'user').
+            submit_or_run(
+                self.db_executor, self.user_model.get_user_by_id, self.current_user['idcedula'],
+                on_success=self._on_user_refreshed,
+                key="user"
+            )
+
+    # Método privado que aplica los datos refrescados del usuario (en el hilo de Tk).
+    # Se actualizan los datos de la misma sesión; los historiales no se recargan.
+    def _on_user_refreshed(self, updated_user):
+        if updated_user and self.current_user and updated_user['idcedula'] == self.current_user['idcedula']:
+            self.current_user.update(updated_user)
+            self.session.set_balance(updated_user['saldo']) # El Dashboard y las demás vistas muestran los datos nuevos.
+        elif updated_user is None:
+            # Si no se pueden obtener los datos, imprimimos un error en la consola.
+            print("Error: No se pudieron refrescar los datos del usuario.")
@@ -0,0 +1,34 @@
+# controllers/excel_exporter.py
+# Este archivo define la exportación a Excel en modo "streaming".
+# Un libro normal de openpyxl guarda todas las celdas en memoria hasta el final;
+# con un libro de solo escritura (write_only=True) cada fila se escribe en el
+# archivo temporal a medida que llega, así la memoria se mantiene constante
+# aunque se exporten millones de filas.
+
+# Cada cuántas filas se informa el progreso.
+PROGRESS_EVERY = 1000
+
+
+# Función para escribir un flujo de filas en un archivo Excel.
+# - rows: cualquier iterable de filas (normalmente un generador de DatabaseConnector.fetch_iter).
+# - row_values: función que convierte una fila en la lista de valores de la hoja.
+# - progress: función opcional que recibe cuántas filas se han escrito hasta ahora.
+# Devuelve el número de filas escritas.
+def stream_to_excel(rows, filename, sheet_title, headers, row_values, progress=None):
+    import openpyxl # Importamos openpyxl aquí (carga también numpy) para que solo se cargue al exportar.
+
+    workbook = openpyxl.Workbook(write_only=True) # Libro de solo escritura: no guarda las filas en memoria.
+    sheet = workbook.create_sheet(title=sheet_title)
+    sheet.append(headers) # Añadimos los encabezados como la primera fila.
+
+    count = 0
+    for row in rows:
+        sheet.append(row_values(row))
+        count += 1
+        if progress and count % PROGRESS_EVERY == 0:
+            progress(count)
+
+    workbook.save(filename) # Guardamos el libro de trabajo de Excel en el archivo especificado.
+    if progress:
+        progress(count)
+    return count
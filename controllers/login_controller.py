@@ -6,7 +6,10 @@
 # --- Importación de Bibliotecas ---
 import re # Importamos el módulo 're' para trabajar con Expresiones Regulares (regex).
           # Las regex son útiles para validar formatos de texto, como direcciones de correo electrónico.
-from tkinter import messagebox # Para mostrar mensajes emergentes (pop-ups) al usuario.
+import time # Para medir cuánto tarda la autenticación (ver LoginPrefetch).
+from controllers.ui_port import TkUIPort # Mensajes emergentes al usuario (reemplazable sin pantalla).
+
+from controllers.session import UserSession # Sesión compartida por todos los controladores.
 
 # --- Definición de la Clase LoginController ---
 # Esta clase es un ejemplo del patrón de diseño MVC (Modelo-Vista-Controlador).
@@ -16,22 +19,20 @@ class LoginController:
     # Esto es un ejemplo de Inyección de Dependencias.
     def __init__(self, view, user_model):
         self.view = view             # La Vista asociada a este controlador (LoginWindow).
+        self.ui = TkUIPort()         # Mensajes emergentes (un puerto sin pantalla en scripts y benchmarks).
         self.user_model = user_model # El Modelo de Usuario para interactuar con los datos de usuario (autenticación).
-        
-        # Referencias a otros controladores. Se inicializan como None y se asignan más tarde.
-        # Esto permite que, una vez que el usuario inicia sesión, este controlador pueda
-        # notificar a otras partes de la aplicación sobre el usuario logueado.
-        self.dashboard_controller = None
-        self.slot_machine_controller = None
-        self.bet_controller = None
-        self.transaction_controller = None
+        # Sesión del usuario. Main la reemplaza por la sesión compartida de la aplicación:
+        # al iniciar sesión aquí, todos los controladores suscritos reciben al usuario.
+        self.session = UserSession()
+        # Precarga de los datos del usuario al iniciar sesión (se asigna desde Main).
+        self.prefetch = None
 
     # Método principal para intentar iniciar sesión.
     # Recibe el email y la contraseña ingresados por el usuario.
     def login_user(self, email, password):
         # Primero, validamos que los campos de email y contraseña no estén vacíos.
         if not email or not password:
-            messagebox.showerror("Error", "Email y contraseña son requeridos.")
+            self.ui.showerror("Error", "Email y contraseña son requeridos.")
             return False # Indicamos que el login falló.
 
         # --- Validación de Email con Expresión Regular ---
@@ -39,32 +40,35 @@ class LoginController:
         # Esto asegura que el email tenga una estructura válida (ej. usuario@dominio.com).
         email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         if not re.match(email_regex, email): # Usamos re.match para comparar el email con la regex.
-            messagebox.showerror("Error", "El formato del email no es válido.")
+            self.ui.showerror("Error", "El formato del email no es válido.")
             return False # Indicamos que el login falló.
 
         # Intentamos obtener el usuario de la base de datos usando el modelo.
         # El modelo se encarga de la lógica de acceso a datos.
+        started = time.perf_counter()
         user = self.user_model.get_user_by_email_and_password(email, password)
 
         if user: # Si se encuentra un usuario con esas credenciales...
-            messagebox.showinfo("Éxito", f"¡Bienvenido, {user['nombre']}!") # Mostramos un mensaje de bienvenida.
-            
-            # --- Propagación de Información del Usuario Logueado ---
-            # Notificamos a todos los controladores relevantes sobre el usuario que acaba de iniciar sesión.
-            # Esto es crucial para que otras partes de la aplicación puedan mostrar datos específicos del usuario.
-            if self.dashboard_controller:
-                self.dashboard_controller.set_current_user(user)
-            if self.slot_machine_controller:
-                self.slot_machine_controller.set_current_user(user)
-            if self.bet_controller:
-                self.bet_controller.set_current_user(user)
-            if self.transaction_controller:
-                self.transaction_controller.set_current_user(user)
+            # --- Precarga ---
+            # La fila del usuario ya trae su saldo: el resto (primeras páginas de apuestas y
+            # transacciones, imagen de perfil) se pide ahora, todo a la vez y una sola vez.
+            # Los controladores toman esas cargas en lugar de repetir las consultas.
+            if self.prefetch is not None:
+                self.prefetch.start(user, started)
+
+            # --- Inicio de la Sesión ---
+            # Guardamos al usuario en la sesión compartida. Cada controlador suscrito (Dashboard,
+            # tragamonedas, apuestas, transacciones) se entera por el evento 'UserLoggedIn'.
+            self.session.login(user)
 
             # Le decimos a la Vista de Login que el inicio de sesión fue exitoso.
             # La vista puede entonces, por ejemplo, cambiar a la pestaña del dashboard.
             self.view.on_login_success(user)
+
+            # El mensaje de bienvenida se muestra con el Dashboard ya a la vista; mientras el usuario
+            # lo lee, las cargas siguen en segundo plano.
+            self.ui.showinfo("Éxito", f"¡Bienvenido, {user['nombre']}!") # Mostramos un mensaje de bienvenida.
             return True # Indicamos que el login fue exitoso.
         else: # Si no se encuentra un usuario o las credenciales son incorrectas...
-            messagebox.showerror("Error", "Email o contraseña incorrectos.")
+            self.ui.showerror("Error", "Email o contraseña incorrectos.")
             return False # Indicamos que el login falló.
@@ -0,0 +1,130 @@
+# controllers/login_prefetch.py
+# Este archivo define la precarga de datos al iniciar sesión.
+# Después de autenticar al usuario, la aplicación necesita la primera página de sus apuestas,
+# la de sus transacciones y su imagen de perfil. El saldo ya llega con la fila del usuario,
+# así que el Dashboard se muestra apenas termina la autenticación; las otras tres cargas se
+# envían enseguida, todas a la vez (cada una en un hilo del DatabaseExecutor), en lugar de
+# esperar a que cada pestaña las pida una detrás de otra.
+# Cada carga se hace una sola vez: el controlador que necesita esos datos (al recibir el
+# inicio de sesión o al construirse su pestaña) toma el resultado ya listo, o espera a la
+# carga en curso, en lugar de repetir la consulta.
+# También se registra cuánto tarda cada etapa, en milisegundos desde que empezó el login.
+
+# --- Importación de Bibliotecas ---
+import time # Para medir las etapas del inicio de sesión.
+
+from models.Database.db_executor import submit_or_run # Para ejecutar las cargas fuera del hilo de Tk.
+from models.bet_model import BetModel
+from models.transaction_model import TransactionModel
+from models.avatar_store import AvatarStore, DASHBOARD_AVATAR_SIZE # Imagen de perfil que muestra el Dashboard.
+from controllers.session import BetPlaced, TransactionAdded # Eventos que dejan obsoleta una precarga.
+
+# Filas de la primera página de los historiales (la que pide PagedTreeview).
+HISTORY_PAGE_SIZE = 100
+
+
+# --- Definición de la Clase LoginPrefetch ---
+class LoginPrefetch:
+    def __init__(self, db_connector, page_size=HISTORY_PAGE_SIZE):
+        self.bet_model = BetModel(db_connector)
+        self.transaction_model = TransactionModel(db_connector)
+        self.avatar_store = AvatarStore(db_connector)
+        self.page_size = page_size
+        self.db_executor = None # Ejecutor en segundo plano para las cargas (se asigna desde Main).
+        self.timings = {}       # Etapa -> milisegundos desde el inicio del último login.
+        self._user_id = None    # Usuario de la precarga en curso.
+        self._started = None    # Momento en que empezó el login (time.perf_counter).
+        self._pending = set()   # Etapas que todavía no llegaron.
+        self._results = {}      # Etapa -> resultado listo, que aún nadie tomó.
+        self._waiting = {}      # Etapa -> (on_done, fallback) de quien espera la carga en curso.
+        self._stale = set()     # Etapas en curso cuyo resultado ya no sirve (ver 'attach_session').
+
+    # Método para suscribirse a la sesión: una apuesta o una transacción nueva deja obsoleta
+    # la página precargada del historial correspondiente (nadie la agregó a esa página).
+    def attach_session(self, session):
+        session.bus.subscribe(BetPlaced, lambda event: self._discard("bets"))
+        session.bus.subscribe(TransactionAdded, lambda event: self._discard("transactions"))
+
+    # Método para empezar las cargas del usuario que acaba de autenticarse.
+    # - started: momento en que empezó el login (time.perf_counter), para medir la etapa 'auth'.
+    # Las cargas de un login anterior que sigan en curso se descartan al llegar.
+    def start(self, user, started=None):
+        self._user_id = user['idcedula']
+        self._started = started if started is not None else time.perf_counter()
+        self.timings = {}
+        self._results = {}
+        self._waiting = {}
+        self._stale = set()
+        self.mark("auth")
+
+        loads = {
+            "bets": (self.bet_model.get_bet_history_page, self._user_id, None, None, None, self.page_size, False),
+            "transactions": (self.transaction_model.get_transactions_page, self._user_id, None, None, None, self.page_size, False),
+        }
+        if user.get('avatar_hash'):
+            loads["avatar"] = (self.avatar_store.get, user['avatar_hash'], DASHBOARD_AVATAR_SIZE)
+        self._pending = set(loads)
+        for stage, (fn, *args) in loads.items():
+            # Cada etapa tiene su propia clave: se ejecutan a la vez, y un nuevo login reemplaza a la anterior.
+            submit_or_run(
+                self.db_executor, fn, *args,
+                on_success=lambda result, stage=stage, user_id=self._user_id: self._on_loaded(user_id, stage, result),
+                on_error=lambda error, stage=stage, user_id=self._user_id: self._on_failed(user_id, stage, error),
+                key=f"login_{stage}"
+            )
+
+    # Método para registrar el momento en que terminó una etapa.
+    def mark(self, stage):
+        if self._started is not None:
+            self.timings[stage] = round((time.perf_counter() - self._started) * 1000, 1)
+
+    # Método para tomar el resultado de una etapa del usuario 'user_id'.
+    # Si ya llegó, se entrega a 'on_done' ahora; si sigue en curso, se entregará al llegar.
+    # Cada resultado se entrega una sola vez. Si no hay nada precargado para esa etapa (o la
+    # página pedida no es la precargada), o si la carga falla, se llama a 'fallback', que
+    # hace la consulta de siempre.
+    # - limit: filas de la página que se pide (solo para las etapas de los historiales).
+    def take(self, user_id, stage, on_done, fallback, limit=None):
+        if user_id != self._user_id or (limit is not None and limit != self.page_size):
+            fallback()
+        elif stage in self._results:
+            on_done(self._results.pop(stage))
+        elif stage in self._pending and stage not in self._stale:
+            self._waiting[stage] = (on_done, fallback)
+        else:
+            fallback()
+
+    # Método privado que recibe el resultado de una etapa (en el hilo de Tk).
+    def _on_loaded(self, user_id, stage, result):
+        if user_id != self._user_id: # Es de un login anterior.
+            return
+        self._finish(stage)
+        waiting = self._waiting.pop(stage, None)
+        if waiting is not None:
+            waiting[0](result)
+        elif stage not in self._stale:
+            self._results[stage] = result
+
+    # Método privado que recibe el error de una etapa: quien la espere hace la consulta de siempre.
+    def _on_failed(self, user_id, stage, error):
+        if user_id != self._user_id:
+            return
+        print(f"Error al precargar '{stage}': {error}")
+        self._finish(stage)
+        waiting = self._waiting.pop(stage, None)
+        if waiting is not None:
+            waiting[1]()
+
+    # Método privado que da por terminada una etapa y, con la última, registra el total.
+    def _finish(self, stage):
+        self.mark(stage)
+        self._pending.discard(stage)
+        if not self._pending:
+            self.mark("complete")
+
+    # Método privado que descarta el resultado de una etapa que quedó obsoleta.
+    # Si alguien ya lo espera, se le entrega igual: su vista recibe los cambios por los eventos de la sesión.
+    def _discard(self, stage):
+        self._results.pop(stage, None)
+        if stage in self._pending and stage not in self._waiting:
+            self._stale.add(stage)
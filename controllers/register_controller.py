@@ -6,9 +6,11 @@
 # --- Importación de Bibliotecas ---
 import re # Importamos el módulo 're' para trabajar con Expresiones Regulares (regex).
           # Las regex son útiles para validar formatos de texto, como direcciones de correo electrónico y nombres.
-from tkinter import messagebox # Para mostrar mensajes emergentes (pop-ups) al usuario.
+from controllers.ui_port import TkUIPort # Mensajes emergentes al usuario (reemplazable sin pantalla).
 from datetime import datetime  # Importamos 'datetime' para trabajar con fechas y calcular la edad.
 
+from models.avatar_ingest import check_avatar_limits, make_preview, ingest_avatar # Preparación de imágenes de perfil.
+
 # --- Definición de la Clase RegisterController ---
 # Esta clase es un ejemplo del patrón de diseño MVC (Modelo-Vista-Controlador).
 # Su responsabilidad es manejar la lógica de registro de usuarios.
@@ -17,45 +19,103 @@ class RegisterController:
     # Esto es un ejemplo de Inyección de Dependencias.
     def __init__(self, view, user_model):
         self.view = view             # La Vista asociada a este controlador (RegisterWindow).
+        self.ui = TkUIPort()         # Mensajes emergentes (un puerto sin pantalla en scripts y benchmarks).
         self.user_model = user_model # El Modelo de Usuario para interactuar con los datos de usuario (creación).
+        self.db_executor = None      # Ejecutor en segundo plano (se asigna desde Main); entrega resultados en el hilo de Tk.
+        self.avatar_ingest = None    # Pool de procesos que prepara las imágenes de perfil (se asigna desde Main).
+        self.avatar = None           # Imagen de perfil ya preparada: tupla (hash, {tamaño: bytes PNG}).
+        self.avatar_pending = False  # True mientras la imagen seleccionada se está preparando.
+
+    # Método para preparar la imagen de perfil elegida, apenas el usuario la selecciona.
+    # Los límites se comprueban y la vista previa se genera al instante; el trabajo pesado
+    # (decodificar, orientar y redimensionar) se hace en otro proceso, y al terminar se
+    # avisa a la Vista. Así, al registrar, la imagen ya está lista.
+    def prepare_avatar(self, image_data):
+        self.avatar = None
+        try:
+            check_avatar_limits(image_data)
+            preview = make_preview(image_data)
+        except ValueError as e:
+            self.ui.showerror("Error", f"No se pudo usar la imagen: {e}")
+            self.view.clear_image()
+            return False
+        if preview is not None:
+            self.view.show_preview(preview)
+
+        self.avatar_pending = True
+        on_success = lambda avatar: self._on_avatar_ready(avatar, preview is None)
+        if self.avatar_ingest is not None and self.db_executor is not None:
+            self.db_executor.watch(self.avatar_ingest.submit(image_data),
+                                   on_success=on_success, on_error=self._on_avatar_failed, key="avatar_ingest")
+        else: # Sin pool de procesos (ej. en scripts), la preparamos aquí mismo.
+            try:
+                avatar = ingest_avatar(image_data)
+            except Exception as e:
+                self._on_avatar_failed(e)
+                return False
+            on_success(avatar)
+        return True
+
+    # Método privado que guarda la imagen preparada (en el hilo de Tk).
+    def _on_avatar_ready(self, avatar, needs_preview):
+        self.avatar = avatar
+        self.avatar_pending = False
+        image_hash, variants = avatar
+        if needs_preview: # El formato no admitía una vista previa rápida: usamos la variante pequeña.
+            self.view.show_preview_png(variants[min(variants)])
+        self.view.on_avatar_ready()
+
+    # Método privado que informa que la imagen no se pudo preparar (en el hilo de Tk).
+    def _on_avatar_failed(self, error):
+        self.avatar = None
+        self.avatar_pending = False
+        self.ui.showerror("Error", f"No se pudo procesar la imagen: {error}")
+        self.view.clear_image()
+
+    # Método para descartar la imagen seleccionada (ej. al limpiar el formulario).
+    def clear_avatar(self):
+        self.avatar = None
+        self.avatar_pending = False
+        if self.db_executor is not None:
+            self.db_executor.cancel("avatar_ingest")
 
     # Método principal para intentar registrar un nuevo usuario.
-    # Recibe los datos del formulario de registro y los datos binarios de la imagen de perfil.
-    def register_user(self, user_data, image_data):
+    # Recibe los datos del formulario de registro; la imagen de perfil es la que se preparó con 'prepare_avatar'.
+    def register_user(self, user_data):
         # --- Validación de Campos ---
         # 1. Validamos que todos los campos requeridos no estén vacíos.
         if not all(user_data.values()):
-            messagebox.showerror("Error", "Todos los campos son requeridos")
+            self.ui.showerror("Error", "Todos los campos son requeridos")
             return False # Indicamos que el registro falló.
 
         # 2. Validación de email con expresión regular.
         # Aseguramos que el email tenga un formato válido.
         email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         if not re.match(email_regex, user_data['email']):
-            messagebox.showerror("Error", "El formato del email no es válido.")
+            self.ui.showerror("Error", "El formato del email no es válido.")
             return False
 
         # 3. Validación de longitud y caracteres para nombre y apodo.
         # Aseguramos que estos campos cumplan con ciertos criterios de longitud y contenido.
         for field in ['nombre', 'apodo']:
             if len(user_data[field]) < 2 or len(user_data[field]) > 50:
-                messagebox.showerror("Error", f"El {field} debe tener entre 2 y 50 caracteres.")
+                self.ui.showerror("Error", f"El {field} debe tener entre 2 y 50 caracteres.")
                 return False
             # Permitimos letras, números, espacios y guiones bajos.
             if not re.match(r'^[a-zA-Z0-9_ ]*$', user_data[field]):
-                messagebox.showerror("Error", f"El {field} solo puede contener letras, números, espacios y guiones bajos.")
+                self.ui.showerror("Error", f"El {field} solo puede contener letras, números, espacios y guiones bajos.")
                 return False
 
         # 4. Validación de longitud para la contraseña.
         # Aseguramos que la contraseña tenga una longitud mínima para mayor seguridad.
         if len(user_data['contraseña']) < 8:
-            messagebox.showerror("Error", "La contraseña debe tener al menos 8 caracteres.")
+            self.ui.showerror("Error", "La contraseña debe tener al menos 8 caracteres.")
             return False
 
         # 5. Validación de celular (solo números).
         # Aseguramos que el número de celular contenga solo dígitos.
         if not user_data['celular'].isdigit():
-            messagebox.showerror("Error", "El celular solo debe contener números.")
+            self.ui.showerror("Error", "El celular solo debe contener números.")
             return False
         
         # 6. Validación de edad basada en la fecha de nacimiento.
@@ -67,22 +127,27 @@ class RegisterController:
             # Calculamos la edad.
             age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
             if age < 18: # Verificamos que el usuario sea mayor de 18 años.
-                messagebox.showerror("Error", "Debes ser mayor de 18 años para registrarte.")
+                self.ui.showerror("Error", "Debes ser mayor de 18 años para registrarte.")
                 return False
             user_data['edad'] = age # Actualizamos la edad en los datos del usuario.
         except ValueError: # Capturamos errores si el formato de fecha es incorrecto.
-            messagebox.showerror("Error", "Formato de fecha de nacimiento inválido.")
+            self.ui.showerror("Error", "Formato de fecha de nacimiento inválido.")
+            return False
+
+        # 7. La imagen de perfil debe haber terminado de prepararse.
+        if self.avatar_pending:
+            self.ui.showinfo("Imagen de Perfil", "La imagen de perfil aún se está procesando. Inténtalo en un momento.")
             return False
 
         # --- Creación del Usuario en el Modelo ---
         # Si todas las validaciones pasan, llamamos al modelo para crear el usuario en la base de datos.
         # El modelo encapsula la lógica de persistencia de datos.
-        success = self.user_model.create_user(user_data, image_data)
+        success = self.user_model.create_user(user_data, avatar=self.avatar)
 
         if success: # Si el modelo reporta que el usuario fue creado exitosamente...
-            messagebox.showinfo("Éxito", "Usuario registrado exitosamente!")
+            self.ui.showinfo("Éxito", "Usuario registrado exitosamente!")
             self.view.clear_form() # Le decimos a la Vista que limpie el formulario.
             return True # Indicamos que el registro fue exitoso.
         else: # Si el modelo reporta un fallo (ej. email o cédula ya existen)...
-            messagebox.showerror("Error", "No se pudo registrar el usuario. El email o la cédula ya podrían existir.")
+            self.ui.showerror("Error", "No se pudo registrar el usuario. El email o la cédula ya podrían existir.")
             return False # Indicamos que el registro falló.
@@ -0,0 +1,256 @@
+# controllers/report_engine.py
+# Este archivo define el motor de reportes PDF.
+# Dibujar miles de filas con FPDF ocupa la CPU durante segundos; si se hace en el
+# hilo de Tk la aplicación se congela. Por eso cada reporte se genera en un proceso
+# aparte, que abre su propia conexión a la base de datos, lee las filas en bloques
+# (sin cargarlas todas en memoria) y envía su progreso por una cola que el hilo de
+# Tk revisa con 'root.after'.
+# Cada página repite el título y los encabezados de la tabla, y al final se añaden
+# los totales y subtotales, calculados por la base de datos con SUM/GROUP BY.
+
+# --- Importación de Bibliotecas ---
+import multiprocessing # Para generar los reportes en un proceso aparte.
+import queue # Para leer la cola de progreso sin bloquear.
+
+from models.bet_model import BetModel
+from models.transaction_model import TransactionModel
+
+# Cada cuántas filas el proceso del reporte informa su progreso.
+PROGRESS_EVERY = 500
+
+
+# --- Definición de los Reportes ---
+# Cada reporte sabe cómo contar, recorrer y totalizar sus filas, y cómo mostrarlas.
+
+# Formatea un monto como moneda (ej. $10.50).
+def _money(value):
+    return f"${value or 0:.2f}"
+
+
+# Reporte del historial de apuestas, con subtotales por juego.
+class BetsReport:
+    title = "Reporte de Apuestas"
+    headers = ["ID", "Juego", "Monto", "Resultado", "Ganancia", "Fecha"]
+    col_widths = [15, 30, 25, 25, 25, 40] # Anchos de columna definidos manualmente.
+
+    def __init__(self, db_connector):
+        self.model = BetModel(db_connector)
+
+    def count(self, user_id, start_date, end_date):
+        return self.model.count_bet_history_by_user(user_id, start_date, end_date)
+
+    def rows(self, user_id, start_date, end_date):
+        return self.model.iter_bet_history_by_user(user_id, start_date, end_date)
+
+    @staticmethod
+    def row_values(bet):
+        return [
+            str(bet['idapuesta']),
+            bet['nombre_juego'],
+            _money(bet['monto']),
+            str(bet['resultado']),
+            _money(bet['ganancia']),
+            str(bet['fecha_apuesta'])
+        ]
+
+    def summary(self, user_id, start_date, end_date):
+        lines = []
+        for game in self.model.get_bet_totals_by_game(user_id, start_date, end_date) or []:
+            lines.append((f"{game['nombre_juego']} ({game['apuestas']} apuestas)",
+                          f"Apostado {_money(game['total_apostado'])} / Ganado {_money(game['total_ganado'])}"))
+        totals = self.model.get_bet_totals(user_id, start_date, end_date)
+        if totals:
+            lines.append((f"TOTAL ({totals['apuestas']} apuestas)",
+                          f"Apostado {_money(totals['total_apostado'])} / Ganado {_money(totals['total_ganado'])}"))
+        return lines
+
+
+# Reporte de transacciones, con subtotales por tipo y estado.
+class TransactionsReport:
+    title = "Reporte de Transacciones"
+    headers = ["ID", "Tipo", "Método Pago", "Monto", "Fecha", "Estado"]
+    col_widths = [15, 25, 35, 30, 40, 25] # Anchos de columna definidos manualmente.
+
+    def __init__(self, db_connector):
+        self.model = TransactionModel(db_connector)
+
+    def count(self, user_id, start_date, end_date):
+        return self.model.count_transactions_by_user(user_id, start_date, end_date)
+
+    def rows(self, user_id, start_date, end_date):
+        return self.model.iter_transactions_by_user(user_id, start_date, end_date)
+
+    @staticmethod
+    def row_values(trans):
+        return [
+            str(trans['idtransaccion']),
+            trans['tipo'],
+            trans['metododepago'],
+            _money(trans['monto_transaccion']),
+            str(trans['fecha_transaccion']),
+            trans['estado']
+        ]
+
+    def summary(self, user_id, start_date, end_date):
+        lines = []
+        for group in self.model.get_transaction_totals_by_type(user_id, start_date, end_date) or []:
+            lines.append((f"{group['tipo']} - {group['estado']} ({group['transacciones']} transacciones)",
+                          _money(group['total'])))
+        totals = self.model.get_transaction_totals(user_id, start_date, end_date)
+        if totals:
+            lines.append((f"TOTAL ({totals['transacciones']} transacciones)", _money(totals['total'])))
+        return lines
+
+
+REPORTS = {
+    "bets": BetsReport,
+    "transactions": TransactionsReport,
+}
+
+
+# Función que genera un reporte PDF completo.
+# - progress: función opcional que recibe (filas escritas, filas totales).
+# Devuelve el número de filas del reporte; si no hay ninguna, no se crea el archivo.
+def render_report(db_connector, kind, user_id, start_date, end_date, filename, progress=None):
+    report = REPORTS[kind](db_connector)
+    total = report.count(user_id, start_date, end_date)
+    if not total:
+        return 0
+
+    # Importamos el documento aquí para que FPDF se cargue con el primer reporte y no al iniciar la aplicación.
+    from controllers.report_pdf import ReportPDF
+
+    pdf = ReportPDF(report.title, report.headers, report.col_widths)
+    pdf.add_page()
+    count = 0
+    for row in report.rows(user_id, start_date, end_date):
+        pdf.add_row(report.row_values(row))
+        count += 1
+        if progress and count % PROGRESS_EVERY == 0:
+            progress(count, total)
+    pdf.add_summary("Totales", report.summary(user_id, start_date, end_date))
+
+    pdf.output(filename) # Guardamos el documento PDF en el archivo especificado.
+    if progress:
+        progress(count, total)
+    return count
+
+
+# Función que se ejecuta dentro del proceso del reporte.
+# Abre su propia conexión (las conexiones no se pueden compartir entre procesos)
+# y comunica el progreso y el resultado por la cola:
+#     ("progress", filas, total), ("done", filas) o ("error", mensaje).
+def _run_in_process(kind, user_id, start_date, end_date, filename, messages):
+    # Importamos el conector aquí para que importar este módulo no abra conexiones.
+    from models.Database.database_manager import DatabaseConnector
+
+    db = DatabaseConnector({'pool_size': 1})
+    try:
+        count = render_report(db, kind, user_id, start_date, end_date, filename,
+                              progress=lambda done, total: messages.put(("progress", done, total)))
+        messages.put(("done", count))
+    except Exception as e:
+        messages.put(("error", str(e)))
+    finally:
+        db.disconnect()
+
+
+# --- Definición de la Clase ReportEngine ---
+# Lanza los procesos de reporte y entrega su progreso y resultado en el hilo de Tk.
+# Solo hay un reporte en curso por clave: pedir otro del mismo tipo detiene el anterior.
+class ReportEngine:
+    def __init__(self, root, poll_interval_ms=100):
+        self.root = root # Ventana raíz; se usa para revisar las colas con 'after'.
+        self.poll_interval_ms = poll_interval_ms
+        # 'spawn' crea un intérprete limpio: el proceso hijo no hereda la ventana de Tk ni el pool de conexiones.
+        self._context = multiprocessing.get_context("spawn")
+        self._jobs = {} # Clave -> (proceso, cola, on_progress, on_done, on_error).
+        self._poll_id = None
+
+    # Método para generar un reporte en segundo plano.
+    # Los callbacks se llaman en el hilo de Tk: on_progress(filas, total), on_done(filas), on_error(mensaje).
+    def start(self, kind, user_id, start_date, end_date, filename, on_progress=None, on_done=None, on_error=None, key=None):
+        key = key or kind
+        self.cancel(key)
+        messages = self._context.Queue()
+        process = self._context.Process(
+            target=_run_in_process,
+            args=(kind, user_id, start_date, end_date, filename, messages),
+            name=f"reporte-{kind}",
+            daemon=True # Si se cierra la aplicación, el proceso del reporte no la mantiene abierta.
+        )
+        process.start()
+        self._jobs[key] = (process, messages, on_progress, on_done, on_error)
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    # Método para detener el reporte en curso de una clave.
+    def cancel(self, key):
+        job = self._jobs.pop(key, None)
+        if job is not None:
+            process = job[0]
+            process.terminate() # El PDF solo se escribe al final: no queda un archivo a medias.
+            process.join()
+
+    # Método privado que revisa periódicamente las colas de los reportes en curso.
+    def _poll(self):
+        self._poll_id = None
+        for key, (process, messages, on_progress, on_done, on_error) in list(self._jobs.items()):
+            alive = process.is_alive() # Lo miramos antes de vaciar la cola para no perder el último mensaje.
+            finished = False
+            while not finished:
+                try:
+                    message = messages.get_nowait()
+                except queue.Empty:
+                    break
+                finished = message[0] != "progress"
+                self._deliver(message, on_progress, on_done, on_error)
+            if not finished and not alive:
+                finished = True
+                self._deliver(("error", "El proceso del reporte terminó inesperadamente."), on_progress, on_done, on_error)
+            if finished:
+                self._jobs.pop(key, None)
+                process.join()
+        if self._jobs:
+            self._poll_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    # Método privado que llama al callback que corresponde a un mensaje.
+    @staticmethod
+    def _deliver(message, on_progress, on_done, on_error):
+        kind, *args = message
+        callback = {"progress": on_progress, "done": on_done, "error": on_error}[kind]
+        try:
+            if callback:
+                callback(*args)
+            elif kind == "error":
+                print(f"Error en reporte: {args[0]}")
+        except Exception as e: # Un error en el callback no debe detener la revisión de los demás reportes.
+            print(f"Error al entregar resultado del reporte: {e}")
+
+    # Método para detener los reportes en curso al cerrar la aplicación.
+    def shutdown(self):
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        for key in list(self._jobs):
+            self.cancel(key)
+
+
+# Función auxiliar para los controladores: con un motor, el reporte se genera en otro proceso;
+# sin él (por ejemplo, en scripts sin ventana), se genera aquí mismo con el conector indicado.
+def start_or_render(engine, db_connector, kind, user_id, start_date, end_date, filename,
+                    on_progress=None, on_done=None, on_error=None):
+    if engine is not None:
+        engine.start(kind, user_id, start_date, end_date, filename,
+                     on_progress=on_progress, on_done=on_done, on_error=on_error)
+        return
+    try:
+        count = render_report(db_connector, kind, user_id, start_date, end_date, filename, progress=on_progress)
+    except Exception as e:
+        if on_error:
+            on_error(str(e))
+        else:
+            print(f"Error en reporte: {e}")
+        return
+    if on_done:
+        on_done(count)
@@ -0,0 +1,55 @@
+# controllers/report_pdf.py
+# Este archivo define el documento PDF de los reportes (ver report_engine.py).
+# Está separado del motor para que FPDF solo se importe cuando se genera un reporte.
+
+# --- Importación de Bibliotecas ---
+from fpdf import FPDF # Importamos FPDF para generar documentos PDF.
+
+
+# --- Definición de la Clase ReportPDF ---
+# Documento FPDF que repite el título y los encabezados de la tabla en cada página
+# y numera las páginas al pie. FPDF llama a 'header' y 'footer' en cada salto de página.
+class ReportPDF(FPDF):
+    def __init__(self, report_title, headers, col_widths):
+        super().__init__()
+        self.report_title = report_title
+        self.headers = headers
+        self.col_widths = col_widths
+        self.table_header = True # Se desactiva al pasar a la sección de totales.
+        self.alias_nb_pages()    # '{nb}' se reemplaza por el número total de páginas.
+        self.set_auto_page_break(True, margin=15)
+
+    # Título del reporte y encabezados de la tabla, al comienzo de cada página.
+    def header(self):
+        self.set_font("Arial", size=12)
+        self.cell(0, 10, txt=self.report_title, ln=True, align="C")
+        self.ln(4)
+        if self.table_header:
+            self.set_font("Arial", size=10, style='B') # Fuente en negrita para los encabezados.
+            for width, header in zip(self.col_widths, self.headers):
+                self.cell(width, 7, header, border=1, align="C")
+            self.ln()
+        self.set_font("Arial", size=8) # Fuente normal para los datos.
+
+    # Número de página al pie.
+    def footer(self):
+        self.set_y(-15)
+        self.set_font("Arial", size=8, style='I')
+        self.cell(0, 10, f"Página {self.page_no()}/{{nb}}", align="C")
+
+    # Método para añadir una fila de la tabla.
+    def add_row(self, values):
+        for width, value in zip(self.col_widths, values):
+            self.cell(width, 7, value, border=1)
+        self.ln()
+
+    # Método para añadir la sección de totales: una lista de (etiqueta, valor).
+    def add_summary(self, title, lines):
+        self.table_header = False
+        self.ln(6)
+        self.set_font("Arial", size=10, style='B')
+        self.cell(0, 7, title, ln=True)
+        self.set_font("Arial", size=9)
+        for label, value in lines:
+            self.cell(90, 6, label, border="B")
+            self.cell(0, 6, value, border="B", ln=True, align="R")
@@ -0,0 +1,109 @@
+# controllers/session.py
+# Este archivo define la sesión del usuario y el bus de eventos de la aplicación.
+# Antes, cada controlador guardaba su propia copia de 'current_user' y, después de
+# cada acción, unos controladores recargaban por completo a otros (una jugada
+# terminaba volviendo a consultar al usuario, sus apuestas y sus transacciones).
+# Ahora hay una sola sesión compartida con los datos del usuario, y cada cambio se
+# anuncia con un evento que describe solo lo que cambió. Cada controlador se suscribe
+# a los eventos que le interesan y aplica ese cambio, sin volver a consultar todo.
+
+# --- Importación de Bibliotecas ---
+from collections import defaultdict # Diccionario de listas de suscriptores por tipo de evento.
+from dataclasses import dataclass # Para definir los eventos como clases de datos inmutables.
+
+
+# --- Definición de los Eventos ---
+# Cada evento es inmutable ('frozen'): quien lo recibe no puede modificarlo para los demás.
+
+# Un usuario inició sesión (o se reemplazaron por completo sus datos).
+@dataclass(frozen=True)
+class UserLoggedIn:
+    user: dict
+
+
+# Cambió el saldo del usuario (valor confirmado por la base de datos).
+@dataclass(frozen=True)
+class BalanceChanged:
+    user_id: int
+    saldo: object # Decimal.
+
+
+# Se registró una apuesta. 'bet' tiene las mismas claves que una fila del historial de apuestas.
+@dataclass(frozen=True)
+class BetPlaced:
+    user_id: int
+    bet: dict
+
+
+# Se registró una transacción. 'transaction' tiene las mismas claves que una fila del historial.
+@dataclass(frozen=True)
+class TransactionAdded:
+    user_id: int
+    transaction: dict
+
+
+# --- Definición de la Clase EventBus ---
+# Bus de eventos síncrono: 'publish' llama, en orden de suscripción, a todas las funciones
+# suscritas al tipo del evento. Se usa solo desde el hilo de Tk.
+class EventBus:
+    def __init__(self):
+        self._handlers = defaultdict(list) # Tipo de evento -> funciones suscritas.
+
+    # Método para suscribir una función a un tipo de evento.
+    def subscribe(self, event_type, handler):
+        self._handlers[event_type].append(handler)
+
+    # Método para cancelar una suscripción.
+    def unsubscribe(self, event_type, handler):
+        if handler in self._handlers[event_type]:
+            self._handlers[event_type].remove(handler)
+
+    # Método para anunciar un evento a sus suscriptores.
+    # Un error en un suscriptor no impide que los demás reciban el evento.
+    def publish(self, event):
+        for handler in list(self._handlers[type(event)]):
+            try:
+                handler(event)
+            except Exception as e:
+                print(f"Error al procesar el evento {type(event).__name__}: {e}")
+
+
+# --- Definición de la Clase UserSession ---
+# Guarda los datos del usuario logueado, compartidos por todos los controladores,
+# y anuncia sus cambios por el bus de eventos.
+class UserSession:
+    def __init__(self, bus=None):
+        self.bus = bus or EventBus()
+        self.user = None # Datos del usuario logueado (None si no hay sesión).
+
+    # Método para saber si hay un usuario logueado.
+    @property
+    def is_logged_in(self):
+        return self.user is not None
+
+    # Método para obtener el ID (cédula) del usuario logueado.
+    @property
+    def user_id(self):
+        return self.user['idcedula'] if self.user else None
+
+    # Método para iniciar la sesión de un usuario.
+    def login(self, user):
+        self.user = user
+        self.bus.publish(UserLoggedIn(user))
+
+    # Método para aplicar un saldo confirmado por la base de datos.
+    def set_balance(self, saldo):
+        if not self.user:
+            return
+        self.user['saldo'] = saldo
+        self.bus.publish(BalanceChanged(self.user_id, saldo))
+
+    # Método para anunciar una apuesta registrada.
+    def bet_placed(self, bet):
+        if self.user:
+            self.bus.publish(BetPlaced(self.user_id, bet))
+
+    # Método para anunciar una transacción registrada.
+    def transaction_added(self, transaction):
+        if self.user:
+            self.bus.publish(TransactionAdded(self.user_id, transaction))
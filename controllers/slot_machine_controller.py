@@ -4,11 +4,22 @@
 # y coordina con los modelos de usuario y apuestas para simular el juego.
 
 # --- Importación de Bibliotecas ---
-import random # Importamos 'random' para generar resultados aleatorios en la máquina tragamonedas.
-from tkinter import messagebox # Para mostrar mensajes emergentes al usuario.
+from controllers.ui_port import TkUIPort # Mensajes emergentes al usuario (reemplazable sin pantalla).
 from decimal import Decimal # Importamos 'Decimal' para manejar cálculos monetarios con precisión,
                             # evitando problemas de punto flotante que pueden ocurrir con 'float'.
 
+from models.Database.db_executor import submit_or_run, post_or_call # Para ejecutar las escrituras fuera del hilo de Tk.
+from models.bet_journal import JournalFullError # El diario local no acepta más jugadas sin guardar.
+from models import slot_engine # Reglas de la máquina: símbolos, tiras de los rodillos y tabla de pagos.
+from models.game_catalog import GameCatalog # Catálogo de juegos en memoria (ID, estado, monto mínimo).
+from models.ledger_model import LedgerModel, InsufficientFundsError # Movimientos de saldo atómicos.
+from controllers.session import UserSession, UserLoggedIn, BalanceChanged # Sesión compartida y sus eventos.
+
+# Nombre del juego en la tabla 'juegos' que corresponde a esta máquina.
+SLOT_GAME_NAME = 'tragamonedas'
+# Cantidad máxima de jugadas de una tanda automática.
+AUTOPLAY_MAX_SPINS = 1000
+
 # --- Definición de la Clase SlotMachineController ---
 # Esta clase es un ejemplo del patrón de diseño MVC (Modelo-Vista-Controlador).
 # Su responsabilidad es manejar la lógica del juego de la máquina tragamonedas.
@@ -17,91 +28,270 @@ class SlotMachineController:
     # Esto es un ejemplo de Inyección de Dependencias.
     def __init__(self, view, game_model, user_model):
         self.view = view             # La Vista asociada a este controlador (SlotMachine).
+        self.ui = TkUIPort()         # Mensajes emergentes (un puerto sin pantalla en scripts y benchmarks).
         self.game_model = game_model # El Modelo de Juego para obtener información sobre los juegos.
         self.user_model = user_model # El Modelo de Usuario para interactuar con los datos del usuario (saldo).
-        self.current_user = None     # Almacena los datos del usuario actualmente logueado.
-        
-        # Referencias a otros modelos y controladores que se asignan más tarde.
-        # Esto permite la comunicación y coordinación entre diferentes partes de la aplicación.
-        self.bet_model = None
-        self.bet_controller = None
-        self.dashboard_controller = None
-
-    # Método para establecer el usuario actual en el controlador.
-    # Se llama cuando un usuario inicia sesión o cuando los datos del usuario se actualizan.
-    def set_current_user(self, user_data):
-        self.current_user = user_data       # Actualizamos el usuario actual en este controlador.
-        self.view.update_saldo(user_data['saldo']) # Le decimos a la Vista que actualice el saldo mostrado.
+        # Catálogo de juegos en memoria. Main lo reemplaza por el catálogo compartido de la aplicación.
+        self.game_catalog = GameCatalog(game_model)
+        # Modelo de movimientos de saldo: cada jugada se guarda junto con su cambio de saldo.
+        self.ledger_model = LedgerModel(user_model.db)
+        # Configuración de la máquina (tiras y tabla de resultados) de cada juego, por (ID, probabilidad_ganar).
+        # Se arma una sola vez por juego; si cambia la 'probabilidad_ganar' se arma de nuevo.
+        self.engines = {}
+        self.db_executor = None      # Ejecutor en segundo plano para las consultas (se asigna desde Main).
+        # Diario local de apuestas (se asigna desde Main). Si está, las jugadas se anotan en el diario
+        # y se guardan en la base de datos en segundo plano; si no, se guardan directamente.
+        self.bet_journal = None
+        # Sesión del usuario. Main la reemplaza por la sesión compartida de la aplicación.
+        self.attach_session(UserSession())
 
-    # Método principal para simular una jugada en la máquina tragamonedas.
-    # Recibe el monto de la apuesta como un número flotante.
-    def play_slot_machine(self, bet_amount_float):
+    # Método para conectar el controlador a una sesión y suscribirse a sus eventos.
+    # Si la sesión ya tiene un usuario, el controlador se pone al día con él.
+    def attach_session(self, session):
+        self.session = session
+        session.bus.subscribe(UserLoggedIn, self._on_user_logged_in)
+        session.bus.subscribe(BalanceChanged, self._on_balance_changed)
+        if session.is_logged_in: # La sesión ya empezó (ej. la pestaña se construyó después del login).
+            self._on_user_logged_in(UserLoggedIn(session.user))
+
+    # Datos del usuario actualmente logueado (los de la sesión compartida).
+    @property
+    def current_user(self):
+        return self.session.user
+
+    # Método privado que muestra el saldo del usuario que acaba de iniciar sesión.
+    def _on_user_logged_in(self, event):
+        self.view.update_saldo(event.user['saldo'])
+
+    # Método privado que muestra el nuevo saldo (ej. después de un depósito).
+    def _on_balance_changed(self, event):
+        self.view.update_saldo(event.saldo)
+
+    # Método para obtener los datos del juego de tragamonedas desde el catálogo en memoria.
+    # Devuelve None (y avisa al usuario) si el juego no existe o no está disponible
+    # (ej. pasó a 'mantenimiento').
+    def get_available_game(self):
+        self.game_catalog.ensure_loaded()
+        game = self.game_catalog.get_by_name(SLOT_GAME_NAME)
+        if game is None or not self.game_catalog.is_available(game['idjuego']):
+            self.ui.showerror("Juego no disponible", "La máquina tragamonedas no está disponible en este momento.")
+            return None
+        return game
+
+    # Método para obtener la configuración de la máquina de un juego (ver SlotEngine.for_game).
+    # Si la 'probabilidad_ganar' del juego no es válida (ej. 0 o 1), se avisa y se usa la
+    # configuración por defecto; la decisión se guarda junto con las demás configuraciones.
+    def get_engine(self, game):
+        key = (game['idjuego'], game.get('probabilidad_ganar'))
+        engine = self.engines.get(key)
+        if engine is None:
+            try:
+                engine = slot_engine.SlotEngine.for_game(game)
+            except ValueError as e:
+                print(f"Advertencia: configuración inválida para '{game.get('nombre')}' ({e}); "
+                      f"se usan los rodillos por defecto.")
+                engine = slot_engine.DEFAULT_ENGINE
+            self.engines[key] = engine
+        return engine
+
+    # Método privado que valida una apuesta antes de jugar.
+    # Devuelve una tupla (monto como Decimal, datos del juego), o None (y avisa al usuario) si no se puede jugar.
+    def _check_bet(self, bet_amount_float):
         if not self.current_user: # Verificamos que haya un usuario logueado.
-            messagebox.showerror("Error", "No hay usuario logueado.")
-            return
+            self.ui.showerror("Error", "No hay usuario logueado.")
+            return None
 
         # --- Validación y Conversión de la Apuesta ---
         try:
             # Convertimos el monto de la apuesta a tipo Decimal para cálculos precisos.
             bet_amount = Decimal(str(bet_amount_float))
+            # La apuesta tiene que ser un monto positivo (el juego puede no tener monto mínimo).
+            if not bet_amount.is_finite() or bet_amount <= 0:
+                raise ValueError(bet_amount)
         except Exception:
-            messagebox.showerror("Error", "Monto de apuesta inválido.")
-            return
+            self.ui.showerror("Error", "Monto de apuesta inválido.")
+            return None
+
+        # Verificamos que el juego siga disponible (el catálogo revisa su estado cada pocos segundos).
+        game = self.get_available_game()
+        if game is None:
+            return None
+
+        # Verificamos que la apuesta alcance el monto mínimo del juego.
+        if game['monto_minimo'] is not None and bet_amount < game['monto_minimo']:
+            self.ui.showerror("Error", f"La apuesta mínima es ${game['monto_minimo']:.2f}")
+            return None
 
         # Verificamos si el usuario tiene saldo suficiente para la apuesta.
         if bet_amount > self.current_user['saldo']:
-            messagebox.showerror("Error", "Saldo insuficiente")
+            self.ui.showerror("Error", "Saldo insuficiente")
+            return None
+
+        # Verificamos que el diario acepte más jugadas (hay un límite de jugadas sin guardar).
+        if self.bet_journal is not None and not self.bet_journal.has_room(bet_amount):
+            self.ui.showerror("Error", "Hay demasiadas jugadas sin guardar. Espera a que se restablezca la conexión.")
+            return None
+        return bet_amount, game
+
+    # Método principal para simular una jugada en la máquina tragamonedas.
+    # Recibe el monto de la apuesta como un número flotante.
+    def play_slot_machine(self, bet_amount_float):
+        checked = self._check_bet(bet_amount_float)
+        if checked is None:
             return
+        bet_amount, game = checked
 
         # --- Lógica del Juego de la Máquina Tragamonedas ---
-        symbols = ["🍒", "🍋", "🍊", "🍇", "🔔", "💎", "7️⃣"] # Símbolos posibles en los rodillos.
-        results = [random.choice(symbols) for _ in range(3)] # Elegimos 3 símbolos aleatorios.
+        # Las reglas están en slot_engine, que también usa el simulador de RTP. Las tiras de los
+        # rodillos del juego se ajustan a su 'probabilidad_ganar'; girar es elegir una parada de
+        # cada tira y evaluar es buscar la combinación en la tabla de resultados.
+        engine = self.get_engine(game)
+        reels = engine.spin() # Índices de los 3 símbolos que salieron.
+        results = engine.symbols(reels) # Símbolos a mostrar en los rodillos.
+        multiplier = engine.evaluate(reels)
 
-        win = Decimal('0.00') # Inicializamos las ganancias.
-        message = ""          # Mensaje para el usuario.
-        bet_result_status = 0 # 0 para pérdida, 1 para ganancia.
+        win = bet_amount * Decimal(multiplier) # Ganancia (0 si es una pérdida).
+        bet_result_status = 1 if multiplier > 0 else 0 # 0 para pérdida, 1 para ganancia.
 
-        # Evaluamos el resultado de la jugada.
-        if results[0] == results[1] == results[2]: # Tres símbolos iguales (JACKPOT).
-            win = bet_amount * Decimal('3')
+        # Mensaje para el usuario según el resultado de la jugada.
+        if multiplier == slot_engine.JACKPOT_MULTIPLIER: # Tres símbolos iguales (JACKPOT).
             message = f"🎉 JACKPOT! Ganas ${win:.2f}"
-            bet_result_status = 1
-        elif results[0] == results[1] or results[1] == results[2]: # Dos símbolos iguales.
-            win = bet_amount * Decimal('2')
+        elif multiplier > 0: # Dos símbolos iguales.
             message = f"👍 Ganas ${win:.2f}"
-            bet_result_status = 1
         else: # Ningún símbolo igual (pérdida).
             win = Decimal('0.00')
             message = "😢 Perdiste"
-            bet_result_status = 0
-
-        # --- Actualización del Saldo del Usuario ---
-        # Calculamos el nuevo saldo restando la apuesta y sumando las ganancias.
-        new_saldo = self.current_user['saldo'] + (win - bet_amount)
-        # Actualizamos el saldo en la base de datos a través del modelo de usuario.
-        self.user_model.update_user_balance(self.current_user['idcedula'], new_saldo)
-        self.current_user['saldo'] = new_saldo # Actualizamos el saldo en los datos locales del usuario.
-        self.view.update_saldo(new_saldo) # Le decimos a la Vista que actualice el saldo mostrado.
-
-        # --- Registro de la Apuesta ---
-        if self.bet_model: # Verificamos que el modelo de apuestas esté disponible.
-            # Registramos la apuesta en la base de datos a través del modelo de apuestas.
-            self.bet_model.create_bet(
-                user_id=self.current_user['idcedula'],
-                game_id=2, # Asumimos que la Máquina Tragamonedas tiene el ID de juego 2.
-                amount=bet_amount,
-                result=bet_result_status,
-                winnings=win
-            )
-            if self.bet_controller: # Si el controlador de apuestas está disponible, refrescamos la lista de apuestas.
-                self.bet_controller.load_user_bets()
 
         # --- Actualización de la Vista y Notificación ---
         self.view.display_results(results, message) # Le decimos a la Vista que muestre los resultados de la jugada.
-        messagebox.showinfo("Resultado", message)   # Mostramos un mensaje emergente con el resultado.
 
-        # --- Actualización del Dashboard ---
-        # Si el controlador del dashboard está disponible, le pedimos que refresque los datos del usuario.
-        # Esto asegura que el saldo en el dashboard se actualice después de cada jugada.
-        if self.dashboard_controller:
-            self.dashboard_controller.refresh_user_data()
+        # --- Registro de la Jugada ---
+        if self.bet_journal is not None:
+            if not self._journal_bets(game, [(bet_amount, bet_result_status, win)]):
+                return
+            self.ui.showinfo("Resultado", message)
+            return
+
+        # La apuesta y el cambio de saldo se guardan juntos en segundo plano, en una sola transacción.
+        # La base de datos devuelve el saldo real, que es el que se muestra (no uno calculado aquí),
+        # y la apuesta tal como quedó guardada.
+        # Las escrituras van en serie para que las jugadas se guarden en el orden en que ocurrieron.
+        submit_or_run(
+            self.db_executor, self.ledger_model.place_bet,
+            self.current_user['idcedula'], game['idjuego'], bet_amount, bet_result_status, win,
+            on_success=lambda saved: self._on_spin_saved(game, *saved),
+            on_error=self._on_spin_failed,
+            serial=True
+        )
+        self.ui.showinfo("Resultado", message)   # Mostramos un mensaje emergente con el resultado.
+
+    # Método para jugar varias jugadas seguidas (modo automático).
+    # Todas las jugadas se resuelven en una sola llamada al motor y se guardan juntas: un solo
+    # INSERT con todas las apuestas y un solo cambio de saldo, en una transacción (ver LedgerModel.place_bets).
+    # - spins: cantidad máxima de jugadas.
+    # - stop_on_win: detenerse en la primera jugada ganadora.
+    # - loss_limit: detenerse cuando la pérdida neta llega a este monto (None para no limitar).
+    def autoplay(self, bet_amount_float, spins, stop_on_win=False, loss_limit=None):
+        checked = self._check_bet(bet_amount_float)
+        if checked is None:
+            return
+        bet_amount, game = checked
+        spins = max(1, min(int(spins), AUTOPLAY_MAX_SPINS))
+
+        # El motor trabaja en apuestas (1 = el monto de una jugada): convertimos el saldo y el límite.
+        engine = self.get_engine(game)
+        budget = self.current_user['saldo'] / bet_amount
+        max_net_loss = Decimal(str(loss_limit)) / bet_amount if loss_limit else None
+        outcomes = engine.play_many(spins, stop_on_win, max_net_loss, budget)
+
+        bets = [(bet_amount, 1 if multiplier > 0 else 0, bet_amount * Decimal(multiplier))
+                for _, multiplier in outcomes]
+        wins = sum(1 for _, result, _ in bets if result)
+        total_bet = bet_amount * len(bets)
+        total_won = sum((winnings for _, _, winnings in bets), Decimal('0.00'))
+        net = total_won - total_bet
+        message = (f"{len(bets)} jugadas, {wins} ganadoras. Apostado ${total_bet:.2f}, "
+                   f"ganado ${total_won:.2f} (neto {'+' if net >= 0 else '-'}${abs(net):.2f})")
+
+        # La Vista muestra solo la última jugada y el resumen.
+        self.view.display_results(engine.symbols(outcomes[-1][0]), message)
+
+        if self.bet_journal is not None:
+            if self._journal_bets(game, bets):
+                self.ui.showinfo("Juego automático", message)
+            return
+
+        submit_or_run(
+            self.db_executor, self.ledger_model.place_bets,
+            self.current_user['idcedula'], game['idjuego'], bets,
+            on_success=lambda saved: self._on_autoplay_saved(game, *saved),
+            on_error=self._on_spin_failed,
+            serial=True
+        )
+        self.ui.showinfo("Juego automático", message)
+
+    # Método privado que anota jugadas en el diario local. Cuando vuelve, las jugadas ya están en
+    # disco: se muestra enseguida el saldo que resulta de ellas, y la base de datos lo confirma
+    # al guardar la tanda (ver '_on_journal_flushed').
+    # Devuelve False (y avisa al usuario) si el diario no acepta más jugadas.
+    def _journal_bets(self, game, bets):
+        try:
+            self.bet_journal.append(self.current_user['idcedula'], game['idjuego'], bets)
+        except (JournalFullError, OSError) as e:
+            self.ui.showerror("Error", f"La jugada no se registró: {e}")
+            return False
+        delta = sum((winnings - amount for amount, _, winnings in bets), Decimal('0'))
+        self.session.set_balance(self.current_user['saldo'] + delta)
+        return True
+
+    # Método que recibe las tandas guardadas por el diario. Lo llama el hilo del diario, así
+    # que solo pasa el resultado al hilo de Tk.
+    def on_journal_flushed(self, user_id, new_balance, bets):
+        post_or_call(self.db_executor, self._apply_journal_flush, user_id, new_balance, bets)
+
+    # Método que recibe las tandas rechazadas por falta de saldo (desde el hilo del diario).
+    def on_journal_rejected(self, user_id, entries, error):
+        post_or_call(self.db_executor, self._apply_journal_rejection, user_id, entries, error)
+
+    # Método privado que anuncia una tanda guardada por el diario (en el hilo de Tk).
+    # El saldo de la base de datos todavía no incluye las jugadas que siguen en el diario:
+    # se las sumamos para no mostrar un saldo que "retrocede".
+    def _apply_journal_flush(self, user_id, new_balance, bets):
+        if self.session.user_id != user_id: # La tanda es de una sesión anterior.
+            return
+        self.session.set_balance(new_balance + self.bet_journal.pending_delta(user_id))
+        for bet in bets:
+            game = self.game_catalog.get_by_id(bet['idjuego'])
+            bet['nombre_juego'] = game['nombre'] if game else SLOT_GAME_NAME
+            self.session.bet_placed(bet)
+
+    # Método privado que informa una tanda rechazada por la base de datos (en el hilo de Tk).
+    def _apply_journal_rejection(self, user_id, entries, error):
+        if self.session.user_id != user_id:
+            return
+        self.ui.showerror("Error", f"{len(entries)} jugadas no se registraron: saldo insuficiente.")
+        if error.saldo is not None:
+            self.session.set_balance(error.saldo + self.bet_journal.pending_delta(user_id))
+
+    # Método privado que anuncia las jugadas automáticas guardadas (en el hilo de Tk).
+    def _on_autoplay_saved(self, game, new_balance, bets):
+        self.session.set_balance(new_balance)
+        for bet in bets: # En el orden en que se jugaron: la última queda arriba en el historial.
+            bet['nombre_juego'] = game['nombre']
+            self.session.bet_placed(bet)
+
+    # Método privado que anuncia la jugada guardada (en el hilo de Tk).
+    # Cada vista aplica solo lo que cambió: el saldo y una fila nueva en el historial de apuestas.
+    def _on_spin_saved(self, game, new_balance, bet):
+        bet['nombre_juego'] = game['nombre'] # El historial muestra el nombre del juego.
+        self.session.set_balance(new_balance)
+        self.session.bet_placed(bet)
+
+    # Método privado que informa que la jugada no se pudo guardar (en el hilo de Tk).
+    def _on_spin_failed(self, error):
+        if isinstance(error, InsufficientFundsError):
+            self.ui.showerror("Error", "La jugada no se registró: saldo insuficiente.")
+            if error.saldo is not None:
+                self.session.set_balance(error.saldo) # Mostramos el saldo real.
+        else:
+            self.ui.showerror("Error", f"No se pudo registrar la jugada: {error}")
@@ -4,10 +4,14 @@
 # y coordina con los modelos de usuario y transacciones para procesar operaciones monetarias.
 
 # --- Importación de Bibliotecas ---
-from tkinter import messagebox # Para mostrar mensajes emergentes al usuario.
+from controllers.ui_port import TkUIPort # Mensajes emergentes al usuario (reemplazable sin pantalla).
 from decimal import Decimal # Importamos 'Decimal' para manejar cálculos monetarios con precisión.
-from fpdf import FPDF       # Importamos FPDF para generar documentos PDF.
-import openpyxl             # Importamos openpyxl para trabajar con archivos Excel (.xlsx).
+
+from models.Database.db_executor import submit_or_run, post_or_call # Para ejecutar las consultas fuera del hilo de Tk.
+from controllers.excel_exporter import stream_to_excel # Exportación a Excel fila a fila, con memoria constante.
+from controllers.report_engine import start_or_render # Reportes PDF generados en un proceso aparte.
+from models.ledger_model import LedgerModel # Movimientos de saldo atómicos.
+from controllers.session import UserSession, UserLoggedIn, TransactionAdded # Sesión compartida y sus eventos.
 
 # --- Definición de la Clase TransactionController ---
 # Esta clase es un ejemplo del patrón de diseño MVC (Modelo-Vista-Controlador).
@@ -17,139 +21,216 @@ class TransactionController:
     # Esto es un ejemplo de Inyección de Dependencias.
     def __init__(self, view, transaction_model, user_model):
         self.view = view                     # La Vista asociada a este controlador (TransactionsWindow).
+        self.ui = TkUIPort()                 # Mensajes emergentes (un puerto sin pantalla en scripts y benchmarks).
         self.transaction_model = transaction_model # El Modelo de Transacciones para interactuar con los datos de transacciones.
         self.user_model = user_model         # El Modelo de Usuario para interactuar con los datos del usuario (saldo).
-        self.current_user = None             # Almacena los datos del usuario actualmente logueado.
-        self.dashboard_controller = None     # Referencia al controlador del Dashboard para actualizar el saldo.
-
-    # Método para establecer el usuario actual en el controlador.
-    # Se llama cuando un usuario inicia sesión o cuando los datos del usuario se actualizan.
-    def set_current_user(self, user_data):
-        self.current_user = user_data       # Actualizamos el usuario actual en este controlador.
-        self.load_user_transactions() # Carga las transacciones del usuario una vez que se establece.
+        self.ledger_model = LedgerModel(transaction_model.db) # Guarda cada depósito junto con su cambio de saldo.
+        self.db_executor = None              # Ejecutor en segundo plano para las consultas (se asigna desde Main).
+        self.date_filter = (None, None)      # Último filtro de fechas aplicado (se reutiliza al exportar).
+        self.report_engine = None            # Motor de reportes PDF en segundo plano (se asigna desde Main).
+        self.prefetch = None                 # Cargas hechas al iniciar sesión (se asigna desde Main).
+        # Sesión del usuario. Main la reemplaza por la sesión compartida de la aplicación.
+        self.attach_session(UserSession())
+
+    # Método para conectar el controlador a una sesión y suscribirse a sus eventos.
+    # Si la sesión ya tiene un usuario, el controlador se pone al día con él.
+    def attach_session(self, session):
+        self.session = session
+        session.bus.subscribe(UserLoggedIn, self._on_user_logged_in)
+        session.bus.subscribe(TransactionAdded, self._on_transaction_added)
+        if session.is_logged_in: # La sesión ya empezó (ej. la pestaña se construyó después del login).
+            self._on_user_logged_in(UserLoggedIn(session.user))
+
+    # Datos del usuario actualmente logueado (los de la sesión compartida).
+    @property
+    def current_user(self):
+        return self.session.user
+
+    # Método privado que carga las transacciones del usuario que acaba de iniciar sesión.
+    def _on_user_logged_in(self, event):
+        self.load_user_transactions()
+
+    # Método privado que agrega una transacción nueva al historial, sin volver a cargarlo.
+    # Si el filtro de fechas actual no incluye la transacción, no se muestra.
+    def _on_transaction_added(self, event):
+        if self._matches_filter(event.transaction['fecha_transaccion']):
+            self.view.add_transaction(event.transaction)
+
+    # Método privado que indica si una fecha cumple el filtro de fechas actual,
+    # con la misma comparación que hace la base de datos ('fecha <= AAAA-MM-DD' excluye ese día después de las 00:00).
+    def _matches_filter(self, fecha):
+        start_date, end_date = self.date_filter
+        fecha = str(fecha) # 'AAAA-MM-DD HH:MM:SS' se compara como texto con las fechas del filtro.
+        return (not start_date or fecha >= start_date) and (not end_date or fecha <= end_date)
 
     # Método para cargar y mostrar las transacciones del usuario, con opción de filtrar por fecha.
+    # La Vista pide las transacciones página a página a medida que el usuario se desplaza;
+    # cada página se obtiene en segundo plano y una carga nueva descarta la anterior (clave 'transactions_page').
     def load_user_transactions(self, start_date=None, end_date=None):
         if self.current_user: # Verificamos que haya un usuario logueado.
+            self.date_filter = (start_date, end_date)
+            user_id = self.current_user['idcedula']
+
             # Obtenemos las transacciones del modelo, aplicando filtros de fecha si se proporcionan.
-            transactions = self.transaction_model.get_transactions_by_user(self.current_user['idcedula'], start_date, end_date)
-            # Le decimos a la Vista que muestre las transacciones.
-            self.view.display_transactions(transactions)
+            def load_page(cursor, before, limit, on_done):
+                def query():
+                    submit_or_run(
+                        self.db_executor, self.transaction_model.get_transactions_page,
+                        user_id, start_date, end_date, cursor, limit, before,
+                        on_success=on_done,
+                        key="transactions_page"
+                    )
+                # La primera página sin filtro ya se pidió al iniciar sesión (ver LoginPrefetch).
+                if self.prefetch is not None and cursor is None and not (start_date or end_date):
+                    self.prefetch.take(user_id, "transactions", on_done, query, limit)
+                else:
+                    query()
+
+            # Para refrescar, la tabla pide solo las transacciones nuevas y el estado de las que muestra.
+            def sync_page(since_id, transaction_ids, limit, on_done):
+                submit_or_run(
+                    self.db_executor, self._sync_transactions,
+                    user_id, start_date, end_date, since_id, transaction_ids, limit,
+                    on_success=on_done,
+                    key="transactions_sync"
+                )
+
+            self.view.display_transactions(load_page, sync_page) # Le decimos a la Vista que muestre las transacciones.
+
+    # Método para refrescar las transacciones mostradas (ej. al volver a la pestaña), sin recargar la tabla:
+    # solo se agregan las transacciones nuevas y se actualizan o quitan las que cambiaron.
+    def refresh_user_transactions(self):
+        if self.current_user:
+            self.view.refresh_transactions()
+
+    # Método privado que obtiene los cambios de las transacciones (se ejecuta en un hilo de trabajo).
+    # Devuelve una tupla (transacciones nuevas desde 'since_id', estado actual de las transacciones 'transaction_ids').
+    def _sync_transactions(self, user_id, start_date, end_date, since_id, transaction_ids, limit):
+        new_transactions = self.transaction_model.get_transactions_since(user_id, start_date, end_date, since_id, limit)
+        current_transactions = self.transaction_model.get_transactions_by_ids(user_id, transaction_ids, start_date, end_date)
+        return new_transactions, current_transactions
 
     # Método para procesar una solicitud de depósito.
     # Recibe el monto del depósito como cadena de texto y el método de pago.
+    # La validación se hace en el hilo de Tk; la escritura en la base de datos, en segundo plano.
     def request_deposit(self, amount_str, payment_method):
         if not self.current_user: # Verificamos que haya un usuario logueado.
-            messagebox.showerror("Error", "No hay usuario logueado para realizar un depósito.")
+            self.ui.showerror("Error", "No hay usuario logueado para realizar un depósito.")
             return
 
         # --- Validación del Monto del Depósito ---
         try:
             amount = Decimal(amount_str) # Convertimos el monto a tipo Decimal para cálculos precisos.
             if amount <= 0: # El monto debe ser positivo.
-                messagebox.showerror("Error", "El monto del depósito debe ser positivo.")
+                self.ui.showerror("Error", "El monto del depósito debe ser positivo.")
                 return
         except Exception: # Capturamos errores si el monto no es un número válido.
-            messagebox.showerror("Error", "Monto inválido. Introduce un número válido.")
+            self.ui.showerror("Error", "Monto inválido. Introduce un número válido.")
             return
 
-        # --- Creación del Registro de Transacción ---
-        # Preparamos los datos para crear una nueva transacción.
-        transaction_data = {
-            'idcedula': self.current_user['idcedula'],
-            'tipo': 'deposito',
-            'metododepago': payment_method,
-            'monto_transaccion': amount,
-            'estado': 'completado' # Asumimos que los depósitos se completan instantáneamente.
-        }
-        # Llamamos al modelo de transacciones para registrar la transacción en la base de datos.
-        transaction_success = self.transaction_model.create_transaction(transaction_data)
-
-        if transaction_success: # Si la transacción se registró exitosamente...
-            # --- Actualización del Saldo del Usuario ---
-            # Calculamos el nuevo saldo del usuario.
-            new_balance = self.current_user['saldo'] + amount
-            # Actualizamos el saldo en la base de datos a través del modelo de usuario.
-            user_balance_updated = self.user_model.update_user_balance(self.current_user['idcedula'], new_balance)
-
-            if user_balance_updated: # Si el saldo del usuario se actualizó correctamente...
-                self.current_user['saldo'] = new_balance # Actualizamos el saldo en los datos locales del usuario.
-                messagebox.showinfo("Éxito", f"Depósito de ${amount:.2f} realizado con éxito. Nuevo saldo: ${new_balance:.2f}")
-                self.view.load_transactions() # Le decimos a la Vista que refresque la lista de transacciones.
-                if self.dashboard_controller: # Si el controlador del dashboard está disponible, lo actualizamos.
-                    self.dashboard_controller.refresh_user_data()
-            else: # Si el saldo no se pudo actualizar.
-                messagebox.showerror("Error", "Depósito registrado, pero no se pudo actualizar el saldo del usuario.")
-        else: # Si la transacción no se pudo registrar.
-            messagebox.showerror("Error", "No se pudo registrar el depósito.")
-
-    # Método para exportar la lista de transacciones a un archivo PDF.
-    # Utiliza la librería FPDF para crear el documento.
-    def export_transactions_to_pdf(self, transactions, filename="transactions_report.pdf"):
-        if not transactions: # Si no hay transacciones, mostramos un mensaje y salimos.
-            messagebox.showinfo("Exportar PDF", "No hay transacciones para exportar.")
+        # --- Registro del Depósito ---
+        # La transacción y el aumento de saldo se guardan juntos en una sola transacción de la base
+        # de datos, que devuelve el saldo real y la transacción guardada. Asumimos que los depósitos se completan instantáneamente.
+        # Las escrituras de saldo van en serie para que dos operaciones seguidas no se adelanten entre sí.
+        submit_or_run(
+            self.db_executor, self.ledger_model.deposit,
+            self.current_user['idcedula'], amount, payment_method,
+            on_success=lambda saved: self._on_deposit_saved(amount, *saved),
+            on_error=self._on_deposit_failed,
+            serial=True
+        )
+
+    # Método privado que anuncia el depósito confirmado e informa al usuario (en el hilo de Tk).
+    # Cada vista aplica solo lo que cambió: el saldo y una fila nueva en el historial de transacciones.
+    def _on_deposit_saved(self, amount, new_balance, transaction):
+        self.session.set_balance(new_balance)
+        self.session.transaction_added(transaction)
+        self.ui.showinfo("Éxito", f"Depósito de ${amount:.2f} realizado con éxito. Nuevo saldo: ${new_balance:.2f}")
+
+    # Método privado que informa que el depósito no se pudo registrar (en el hilo de Tk).
+    # Como el saldo y la transacción se guardan juntos, no queda ninguno de los dos a medias.
+    def _on_deposit_failed(self, error):
+        self.ui.showerror("Error", f"No se pudo registrar el depósito: {error}")
+
+    # Método para exportar las transacciones (con el filtro de fechas actual) a un archivo PDF.
+    # El reporte se genera en otro proceso (ver ReportEngine): lee las filas en bloques,
+    # repite los encabezados en cada página y termina con los totales por tipo y estado.
+    # La Vista muestra el progreso mientras tanto.
+    def export_transactions_to_pdf(self, filename="transactions_report.pdf"):
+        if not self.current_user:
+            self.ui.showinfo("Exportar PDF", "No hay transacciones para exportar.")
             return
-
-        pdf = FPDF()         # Creamos una nueva instancia de FPDF.
-        pdf.add_page()       # Añadimos una página al documento.
-        pdf.set_font("Arial", size=12) # Establecemos la fuente y el tamaño.
-
-        # Añadimos un título al reporte.
-        pdf.cell(200, 10, txt="Reporte de Transacciones", ln=True, align="C")
-        pdf.ln(10) # Añadimos un salto de línea.
-
-        # --- Encabezados de la Tabla PDF ---
-        pdf.set_font("Arial", size=10, style='B') # Fuente en negrita para los encabezados.
-        headers = ["ID", "Tipo", "Método Pago", "Monto", "Fecha", "Estado"]
-        col_widths = [15, 25, 35, 25, 40, 25] # Anchos de columna definidos manualmente.
-        for i, header in enumerate(headers):
-            pdf.cell(col_widths[i], 7, header, border=1, align="C") # Creamos una celda para cada encabezado.
-        pdf.ln() # Salto de línea después de los encabezados.
-
-        # --- Datos de la Tabla PDF ---
-        pdf.set_font("Arial", size=8) # Fuente normal para los datos.
-        for trans in transactions: # Iteramos sobre cada transacción para añadirla a la tabla.
-            pdf.cell(col_widths[0], 7, str(trans['idtransaccion']), border=1)
-            pdf.cell(col_widths[1], 7, trans['tipo'], border=1)
-            pdf.cell(col_widths[2], 7, trans['metododepago'], border=1)
-            pdf.cell(col_widths[3], 7, f"${trans['monto_transaccion']:.2f}", border=1)
-            pdf.cell(col_widths[4], 7, str(trans['fecha_transaccion']), border=1)
-            pdf.cell(col_widths[5], 7, trans['estado'], border=1)
-            pdf.ln() # Salto de línea después de cada fila de datos.
-
-        try:
-            pdf.output(filename) # Guardamos el documento PDF en el archivo especificado.
-            messagebox.showinfo("Exportar PDF", f"Reporte de transacciones exportado a {filename}")
-        except Exception as e:
-            messagebox.showerror("Error de Exportación", f"No se pudo exportar a PDF: {e}")
-
-    # Método para exportar la lista de transacciones a un archivo Excel (.xlsx).
-    # Utiliza la librería openpyxl para crear el libro de trabajo.
-    def export_transactions_to_excel(self, transactions, filename="transactions_report.xlsx"):
-        if not transactions: # Si no hay transacciones, mostramos un mensaje y salimos.
-            messagebox.showinfo("Exportar Excel", "No hay transacciones para exportar.")
+        start_date, end_date = self.date_filter
+        self.view.show_export_progress(0, None)
+        start_or_render(
+            self.report_engine, self.transaction_model.db, "transactions",
+            self.current_user['idcedula'], start_date, end_date, filename,
+            on_progress=self.view.show_export_progress,
+            on_done=lambda count: self._on_pdf_exported(count, filename),
+            on_error=self._on_pdf_failed
+        )
+
+    # Método privado que informa el final del reporte PDF (en el hilo de Tk).
+    def _on_pdf_exported(self, count, filename):
+        self.view.hide_export_progress()
+        if count == 0: # Si no hay transacciones, mostramos un mensaje.
+            self.ui.showinfo("Exportar PDF", "No hay transacciones para exportar.")
+        else:
+            self.ui.showinfo("Exportar PDF", f"Reporte de transacciones exportado a {filename} ({count} filas)")
+
+    # Método privado que informa un error del reporte PDF (en el hilo de Tk).
+    def _on_pdf_failed(self, error):
+        self.view.hide_export_progress()
+        self.ui.showerror("Error de Exportación", f"No se pudo exportar a PDF: {error}")
+
+    # Método para exportar las transacciones (con el filtro de fechas actual) a un archivo Excel (.xlsx).
+    # Las filas se leen de la base de datos en bloques y se escriben directamente en un libro de
+    # solo escritura, en segundo plano, así la memoria no crece con el tamaño del historial.
+    # La Vista muestra el progreso mientras tanto.
+    def export_transactions_to_excel(self, filename="transactions_report.xlsx"):
+        if not self.current_user:
+            self.ui.showinfo("Exportar Excel", "No hay transacciones para exportar.")
             return
-
-        workbook = openpyxl.Workbook() # Creamos un nuevo libro de trabajo de Excel.
-        sheet = workbook.active        # Obtenemos la hoja activa (la primera por defecto).
-        sheet.title = "Reporte de Transacciones" # Establecemos el título de la hoja.
-
-        # --- Encabezados de la Tabla Excel ---
-        headers = ["ID", "Tipo", "Método Pago", "Monto", "Fecha", "Estado"]
-        sheet.append(headers) # Añadimos los encabezados como la primera fila.
-
-        # --- Datos de la Tabla Excel ---
-        for trans in transactions: # Iteramos sobre cada transacción para añadirla a la hoja.
-            sheet.append([
+        start_date, end_date = self.date_filter
+        self.view.show_export_progress(0, None)
+        submit_or_run(
+            self.db_executor, self._stream_transactions_to_excel,
+            self.current_user['idcedula'], start_date, end_date, filename,
+            on_success=lambda count: self._on_excel_exported(count, filename),
+            on_error=self._on_excel_failed,
+            key="transactions_excel"
+        )
+
+    # Método privado que hace la exportación (se ejecuta en un hilo de trabajo).
+    # Devuelve el número de transacciones exportadas.
+    def _stream_transactions_to_excel(self, user_id, start_date, end_date, filename):
+        total = self.transaction_model.count_transactions_by_user(user_id, start_date, end_date)
+        if not total:
+            return 0
+        transactions = self.transaction_model.iter_transactions_by_user(user_id, start_date, end_date)
+        return stream_to_excel(
+            transactions, filename, "Reporte de Transacciones",
+            headers=["ID", "Tipo", "Método Pago", "Monto", "Fecha", "Estado"],
+            row_values=lambda trans: [
                 trans['idtransaccion'],
                 trans['tipo'],
                 trans['metododepago'],
                 trans['monto_transaccion'],
                 trans['fecha_transaccion'],
                 trans['estado']
-            ])
-        try:
-            workbook.save(filename) # Guardamos el libro de trabajo de Excel en el archivo especificado.
-            messagebox.showinfo("Exportar Excel", f"Reporte de transacciones exportado a {filename}")
-        except Exception as e:
-            messagebox.showerror("Error de Exportación", f"No se pudo exportar a Excel: {e}")
\ No newline at end of file
+            ],
+            progress=lambda count: post_or_call(self.db_executor, self.view.show_export_progress, count, total)
+        )
+
+    # Método privado que informa el final de la exportación (en el hilo de Tk).
+    def _on_excel_exported(self, count, filename):
+        self.view.hide_export_progress()
+        if count == 0: # Si no hay transacciones, mostramos un mensaje.
+            self.ui.showinfo("Exportar Excel", "No hay transacciones para exportar.")
+        else:
+            self.ui.showinfo("Exportar Excel", f"Reporte de transacciones exportado a {filename} ({count} filas)")
+
+    # Método privado que informa un error de la exportación (en el hilo de Tk).
+    def _on_excel_failed(self, error):
+        self.view.hide_export_progress()
+        self.ui.showerror("Error de Exportación", f"No se pudo exportar a Excel: {error}")
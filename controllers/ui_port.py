@@ -0,0 +1,56 @@
+# controllers/ui_port.py
+# Este archivo define el "puerto" de interfaz de los controladores: los mensajes emergentes
+# que muestran al usuario (información, errores, advertencias y preguntas de sí/no).
+# Los controladores ya no llaman a 'tkinter.messagebox' directamente, sino a su atributo 'ui'.
+# En la aplicación es un TkUIPort (ventanas emergentes de Tk); en scripts y benchmarks, donde
+# no hay pantalla, se reemplaza por un HeadlessUIPort que solo anota los mensajes.
+
+# --- Importación de Bibliotecas ---
+from tkinter import messagebox # Para mostrar mensajes emergentes (pop-ups) al usuario.
+
+
+# --- Definición de la Clase TkUIPort ---
+# Muestra los mensajes con las ventanas emergentes de Tk.
+class TkUIPort:
+    def showinfo(self, title, message, **options):
+        return messagebox.showinfo(title, message, **options)
+
+    def showerror(self, title, message, **options):
+        return messagebox.showerror(title, message, **options)
+
+    def showwarning(self, title, message, **options):
+        return messagebox.showwarning(title, message, **options)
+
+    def askyesno(self, title, message, **options):
+        return messagebox.askyesno(title, message, **options)
+
+
+# --- Definición de la Clase HeadlessUIPort ---
+# Puerto sin pantalla: anota cada mensaje en 'messages' como una tupla (tipo, título, mensaje)
+# y responde las preguntas con 'answer'. No bloquea, así los controladores se pueden usar
+# (y medir) sin una ventana de Tk.
+class HeadlessUIPort:
+    def __init__(self, answer=True):
+        self.answer = answer
+        self.messages = []
+
+    def showinfo(self, title, message, **options):
+        self.messages.append(('info', title, message))
+
+    def showerror(self, title, message, **options):
+        self.messages.append(('error', title, message))
+
+    def showwarning(self, title, message, **options):
+        self.messages.append(('warning', title, message))
+
+    def askyesno(self, title, message, **options):
+        self.messages.append(('question', title, message))
+        return self.answer
+
+    # Método para obtener los mensajes de un tipo (ej. 'error').
+    def of_kind(self, kind):
+        return [(title, message) for message_kind, title, message in self.messages if message_kind == kind]
+
+    # Método para descartar los mensajes anotados.
+    def clear(self):
+        self.messages.clear()
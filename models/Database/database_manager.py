@@ -1,68 +1,236 @@
-import mysql.connector # Importamos la biblioteca para conectar Python con bases de datos MySQL.
-from mysql.connector import Error # Importamos la clase Error para manejar excepciones específicas de MySQL.
+import threading # Importamos threading para limitar cuántos hilos usan las conexiones a la vez.
+import time # Importamos time para medir la lectura de los resultados por bloques.
+from contextlib import contextmanager # Para escribir 'get_connection' como un bloque 'with'.
+
 from models.config.settings import Config # Importamos la configuración de la base de datos desde settings.py.
+from models.Database.query_stats import QueryStats # Latencias, filas, errores y consultas lentas por sentencia.
+
+
+# Función que crea el motor de base de datos indicado ('mysql' o 'sqlite', ver Config.DB_BACKEND).
+# Cada motor se importa solo si se usa: una instalación con SQLite no necesita mysql.connector.
+def create_backend(name, pool_config):
+    if name == 'mysql':
+        from models.Database.mysql_backend import MySQLBackend
+        return MySQLBackend(pool_config)
+    if name == 'sqlite':
+        from models.Database.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(Config.SQLITE_CONFIG, pool_config)
+    raise ValueError(f"Motor de base de datos desconocido: {name}")
 
 
 # --- Definición de la Clase DatabaseConnector ---
-# Esta clase es responsable de gestionar la conexión con la base de datos MySQL
-# y de ejecutar consultas. Es un ejemplo del patrón de diseño "Fachada" o "Singleton"
-# para el acceso a la base de datos, centralizando la lógica de conexión.
+# Esta clase es responsable de gestionar las conexiones con la base de datos
+# y de ejecutar consultas. Es un ejemplo del patrón de diseño "Fachada" para el
+# acceso a la base de datos, centralizando la lógica de conexión.
+# Lo propio de cada base de datos está en su motor ('backend'): cómo se abren y se
+# reutilizan las conexiones, cómo se ejecutan las sentencias y qué errores lanza.
+#   - MySQLBackend (mysql_backend.py): pool de conexiones a un servidor MySQL, con
+#     reconexión automática y sentencias preparadas.
+#   - SQLiteBackend (sqlite_backend.py): un archivo local, sin servidor (ej. un kiosco).
+# Los modelos escriben el SQL de MySQL (con '%s'); cada motor lo adapta si hace falta.
 class DatabaseConnector:
     # El constructor (__init__) se llama cuando creamos un objeto DatabaseConnector.
-    def __init__(self):
-        self.connection = None # Inicializamos la conexión como None (sin conexión activa).
-        self.connect()         # Intentamos establecer la conexión inmediatamente.
+    # 'pool_config' permite sobrescribir valores de Config.DB_POOL_CONFIG (ej. otro tamaño de pool).
+    # 'backend' permite indicar el motor (por defecto, el de Config.DB_BACKEND).
+    def __init__(self, pool_config=None, backend=None):
+        self.pool_config = dict(Config.DB_POOL_CONFIG, **(pool_config or {}))
+        self.backend = backend or create_backend(Config.DB_BACKEND, self.pool_config)
+        # El pool de mysql.connector lanza un error si se agota en lugar de esperar.
+        # Con este semáforo, un hilo que no encuentra conexión libre espera su turno.
+        self._slots = threading.BoundedSemaphore(self.backend.pool_size)
+        # Estadísticas de las consultas (ver query_stats.py): se consultan desde el menú "Diagnóstico".
+        self.stats = QueryStats()
+        self.connect() # Intentamos abrir la base de datos inmediatamente.
 
-    # Método para establecer la conexión con la base de datos.
-    # Utiliza la configuración definida en 'settings.py'.
+    # Método para abrir la base de datos (crear el pool de conexiones o abrir el archivo).
+    # Devuelve True si quedó disponible, False en caso contrario.
     def connect(self):
+        return self.backend.connect()
+
+    # Método para obtener una conexión dentro de un bloque 'with'.
+    # Al salir del bloque, la conexión se devuelve al pool (no se cierra).
+    @contextmanager
+    def get_connection(self):
+        self._slots.acquire() # Esperamos a que haya una conexión libre.
+        cnx = None
         try:
-            # Hacemos una copia de la configuración de la base de datos para poder modificarla
-            # (por ejemplo, añadir 'autocommit') sin afectar la configuración original.
-            db_config = Config.DB_CONFIG.copy()
-            # Con 'autocommit=True', cada comando que enviamos a la base de datos
-            # se guarda (commit) automáticamente. Esto simplifica las transacciones.
-            db_config['autocommit'] = True
-            # Usamos 'mysql.connector.connect' para establecer la conexión,
-            # pasando la configuración como argumentos clave-valor (**db_config).
-            self.connection = mysql.connector.connect(**db_config)
-            print("Conexión exitosa a la BD") # Mensaje de éxito en la consola.
-        # Si ocurre algún error durante el intento de conexión, lo capturamos.
-        except Error as e:
-            print(f"Error de conexión: {e}") # Imprimimos el mensaje de error.
+            cnx = self.backend.checkout()
+            yield cnx
+        finally:
+            if cnx is not None:
+                self.backend.release(cnx)
+            self._slots.release()
+
+    # Método privado que devuelve las sentencias de una conexión (la caché de sentencias preparadas en MySQL).
+    def _statements(self, cnx):
+        return self.backend.statements(cnx)
 
     # Método para ejecutar consultas de selección (SELECT) en la base de datos.
     # Devuelve los resultados de la consulta.
+    # Si la conexión se pierde a mitad de la consulta, se reintenta una vez con una
+    # conexión validada: una lectura se puede repetir sin efectos secundarios.
     def execute_query(self, query, params=None):
-        try:
-            # Creamos un 'cursor'. Un cursor es un objeto que nos permite ejecutar comandos SQL.
-            # 'dictionary=True' hace que los resultados se devuelvan como diccionarios,
-            # donde las claves son los nombres de las columnas.
-            cursor = self.connection.cursor(dictionary=True)
-            # Ejecutamos la consulta SQL. 'params or ()' maneja el caso donde no hay parámetros.
-            cursor.execute(query, params or ())
-            result = cursor.fetchall() # Obtenemos todos los resultados de la consulta.
-            cursor.close()             # Cerramos el cursor para liberar recursos.
-            return result              # Devolvemos los resultados.
-        except Error as e: # Si ocurre un error durante la ejecución de la consulta, lo capturamos.
-            print(f"Error en query: {e}") # Imprimimos el mensaje de error.
-            return None                # Devolvemos None para indicar que hubo un fallo.
+        for attempt in range(2):
+            try:
+                with self.get_connection() as cnx:
+                    # Ejecutamos la consulta con la sentencia preparada de esta conexión (se prepara
+                    # la primera vez que se usa este texto SQL). Las filas se devuelven como diccionarios,
+                    # donde las claves son los nombres de las columnas.
+                    statements = self._statements(cnx)
+                    with self.stats.measure(query) as measurement: # Medimos la duración y las filas.
+                        cursor = statements.execute(query, params)
+                        result = statements.fetchall(cursor)
+                        measurement['rows'] = len(result)
+                    return result # Devolvemos todos los resultados.
+            except self.backend.Error as e: # Si ocurre un error durante la ejecución de la consulta, lo capturamos.
+                if attempt == 0 and self.backend.is_disconnect(e):
+                    print(f"Conexión perdida durante la consulta ({e}). Reintentando...")
+                    continue
+                print(f"Error en query: {e}") # Imprimimos el mensaje de error.
+                return None                # Devolvemos None para indicar que hubo un fallo.
+
+    # Método para recorrer el resultado de una consulta muy grande sin cargarlo entero en memoria.
+    # Es un generador: usa un cursor sin búfer (los datos se quedan en el servidor hasta que se
+    # piden) y los lee en bloques de 'chunk_size' filas con 'fetchmany'. La conexión queda
+    # ocupada mientras se recorre el resultado. A diferencia de 'execute_query', los errores
+    # se propagan: quien consume el flujo debe saber si se cortó a mitad de camino.
+    def fetch_iter(self, query, params=None, chunk_size=1000):
+        for rows in self.fetchmany(query, params, chunk_size):
+            yield from rows
+
+    # Igual que 'fetch_iter', pero entrega las filas en bloques (listas de hasta 'chunk_size' filas),
+    # para quien las procesa de a tandas (ej. escribir un bloque de filas por vez).
+    # Las sentencias preparadas leen sus filas del servidor a medida que se piden.
+    # En las estadísticas se cuenta solo el tiempo de lectura, no el que tarda quien consume las filas.
+    def fetchmany(self, query, params=None, chunk_size=1000):
+        with self.get_connection() as cnx:
+            statements = self._statements(cnx)
+            elapsed, total_rows, failed = 0.0, 0, True
+            try:
+                start = time.perf_counter()
+                cursor = statements.execute(query, params)
+                while True:
+                    rows = statements.fetchmany(cursor, chunk_size)
+                    elapsed += time.perf_counter() - start
+                    if not rows:
+                        break
+                    total_rows += len(rows)
+                    yield rows
+                    start = time.perf_counter()
+                failed = False
+            finally:
+                # Si se dejó de leer antes del final, descartamos el resto para poder reutilizar la conexión.
+                statements.finish()
+                self.stats.record(query, elapsed * 1000, total_rows, error=failed and total_rows == 0)
 
     # Método para ejecutar consultas de modificación (INSERT, UPDATE, DELETE) en la base de datos.
     # Devuelve True si la operación fue exitosa, False en caso contrario.
+    # A diferencia de las lecturas, no se reintenta tras perder la conexión durante la ejecución:
+    # el servidor pudo haber aplicado el cambio y repetirlo lo duplicaría.
     def execute_update(self, query, params=None):
         try:
-            # Creamos un cursor (sin 'dictionary=True' porque no esperamos resultados para estas operaciones).
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ()) # Ejecutamos la consulta.
-            cursor.close()                     # Cerramos el cursor.
-            return True                        # Indicamos éxito.
-        except Error as e: # Si ocurre un error, lo capturamos.
+            with self.get_connection() as cnx:
+                with self.stats.measure(query) as measurement:
+                    cursor = self._statements(cnx).execute(query, params) # Ejecutamos la consulta (preparada).
+                    measurement['rows'] = cursor.rowcount
+                return True # Indicamos éxito.
+        except self.backend.Error as e: # Si ocurre un error, lo capturamos.
             print(f"Error en update: {e}") # Imprimimos el mensaje de error.
             return False                       # Indicamos fallo.
 
-    # Método para cerrar la conexión a la base de datos.
+    # Método para ejecutar la misma sentencia con muchas filas de parámetros (ej. un INSERT masivo).
+    # Un INSERT ... VALUES se envía como un único INSERT con todas las filas.
+    # Devuelve True si la operación fue exitosa, False en caso contrario. Como 'execute_update',
+    # no se reintenta; si falla, no se guarda ninguna fila (todas van en una sola transacción).
+    def execute_many(self, query, seq_params):
+        try:
+            with self.transaction() as cursor:
+                cursor.executemany(query, seq_params)
+                return True
+        except self.backend.Error as e:
+            print(f"Error en update masivo: {e}")
+            return False
+
+    # Método para ejecutar varias sentencias como una sola transacción, dentro de un bloque 'with'.
+    # Entrega un cursor (con resultados como diccionarios y sentencias preparadas, ver StatementCursor)
+    # sobre una única conexión: si el bloque termina bien se confirma todo (commit); si lanza
+    # una excepción se deshace todo (rollback) y la excepción se propaga. Igual que 'execute_update', no se reintenta tras perder la conexión.
+    @contextmanager
+    def transaction(self):
+        with self.get_connection() as cnx:
+            self.backend.begin(cnx) # Suspende el 'autocommit' hasta el commit o el rollback.
+            cursor = StatementCursor(self._statements(cnx), self.stats)
+            try:
+                yield cursor
+                self.backend.commit(cnx)
+            except BaseException:
+                try:
+                    self.backend.rollback(cnx)
+                except self.backend.Error as e: # Si la conexión se perdió, el servidor ya descartó la transacción.
+                    print(f"Error al deshacer la transacción: {e}")
+                raise
+            finally:
+                cursor.close()
+
+    # Método para cerrar las conexiones con la base de datos.
     # Es importante cerrar las conexiones cuando ya no se necesitan para liberar recursos.
     def disconnect(self):
-        if self.connection: # Verificamos si la conexión está activa antes de intentar cerrarla.
-            self.connection.close() # Cerramos la conexión.
\ No newline at end of file
+        self.backend.disconnect()
+
+
+# --- Definición de la Clase StatementCursor ---
+# Cursor que entrega DatabaseConnector.transaction: se usa igual que un cursor de mysql.connector
+# ('execute', 'executemany', 'fetchone', 'fetchall', 'lastrowid', 'rowcount'), pero cada
+# sentencia se ejecuta con las sentencias de la conexión del motor (en MySQL, con la
+# sentencia preparada de la caché de la conexión, ver StatementCache).
+# Si recibe 'stats' (ver QueryStats), mide cada sentencia: las filas modificadas al ejecutarla
+# y las filas leídas a medida que se piden.
+class StatementCursor:
+    def __init__(self, statements, stats=None):
+        self.statements = statements
+        self.stats = stats
+        self._cursor = None
+        self._sql = None
+
+    def execute(self, sql, params=None):
+        self._run(sql, self.statements.execute, params)
+
+    def executemany(self, sql, seq_params):
+        self._run(sql, self.statements.execute_many, seq_params)
+
+    def fetchone(self):
+        return self._count(self.statements.fetchone(self._cursor))
+
+    def fetchall(self):
+        return self._count(self.statements.fetchall(self._cursor))
+
+    def fetchmany(self, size=1):
+        return self._count(self.statements.fetchmany(self._cursor, size))
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    # Los cursores quedan en la caché de la conexión: cerrar solo descarta las filas sin leer.
+    def close(self):
+        self.statements.finish()
+
+    # Método privado que ejecuta una sentencia, midiéndola si hay estadísticas.
+    def _run(self, sql, execute, params):
+        self._sql = sql
+        if self.stats is None:
+            self._cursor = execute(sql, params)
+            return
+        with self.stats.measure(sql) as measurement:
+            self._cursor = execute(sql, params)
+            measurement['rows'] = self._cursor.rowcount if not self._cursor.description else 0
+
+    # Método privado que suma a las estadísticas las filas leídas.
+    def _count(self, rows):
+        if self.stats is not None and rows:
+            self.stats.add_rows(self._sql, 1 if isinstance(rows, dict) else len(rows))
+        return rows
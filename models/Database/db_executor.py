@@ -0,0 +1,140 @@
+# models/Database/db_executor.py
+# Este archivo define el ejecutor en segundo plano para el acceso a datos.
+# Tkinter no es seguro entre hilos y su bucle principal (mainloop) se congela
+# si una consulta a MySQL tarda. Por eso las llamadas a los modelos se envían
+# a un pool de hilos y sus resultados se entregan de vuelta al hilo de Tk
+# mediante 'root.after'.
+
+# --- Importación de Bibliotecas ---
+import queue # Cola segura entre hilos para pasar resultados al hilo de Tk.
+import threading # Para proteger el registro de tareas por clave.
+from concurrent.futures import ThreadPoolExecutor # Pool de hilos que devuelve objetos 'Future'.
+
+from models.config.settings import Config # Usamos el tamaño del pool de BD para dimensionar los hilos.
+from models.Database.query_stats import with_action # Para atribuir las consultas de cada tarea a su controlador.
+
+
+# --- Definición de la Clase DatabaseExecutor ---
+# Ejecuta funciones (normalmente métodos de los modelos) en hilos de trabajo y
+# llama a los callbacks 'on_success'/'on_error' en el hilo de Tk.
+# - 'key': identifica peticiones que se reemplazan entre sí. Si llega una nueva
+#   petición con la misma clave, la anterior se cancela y su resultado se descarta
+#   (ej. el usuario aplica un filtro de fechas antes de que termine la carga previa).
+# - 'serial': las tareas marcadas así se ejecutan de una en una y en orden de envío.
+#   Se usa para las escrituras de saldo, que no deben adelantarse unas a otras.
+class DatabaseExecutor:
+    def __init__(self, root, max_workers=None, poll_interval_ms=20):
+        self.root = root # Ventana raíz; se usa para programar la entrega con 'after'.
+        self.poll_interval_ms = poll_interval_ms
+        # Tantos hilos como conexiones en el pool: más hilos solo esperarían una conexión libre.
+        self._workers = ThreadPoolExecutor(
+            max_workers=max_workers or Config.DB_POOL_CONFIG['pool_size'],
+            thread_name_prefix="db-worker"
+        )
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._completed = queue.SimpleQueue() # Resultados pendientes de entregar al hilo de Tk.
+        self._latest = {}                     # Última petición enviada por cada clave.
+        self._lock = threading.Lock()
+        self._closed = False
+        self._poll_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    # Método para enviar una tarea al pool. Devuelve el 'Future' de la tarea.
+    # Las consultas de la tarea se atribuyen (en las estadísticas) a la acción del controlador que la envía.
+    def submit(self, fn, *args, on_success=None, on_error=None, key=None, serial=False, **kwargs):
+        pool = self._writer if serial else self._workers
+        return self.watch(pool.submit(with_action(fn), *args, **kwargs), on_success=on_success, on_error=on_error, key=key)
+
+    # Método para entregar en el hilo de Tk el resultado de un 'Future' creado en otro lugar
+    # (ej. una tarea de un pool de procesos). Funciona igual que 'submit' con sus callbacks y clave.
+    def watch(self, future, on_success=None, on_error=None, key=None):
+        if key is not None:
+            with self._lock:
+                previous = self._latest.get(key)
+                self._latest[key] = future
+            if previous is not None:
+                previous.cancel() # Si aún no empezó, no llega a ejecutarse.
+        # Al terminar (en el hilo de trabajo) solo encolamos; la entrega se hace en el hilo de Tk.
+        future.add_done_callback(lambda f: self._completed.put((f, key, on_success, on_error)))
+        return future
+
+    # Método para programar una función en el hilo de Tk desde un hilo de trabajo.
+    # Útil para informar progreso durante tareas largas.
+    def post(self, callback, *args):
+        self._completed.put((None, None, lambda _result: callback(*args), None))
+
+    # Método para descartar la petición en curso de una clave (ej. al cerrar sesión).
+    def cancel(self, key):
+        with self._lock:
+            future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    # Método privado que se ejecuta periódicamente en el hilo de Tk y entrega los resultados.
+    def _poll(self):
+        while True:
+            try:
+                future, key, on_success, on_error = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            self._deliver(future, key, on_success, on_error)
+        if not self._closed:
+            self._poll_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    # Método privado que llama al callback adecuado para una tarea terminada.
+    def _deliver(self, future, key, on_success, on_error):
+        if future is None: # Es un 'post': no hay resultado que comprobar.
+            on_success(None)
+            return
+        if future.cancelled():
+            return
+        if key is not None:
+            with self._lock:
+                if self._latest.get(key) is not future: # Llegó una petición más reciente: resultado obsoleto.
+                    return
+                del self._latest[key]
+        error = future.exception()
+        try:
+            if error is not None:
+                if on_error:
+                    on_error(error)
+                else:
+                    print(f"Error en tarea de BD: {error}")
+            elif on_success:
+                on_success(future.result())
+        except Exception as e: # Un error en el callback no debe detener la entrega del resto.
+            print(f"Error al entregar resultado de BD: {e}")
+
+    # Método para detener el ejecutor al cerrar la aplicación.
+    def shutdown(self):
+        self._closed = True
+        self.root.after_cancel(self._poll_id)
+        self._workers.shutdown(wait=False)
+        self._writer.shutdown(wait=True) # Dejamos terminar las escrituras de saldo ya enviadas.
+
+
+# Función auxiliar para los controladores: si hay un ejecutor, la tarea va a segundo plano;
+# si no (por ejemplo, en scripts sin ventana), se ejecuta directamente y se llama al callback.
+def submit_or_run(executor, fn, *args, on_success=None, on_error=None, key=None, serial=False, **kwargs):
+    if executor is not None:
+        return executor.submit(fn, *args, on_success=on_success, on_error=on_error,
+                               key=key, serial=serial, **kwargs)
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        if on_error:
+            on_error(e)
+        else:
+            print(f"Error en tarea de BD: {e}")
+        return None
+    if on_success:
+        on_success(result)
+    return None
+
+
+# Función auxiliar para informar a la Vista desde una tarea: con ejecutor, la llamada se
+# programa en el hilo de Tk; sin él, la tarea ya corre en ese hilo y se llama directamente.
+def post_or_call(executor, callback, *args):
+    if executor is not None:
+        executor.post(callback, *args)
+    else:
+        callback(*args)
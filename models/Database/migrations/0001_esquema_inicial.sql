@@ -0,0 +1,69 @@
+-- 0001: esquema inicial del casino.
+-- Equivale a las tablas de database.db, pero sin borrar nada: en una instalación
+-- existente las tablas ya están creadas y esta migración solo queda registrada.
+
+CREATE TABLE IF NOT EXISTS usuarios (
+    idcedula INT AUTO_INCREMENT PRIMARY KEY,
+    nombre VARCHAR(100) NOT NULL,
+    tipo_usuario ENUM('superadministrador','administrador','usuario','invitado'),
+    saldo DECIMAL(15,2) DEFAULT 0.00,
+    correo VARCHAR(100) UNIQUE NOT NULL,
+    celular BIGINT,
+    edad INT NOT NULL CHECK (edad >= 18),
+    apodo VARCHAR(50),
+    fecha_registro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    estado ENUM('activo','inactivo'),
+    contraseña VARCHAR(100) NOT NULL,
+    ruta_imagen LONGBLOB NULL
+);
+
+CREATE TABLE IF NOT EXISTS juegos (
+    idjuego INT AUTO_INCREMENT PRIMARY KEY,
+    monto_minimo DECIMAL(10,2),
+    nombre ENUM('tragamonedas','poker (solitario)','ruleta'),
+    estado ENUM('disponible', 'mantenimiento', 'deshabilitado') DEFAULT 'disponible',
+    dificultad ENUM('facil', 'medio', 'dificil') DEFAULT 'medio',
+    probabilidad_ganar DECIMAL(5,4) DEFAULT 0.45,
+    categoria_probabilidad ENUM('muy_baja', 'baja', 'media', 'alta', 'muy_alta')
+        GENERATED ALWAYS AS (
+            CASE
+                WHEN probabilidad_ganar < 0.2 THEN 'muy_baja'
+                WHEN probabilidad_ganar < 0.35 THEN 'baja'
+                WHEN probabilidad_ganar < 0.5 THEN 'media'
+                WHEN probabilidad_ganar < 0.65 THEN 'alta'
+                ELSE 'muy_alta'
+            END
+        ) STORED
+);
+
+-- Los juegos base solo se insertan si la tabla está vacía.
+INSERT INTO juegos (nombre, monto_minimo, dificultad, probabilidad_ganar, estado)
+SELECT * FROM (
+    SELECT 'poker (solitario)' AS nombre, 10.00 AS monto_minimo, 'dificil' AS dificultad, 0.55 AS probabilidad_ganar, 'disponible' AS estado
+    UNION ALL SELECT 'tragamonedas', 10.00, 'facil', 0.25, 'disponible'
+    UNION ALL SELECT 'ruleta', 12.00, 'medio', 0.48, 'disponible'
+) AS base
+WHERE NOT EXISTS (SELECT 1 FROM juegos);
+
+CREATE TABLE IF NOT EXISTS apuestas (
+    idapuesta INT AUTO_INCREMENT PRIMARY KEY,
+    idcedula INT NOT NULL,
+    idjuego INT NOT NULL,
+    FOREIGN KEY (idcedula) REFERENCES usuarios(idcedula) ON DELETE CASCADE,
+    FOREIGN KEY (idjuego) REFERENCES juegos(idjuego) ON DELETE CASCADE,
+    monto DECIMAL(20,2),
+    resultado DECIMAL(10,2),
+    ganancia DECIMAL(10,2),
+    fecha_apuesta TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS transacciones (
+    idtransaccion INT AUTO_INCREMENT PRIMARY KEY,
+    idcedula INT NOT NULL,
+    FOREIGN KEY (idcedula) REFERENCES usuarios(idcedula) ON DELETE CASCADE,
+    tipo ENUM('deposito', 'retiro', 'apuesta'),
+    metododepago ENUM('PSE', 'transferencia de ciertos bancos'),
+    fecha_transaccion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    monto_transaccion DECIMAL(20,2),
+    estado ENUM('pendiente', 'completado', 'rechazado')
+);
@@ -0,0 +1,8 @@
+-- 0002: índice compuesto para el historial de apuestas por usuario.
+-- Las consultas del historial filtran por usuario y rango de fechas y ordenan por
+-- (fecha_apuesta, idapuesta). Con solo el índice de la clave foránea, MySQL leía
+-- todas las apuestas del usuario y las ordenaba; con este índice recorre únicamente
+-- el rango pedido y ya en orden (InnoDB agrega la clave primaria al final del índice).
+-- MySQL elimina por su cuenta el índice de la clave foránea sobre idcedula, que queda redundante.
+
+CREATE INDEX idx_apuestas_usuario_fecha ON apuestas (idcedula, fecha_apuesta);
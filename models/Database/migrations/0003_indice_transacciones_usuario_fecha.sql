@@ -0,0 +1,4 @@
+-- 0003: índice compuesto para el historial de transacciones por usuario.
+-- Mismo motivo que 0002, para las consultas sobre (idcedula, fecha_transaccion).
+
+CREATE INDEX idx_transacciones_usuario_fecha ON transacciones (idcedula, fecha_transaccion);
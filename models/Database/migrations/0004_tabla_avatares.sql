@@ -0,0 +1,14 @@
+-- 0004: almacén de imágenes de perfil fuera de la fila del usuario.
+-- Antes la imagen era un LONGBLOB dentro de 'usuarios', así que cualquier SELECT poco
+-- cuidadoso sobre usuarios arrastraba los bytes de la imagen. Ahora cada imagen se guarda
+-- una sola vez en 'avatares', identificada por la huella SHA-256 de su contenido, con una
+-- fila por cada tamaño ya redimensionado (PNG). El usuario solo guarda la huella.
+
+CREATE TABLE IF NOT EXISTS avatares (
+    hash CHAR(64) NOT NULL,
+    tamano SMALLINT NOT NULL,
+    datos MEDIUMBLOB NOT NULL,
+    PRIMARY KEY (hash, tamano)
+);
+
+ALTER TABLE usuarios ADD COLUMN avatar_hash CHAR(64) NULL;
@@ -0,0 +1,31 @@
+# 0005: mueve las imágenes de perfil existentes de 'usuarios.ruta_imagen' a 'avatares'.
+# Cada imagen se redimensiona a los tamaños de AVATAR_SIZES y se guarda por su huella;
+# luego se apunta el usuario a esa huella y se vacía su columna antigua. Los usuarios se
+# procesan de a uno, así nunca hay más de una imagen en memoria. Si la migración se corta,
+# al repetirla solo se procesan los usuarios que aún conservan su imagen en 'ruta_imagen'.
+
+from models.avatar_store import AvatarStore, render_avatar_variants
+
+
+def upgrade(db):
+    store = AvatarStore(db)
+    users = db.execute_query("SELECT idcedula FROM usuarios WHERE ruta_imagen IS NOT NULL")
+    if users is None:
+        return False
+    for user in users:
+        rows = db.execute_query("SELECT ruta_imagen FROM usuarios WHERE idcedula = %s", (user['idcedula'],))
+        if not rows:
+            continue
+        image_hash = None
+        try:
+            image_hash, variants = render_avatar_variants(rows[0]['ruta_imagen'])
+        except Exception as e: # La imagen no es válida: el usuario queda sin imagen de perfil.
+            print(f"Imagen de perfil inválida del usuario {user['idcedula']}: {e}")
+        if image_hash and not store.save_variants(image_hash, variants):
+            return False
+        if not db.execute_update(
+            "UPDATE usuarios SET avatar_hash = %s, ruta_imagen = NULL WHERE idcedula = %s",
+            (image_hash, user['idcedula'])
+        ):
+            return False
+    return True
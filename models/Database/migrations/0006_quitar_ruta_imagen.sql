@@ -0,0 +1,4 @@
+-- 0006: elimina la columna antigua de imágenes de perfil.
+-- La migración 0005 ya movió todas las imágenes a 'avatares'.
+
+ALTER TABLE usuarios DROP COLUMN ruta_imagen;
@@ -0,0 +1,8 @@
+-- 0007: identificador externo (idempotente) de las apuestas.
+-- Las jugadas se anotan primero en un diario local (ver models/bet_journal.py) y después se
+-- guardan en la base de datos en tandas. Cada jugada lleva un identificador generado al
+-- jugarla; la clave única garantiza que, si una tanda se vuelve a enviar (ej. al reiniciar
+-- la aplicación tras un corte), ninguna apuesta se guarde ni se cobre dos veces.
+
+ALTER TABLE apuestas ADD COLUMN id_externo CHAR(32) NULL;
+ALTER TABLE apuestas ADD UNIQUE KEY uq_apuestas_id_externo (id_externo);
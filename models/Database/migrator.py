@@ -0,0 +1,198 @@
+# models/Database/migrator.py
+# Este archivo define el sistema de migraciones del esquema de la base de datos.
+# Cada cambio del esquema es un archivo numerado en 'models/Database/migrations'
+# (ej. '0002_indice_apuestas_usuario_fecha.sql'). Los cambios que no se pueden expresar
+# en SQL (ej. convertir datos con Python) son archivos '.py' con una función
+# 'upgrade(db)' que devuelve True si todo salió bien. La tabla 'schema_version' guarda
+# qué migraciones ya se aplicaron, así cada instalación se actualiza sola aplicando
+# únicamente las que le faltan, en orden.
+#
+# Uso desde la línea de comandos (en la carpeta del proyecto):
+#     python -m models.Database.migrator status         # Muestra la versión actual y las pendientes.
+#     python -m models.Database.migrator upgrade        # Aplica las migraciones pendientes.
+#     python -m models.Database.migrator check-indexes  # Verifica con EXPLAIN que las consultas usan los índices.
+
+# --- Importación de Bibliotecas ---
+import importlib.util # Para cargar las migraciones escritas en Python.
+import os # Para ubicar la carpeta de migraciones.
+import re # Para reconocer los nombres de archivo numerados.
+import sys # Para leer los argumentos de la línea de comandos.
+
+# Carpeta donde viven los archivos de migración.
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+# Los archivos de migración se llaman '<número>_<descripción>.sql' o '<número>_<descripción>.py'.
+MIGRATION_FILE_RE = re.compile(r"^(\d+)_(\w+)\.(sql|py)$")
+
+VERSION_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT PRIMARY KEY,
+    nombre VARCHAR(255) NOT NULL,
+    aplicada_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+# --- Definición de la Clase Migration ---
+# Representa un archivo de migración: su número de versión, su nombre y su ruta.
+class Migration:
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    # Método para obtener las sentencias SQL del archivo, una por una.
+    # Se quitan los comentarios '--' y se separa por ';' al final de cada sentencia.
+    def statements(self):
+        with open(self.path, encoding="utf-8") as f:
+            lines = [line for line in f if not line.strip().startswith("--")]
+        return [statement.strip() for statement in "".join(lines).split(";") if statement.strip()]
+
+    # Método para aplicar la migración con el conector indicado. Devuelve True si se aplicó completa.
+    def apply(self, db_connector):
+        if self.path.endswith(".py"):
+            spec = importlib.util.spec_from_file_location(f"migracion_{self.version:04d}", self.path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            return bool(module.upgrade(db_connector))
+        for statement in self.statements():
+            if not db_connector.execute_update(statement):
+                return False
+        return True
+
+
+# --- Definición de la Clase MigrationRunner ---
+# Aplica las migraciones pendientes usando el DatabaseConnector de la aplicación.
+class MigrationRunner:
+    def __init__(self, db_connector, migrations_dir=MIGRATIONS_DIR):
+        self.db = db_connector
+        self.migrations_dir = migrations_dir
+
+    # Método para listar todas las migraciones disponibles, ordenadas por versión.
+    def available(self):
+        migrations = []
+        for filename in os.listdir(self.migrations_dir):
+            match = MIGRATION_FILE_RE.match(filename)
+            if match:
+                migrations.append(Migration(int(match.group(1)), match.group(2),
+                                            os.path.join(self.migrations_dir, filename)))
+        return sorted(migrations, key=lambda migration: migration.version)
+
+    # Método para obtener las versiones ya aplicadas en esta base de datos.
+    def applied_versions(self):
+        self.db.execute_update(VERSION_TABLE_QUERY)
+        rows = self.db.execute_query("SELECT version FROM schema_version")
+        if rows is None:
+            raise RuntimeError("No se pudo leer la tabla schema_version.")
+        return {row['version'] for row in rows}
+
+    # Método para obtener la versión actual del esquema (0 si no hay ninguna aplicada).
+    def current_version(self):
+        return max(self.applied_versions(), default=0)
+
+    # Método para listar las migraciones que faltan por aplicar.
+    def pending(self):
+        applied = self.applied_versions()
+        return [migration for migration in self.available() if migration.version not in applied]
+
+    # Método para aplicar todas las migraciones pendientes, en orden.
+    # En MySQL las sentencias DDL (CREATE, ALTER...) se confirman solas, así que una migración
+    # no puede deshacerse a medias: si una sentencia falla nos detenemos sin registrar la
+    # versión, para que el problema se corrija y la migración se vuelva a intentar.
+    # Devuelve True si el esquema quedó al día.
+    def upgrade(self):
+        try:
+            pending = self.pending()
+        except RuntimeError as e: # Sin base de datos no hay nada que migrar; la aplicación sigue.
+            print(f"Error: {e}")
+            return False
+        for migration in pending:
+            print(f"Aplicando migración {migration.version:04d}_{migration.name}...")
+            if not migration.apply(self.db):
+                print(f"Error: la migración {migration.version:04d} falló; el esquema quedó en la versión {self.current_version()}.")
+                return False
+            self.db.execute_update(
+                "INSERT INTO schema_version (version, nombre) VALUES (%s, %s)",
+                (migration.version, migration.name)
+            )
+        return True
+
+
+# --- Verificación de Índices con EXPLAIN ---
+
+# Conector intermedio que antepone 'EXPLAIN' a cada consulta y la pasa al conector real.
+# Así se revisa el plan de las consultas exactas que arman los modelos, sin copiarlas aquí.
+class ExplainConnector:
+    def __init__(self, db_connector):
+        self.db = db_connector
+
+    def execute_query(self, query, params=None):
+        return self.db.execute_query("EXPLAIN " + query, params)
+
+
+# Método para comprobar que las consultas de historial de los modelos usan los índices compuestos.
+# Devuelve una lista de tuplas (consulta, tabla, índice esperado, índice usado, correcto).
+def check_hot_path_indexes(db_connector):
+    # Importamos aquí los modelos para no crear dependencias circulares al cargar este módulo.
+    from models.bet_model import BetModel
+    from models.transaction_model import TransactionModel
+
+    explain_db = ExplainConnector(db_connector)
+    bet_model = BetModel(explain_db)
+    transaction_model = TransactionModel(explain_db)
+    # Valores de ejemplo: el plan no depende de que existan filas que coincidan.
+    user_id, start_date, end_date = 1, "2024-01-01", "2024-12-31"
+    page_cursor = ("2024-06-01 00:00:00", 1)
+
+    checks = [
+        ("BetModel.get_bets_by_user", "apuestas", "idx_apuestas_usuario_fecha",
+         bet_model.get_bets_by_user(user_id, start_date, end_date)),
+        ("BetModel.get_bet_history_page", "a", "idx_apuestas_usuario_fecha",
+         bet_model.get_bet_history_page(user_id, start_date, end_date, cursor=page_cursor)),
+        ("TransactionModel.get_transactions_by_user", "transacciones", "idx_transacciones_usuario_fecha",
+         transaction_model.get_transactions_by_user(user_id, start_date, end_date)),
+        ("TransactionModel.get_transactions_page", "transacciones", "idx_transacciones_usuario_fecha",
+         transaction_model.get_transactions_page(user_id, start_date, end_date, cursor=page_cursor)),
+    ]
+
+    results = []
+    for name, table, expected_index, plan in checks:
+        used_index = None
+        for row in plan or []:
+            if row.get('table') == table:
+                used_index = row.get('key')
+        results.append((name, table, expected_index, used_index, used_index == expected_index))
+    return results
+
+
+# --- Punto de Entrada para la Línea de Comandos ---
+def main(argv=None):
+    # Importamos el conector aquí para que importar este módulo no abra conexiones.
+    from models.Database.database_manager import DatabaseConnector
+
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "status"
+    db = DatabaseConnector()
+    runner = MigrationRunner(db)
+
+    if command == "status":
+        print(f"Versión actual del esquema: {runner.current_version()}")
+        for migration in runner.pending():
+            print(f"  Pendiente: {migration.version:04d}_{migration.name}")
+        return 0
+    if command == "upgrade":
+        ok = runner.upgrade()
+        print(f"Versión actual del esquema: {runner.current_version()}")
+        return 0 if ok else 1
+    if command == "check-indexes":
+        all_ok = True
+        for name, table, expected_index, used_index, ok in check_hot_path_indexes(db):
+            all_ok = all_ok and ok
+            print(f"{'OK   ' if ok else 'FALLA'} {name}: tabla '{table}' usa '{used_index}' (esperado '{expected_index}')")
+        return 0 if all_ok else 1
+
+    print(f"Comando desconocido: {command}. Usa 'status', 'upgrade' o 'check-indexes'.")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
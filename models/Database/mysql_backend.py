@@ -0,0 +1,114 @@
+# models/Database/mysql_backend.py
+# Este archivo define el motor MySQL de DatabaseConnector (ver database_manager.py).
+# Mantiene un pool de conexiones: cada consulta toma una conexión del pool, la usa y la
+# devuelve. El pool comprueba la conexión antes de entregarla y la reconecta si MySQL la
+# cerró, así la aplicación sobrevive a una noche de inactividad sin que los modelos tengan
+# que cambiar. Cada conexión guarda sus sentencias preparadas (ver statement_cache.py).
+
+# --- Importación de Bibliotecas ---
+import threading # Importamos threading para que dos hilos no creen el pool a la vez.
+import time # Importamos time para las esperas entre reintentos de reconexión.
+
+from mysql.connector import Error # Importamos la clase Error para manejar excepciones específicas de MySQL.
+from mysql.connector import pooling # Importamos el módulo de pools de conexiones de mysql.connector.
+from models.config.settings import Config # Importamos la configuración de la base de datos desde settings.py.
+from models.Database.statement_cache import StatementCache # Sentencias preparadas por conexión.
+
+# Códigos de error del cliente MySQL que indican que la conexión se perdió
+# (servidor caído, conexión cerrada por 'wait_timeout', red interrumpida...).
+DISCONNECT_ERRNOS = {
+    2003, # CR_CONN_HOST_ERROR: no se puede conectar al servidor.
+    2006, # CR_SERVER_GONE_ERROR: "MySQL server has gone away".
+    2013, # CR_SERVER_LOST: se perdió la conexión durante la consulta.
+    2055, # CR_SERVER_LOST_EXTENDED: igual que el anterior, con más detalle.
+}
+
+
+# --- Definición de la Clase MySQLBackend ---
+class MySQLBackend:
+    name = 'mysql'
+    Error = Error # Excepción que lanzan las consultas de este motor.
+
+    # 'pool_config': la configuración del pool (ver Config.DB_POOL_CONFIG).
+    def __init__(self, pool_config):
+        self.pool_config = pool_config
+        self.pool_size = pool_config['pool_size'] # Conexiones que se pueden usar a la vez.
+        self.pool = None # Inicializamos el pool como None (sin conexiones activas).
+        self._pool_lock = threading.Lock() # Evita que dos hilos creen el pool a la vez.
+
+    # Método para crear el pool de conexiones con la base de datos.
+    # Utiliza la configuración definida en 'settings.py'.
+    # Devuelve True si el pool quedó disponible, False en caso contrario.
+    def connect(self):
+        with self._pool_lock:
+            if self.pool is not None: # Otro hilo ya lo creó mientras esperábamos.
+                return True
+            try:
+                # Hacemos una copia de la configuración de la base de datos para poder modificarla
+                # (por ejemplo, añadir 'autocommit') sin afectar la configuración original.
+                db_config = Config.DB_CONFIG.copy()
+                # Con 'autocommit=True', cada comando que enviamos a la base de datos
+                # se guarda (commit) automáticamente. Esto simplifica las transacciones.
+                db_config['autocommit'] = True
+                # 'pool_reset_session=False' evita un viaje extra al servidor cada vez que
+                # una conexión vuelve al pool, y conserva sus sentencias preparadas (ver StatementCache).
+                self.pool = pooling.MySQLConnectionPool(
+                    pool_name=self.pool_config['pool_name'],
+                    pool_size=self.pool_config['pool_size'],
+                    pool_reset_session=False,
+                    **db_config
+                )
+                print(f"Conexión exitosa a la BD (pool de {self.pool_config['pool_size']} conexiones)")
+                return True
+            # Si ocurre algún error durante el intento de conexión, lo capturamos.
+            except Error as e:
+                print(f"Error de conexión: {e}") # Imprimimos el mensaje de error.
+                self.pool = None
+                return False
+
+    # Método que saca una conexión del pool, reintentando con espera exponencial
+    # si el servidor no responde. Al entregar la conexión, el pool hace un ping y,
+    # si la conexión estaba caída, la reconecta.
+    def checkout(self):
+        delay = self.pool_config['reconnect_backoff']
+        attempts = self.pool_config['reconnect_attempts']
+        for attempt in range(attempts + 1):
+            try:
+                if self.pool is None and not self.connect():
+                    raise Error("No hay pool de conexiones disponible.")
+                return self.pool.get_connection()
+            except Error as e:
+                if attempt == attempts: # Agotamos los reintentos: propagamos el error.
+                    raise
+                print(f"Conexión no disponible ({e}). Reintentando en {delay:.1f}s...")
+                time.sleep(delay)
+                delay = min(delay * 2, self.pool_config['reconnect_backoff_max'])
+
+    # Método que devuelve una conexión al pool (en una conexión del pool, 'close' no la cierra).
+    def release(self, cnx):
+        cnx.close()
+
+    # Método que devuelve la caché de sentencias preparadas y cursores de una conexión.
+    def statements(self, cnx):
+        return StatementCache.for_connection(cnx, self.pool_config['statement_cache_size'])
+
+    # Métodos para las transacciones: 'start_transaction' suspende el 'autocommit' hasta el commit o el rollback.
+    def begin(self, cnx):
+        cnx.start_transaction()
+
+    def commit(self, cnx):
+        cnx.commit()
+
+    def rollback(self, cnx):
+        cnx.rollback()
+
+    # Método auxiliar para saber si un error significa que se perdió la conexión.
+    @staticmethod
+    def is_disconnect(error):
+        return getattr(error, 'errno', None) in DISCONNECT_ERRNOS
+
+    # Método para cerrar las conexiones del pool.
+    def disconnect(self):
+        if self.pool: # Verificamos si el pool existe antes de intentar cerrarlo.
+            self.pool._remove_connections() # Cerramos todas las conexiones inactivas del pool.
+            self.pool = None
@@ -0,0 +1,268 @@
+# models/Database/query_stats.py
+# Este archivo define las estadísticas de las consultas a la base de datos.
+# Antes, lo único que se sabía de una consulta era si fallaba ("Error en query: ...").
+# Ahora DatabaseConnector mide cada sentencia: cuántas veces se ejecuta, cuánto tarda
+# (histograma de latencias), cuántas filas devuelve o modifica y cuántas veces falla.
+# Además, las que superan un umbral quedan en el registro de consultas lentas.
+# Cada medición se atribuye a quién la hizo: el método del modelo (ej. 'BetModel.get_bet_history_page')
+# y la acción del controlador que la originó (ej. 'BetController.load_user_bets'), aunque la
+# consulta corra en un hilo del DatabaseExecutor.
+# Se consultan desde el menú oculto "Diagnóstico" (Ctrl+Shift+D) y se pueden guardar en un archivo JSON.
+
+# --- Importación de Bibliotecas ---
+import datetime # Para la hora de cada consulta lenta.
+import json # Para guardar las estadísticas en un archivo.
+import os # Para reconocer las rutas de los modelos y controladores en la pila de llamadas.
+import re # Para normalizar el texto SQL.
+import sys # Para recorrer la pila de llamadas (sys._getframe).
+import threading # Para proteger las estadísticas (se registran desde varios hilos).
+import time # Para medir la duración de cada consulta.
+from collections import Counter, deque # Conteo de llamadas por origen y registro de lentas acotado.
+from contextlib import contextmanager # Para medir una consulta con un bloque 'with'.
+from functools import lru_cache # Cada texto SQL se normaliza una sola vez.
+
+from models.config.settings import Config # Importamos la configuración desde settings.py.
+
+# Límites superiores (en milisegundos) de los intervalos del histograma de latencias.
+# El último intervalo (sin límite) cuenta las consultas más lentas que el último valor.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Carpetas cuyos métodos se usan para atribuir una consulta (ver 'call_site').
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_MODELS_DIR = os.path.join(_BASE_DIR, 'models') + os.sep
+_DATABASE_DIR = os.path.join(_BASE_DIR, 'models', 'Database') + os.sep
+_CONTROLLERS_DIR = os.path.join(_BASE_DIR, 'controllers') + os.sep
+
+# Acción del controlador que originó la tarea que corre en cada hilo (ver 'with_action').
+_context = threading.local()
+
+
+# Función que normaliza un texto SQL para agrupar sus ejecuciones: une los espacios y
+# resume las listas de parámetros de largo variable ('IN (%s, %s, %s)' -> 'IN (%s, ...)').
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    sql = " ".join(sql.split())
+    return re.sub(r"\(\s*%s(?:\s*,\s*%s)+\s*\)", "(%s, ...)", sql)
+
+
+# Función privada que devuelve el nombre de un método a partir de su marco en la pila (ej. 'BetModel.add_bet').
+def _frame_name(frame):
+    instance = frame.f_locals.get('self')
+    if instance is not None:
+        return f"{type(instance).__name__}.{frame.f_code.co_name}"
+    return frame.f_code.co_name
+
+
+# Función que busca en la pila de llamadas el método del controlador que está en ejecución.
+# Devuelve su nombre (ej. 'SlotMachineController.play_slot_machine') o None.
+def controller_action(frame=None):
+    frame = frame or sys._getframe(1)
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(_CONTROLLERS_DIR):
+            return _frame_name(frame)
+        frame = frame.f_back
+    return None
+
+
+# Función que devuelve el origen de la consulta en curso: una tupla (método del modelo, acción del controlador).
+# La acción es la que se asignó al hilo con 'with_action' o, si no hay, la que aparece en la pila.
+# Las consultas hechas fuera de un controlador (ej. el hilo del diario de apuestas) se atribuyen al hilo.
+def call_site():
+    model = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if model is None and filename.startswith(_MODELS_DIR) and not filename.startswith(_DATABASE_DIR):
+            model = _frame_name(frame)
+        if filename.startswith(_CONTROLLERS_DIR):
+            return model or "-", _frame_name(frame)
+        frame = frame.f_back
+    action = getattr(_context, 'action', None) or f"[{threading.current_thread().name}]"
+    return model or "-", action
+
+
+# Función que envuelve una tarea para que sus consultas se atribuyan a la acción del controlador
+# que la envía (la tarea corre en otro hilo, donde el controlador ya no está en la pila).
+def with_action(fn):
+    action = controller_action(sys._getframe(1))
+    if action is None:
+        return fn
+
+    def run(*args, **kwargs):
+        previous = getattr(_context, 'action', None)
+        _context.action = action
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _context.action = previous
+    return run
+
+
+# --- Definición de la Clase StatementStats ---
+# Estadísticas acumuladas de una sentencia (texto SQL normalizado).
+class StatementStats:
+    def __init__(self, sql):
+        self.sql = sql
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1) # Cantidad de consultas por intervalo de latencia.
+        self.sites = Counter()                               # (modelo, acción) -> cantidad de llamadas.
+
+    # Método para estimar un percentil de la latencia (ej. 0.95) a partir del histograma.
+    # Devuelve el límite superior del intervalo donde cae (o la latencia máxima si es el último).
+    def percentile(self, fraction):
+        if not self.calls:
+            return 0.0
+        target = fraction * self.calls
+        seen = 0
+        for limit, count in zip(LATENCY_BUCKETS_MS, self.histogram):
+            seen += count
+            if seen >= target:
+                return round(min(limit, self.max_ms), 3)
+        return round(self.max_ms, 3)
+
+    # Método para obtener las estadísticas como diccionario (para la vista y para el archivo).
+    def as_dict(self):
+        return {
+            'sql': self.sql,
+            'calls': self.calls,
+            'errors': self.errors,
+            'rows': self.rows,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': round(self.max_ms, 3),
+            'histogram': dict(zip([f"<={limit}" for limit in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"],
+                                  self.histogram)),
+            'sites': [{'model': model, 'action': action, 'calls': calls}
+                      for (model, action), calls in self.sites.most_common()],
+        }
+
+
+# --- Definición de la Clase QueryStats ---
+# Registro de las consultas de un DatabaseConnector. Es seguro entre hilos.
+class QueryStats:
+    def __init__(self, config=None):
+        config = dict(Config.QUERY_STATS_CONFIG, **(config or {}))
+        self.enabled = config['enabled']
+        self.slow_threshold_ms = config['slow_threshold_ms']
+        self.slow_log_path = config['slow_log_path']
+        self._lock = threading.Lock()
+        self._statements = {} # Texto SQL normalizado -> StatementStats.
+        self._slow = deque(maxlen=config['slow_log_size']) # Últimas consultas lentas.
+
+    # Método para medir una consulta dentro de un bloque 'with'. Entrega un diccionario donde
+    # se puede anotar la cantidad de filas ('rows'). Si el bloque lanza una excepción, la
+    # consulta se cuenta como error y la excepción se propaga.
+    @contextmanager
+    def measure(self, sql):
+        if not self.enabled:
+            yield {}
+            return
+        measurement = {'rows': 0}
+        start = time.perf_counter()
+        try:
+            yield measurement
+        except BaseException:
+            self.record(sql, (time.perf_counter() - start) * 1000, measurement['rows'], error=True)
+            raise
+        self.record(sql, (time.perf_counter() - start) * 1000, measurement['rows'])
+
+    # Método para registrar una consulta ya medida.
+    # - elapsed_ms: duración en milisegundos. - rows: filas devueltas o modificadas.
+    def record(self, sql, elapsed_ms, rows=0, error=False, site=None):
+        if not self.enabled:
+            return
+        key = normalize_sql(sql)
+        site = site or call_site()
+        bucket = next((i for i, limit in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= limit), len(LATENCY_BUCKETS_MS))
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = StatementStats(key)
+            stats.calls += 1
+            stats.errors += 1 if error else 0
+            stats.rows += max(rows or 0, 0)
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.histogram[bucket] += 1
+            stats.sites[site] += 1
+        if elapsed_ms >= self.slow_threshold_ms:
+            self._log_slow(key, elapsed_ms, rows, error, site)
+
+    # Método para sumar filas a una sentencia ya registrada (ej. filas leídas después de ejecutarla).
+    def add_rows(self, sql, rows):
+        if not self.enabled or not rows:
+            return
+        with self._lock:
+            stats = self._statements.get(normalize_sql(sql))
+            if stats is not None:
+                stats.rows += rows
+
+    # Método para obtener las estadísticas de las sentencias, de mayor a menor tiempo total.
+    # - action / model: si se indican, solo cuenta las llamadas de ese origen.
+    def snapshot(self, action=None, model=None):
+        with self._lock:
+            statements = [stats.as_dict() for stats in self._statements.values()]
+        if action or model:
+            filtered = []
+            for stats in statements:
+                sites = [site for site in stats['sites']
+                         if (not action or site['action'] == action) and (not model or site['model'] == model)]
+                if sites:
+                    filtered.append(dict(stats, sites=sites))
+            statements = filtered
+        return sorted(statements, key=lambda stats: stats['total_ms'], reverse=True)
+
+    # Método para obtener las acciones de controlador que hicieron consultas (para filtrar).
+    def actions(self):
+        with self._lock:
+            return sorted({action for stats in self._statements.values() for _, action in stats.sites})
+
+    # Método para obtener las consultas lentas registradas, de la más reciente a la más antigua.
+    def slow_queries(self):
+        with self._lock:
+            return list(reversed(self._slow))
+
+    # Método para guardar las estadísticas y el registro de consultas lentas en un archivo JSON.
+    def dump(self, path):
+        data = {
+            'generated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'slow_threshold_ms': self.slow_threshold_ms,
+            'statements': self.snapshot(),
+            'slow_queries': self.slow_queries(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    # Método para borrar las estadísticas acumuladas (ej. antes de medir una pantalla en particular).
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._slow.clear()
+
+    # Método privado que anota una consulta lenta en el registro (y en el archivo, si se configuró).
+    # No se guardan los parámetros: pueden incluir datos personales o contraseñas.
+    def _log_slow(self, sql, elapsed_ms, rows, error, site):
+        entry = {
+            'at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'ms': round(elapsed_ms, 3),
+            'rows': rows,
+            'error': error,
+            'model': site[0],
+            'action': site[1],
+            'sql': sql,
+        }
+        with self._lock:
+            self._slow.append(entry)
+        print(f"Consulta lenta ({elapsed_ms:.0f} ms, {site[1]} -> {site[0]}): {sql[:120]}")
+        if self.slow_log_path:
+            try:
+                with open(self.slow_log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"No se pudo escribir el registro de consultas lentas: {e}")
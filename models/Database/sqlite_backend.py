@@ -0,0 +1,216 @@
+# models/Database/sqlite_backend.py
+# Este archivo define el motor SQLite de DatabaseConnector (ver database_manager.py).
+# Con DB_BACKEND=sqlite, la base de datos es un archivo local y las consultas se resuelven
+# dentro del mismo proceso, sin servidor ni viajes por la red: pensado para un kiosco con
+# una sola terminal y para las pruebas.
+# Los modelos siguen escribiendo el SQL de MySQL: aquí se traducen los marcadores ('%s' -> '?')
+# y las pocas construcciones propias de MySQL que usan. El esquema es el de sqlite_schema.sql.
+# El archivo se abre en modo WAL: las lecturas (ej. un reporte en otro proceso) no bloquean
+# a las escrituras. Cada hilo usa su propia conexión, como con el pool de MySQL.
+
+# --- Importación de Bibliotecas ---
+import datetime # Para guardar y leer las fechas.
+import os # Para crear la carpeta de la base de datos y ubicar el esquema.
+import queue # Conexiones libres, listas para reutilizarse.
+import sqlite3 # Base de datos SQLite de la biblioteca estándar.
+import threading # Para abrir la base de datos una sola vez.
+from decimal import Decimal # Los montos se devuelven como Decimal, igual que con MySQL.
+from functools import lru_cache # Cada texto SQL se traduce una sola vez.
+
+# Archivo con el esquema de la base de datos para SQLite.
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sqlite_schema.sql")
+# Ruta especial de SQLite para una base de datos en memoria.
+MEMORY_PATH = ":memory:"
+
+
+# --- Conversión de Tipos ---
+# SQLite guarda los DECIMAL como números (enteros o de punto flotante). Al leer las columnas
+# DECIMAL se devuelven como Decimal, redondeadas a 4 decimales (la mayor escala del esquema)
+# para no arrastrar errores de punto flotante como 90.04999999, y con 2 decimales si alcanzan
+# (los montos: 100 -> 100.00, como los devuelve MySQL).
+# Los resultados calculados (ej. SUM) no tienen tipo declarado y llegan como números de Python.
+def _to_decimal(value):
+    number = Decimal(value.decode()).quantize(Decimal('0.0001'))
+    cents = number.quantize(Decimal('0.01'))
+    return cents if cents == number else number
+
+
+# Las fechas se guardan como texto 'AAAA-MM-DD HH:MM:SS', que se ordena y compara como en MySQL.
+def _to_datetime(value):
+    return datetime.datetime.fromisoformat(value.decode())
+
+
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" ", timespec='seconds'))
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+sqlite3.register_converter("DECIMAL", _to_decimal)
+sqlite3.register_converter("TIMESTAMP", _to_datetime)
+
+
+# Función que traduce el SQL de MySQL que usan los modelos al dialecto de SQLite.
+@lru_cache(maxsize=1024)
+def translate(sql):
+    return sql.replace("%s", "?").replace("INSERT IGNORE", "INSERT OR IGNORE")
+
+
+# Función que convierte cada fila en un diccionario (como los cursores de MySQL con 'dictionary=True').
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+# --- Definición de la Clase SQLiteBackend ---
+class SQLiteBackend:
+    name = 'sqlite'
+    Error = sqlite3.Error # Excepción que lanzan las consultas de este motor.
+
+    # - sqlite_config: ruta del archivo y espera ante bloqueos (ver Config.SQLITE_CONFIG).
+    # - pool_config: se usan 'pool_size' (conexiones abiertas a la vez) y 'statement_cache_size'.
+    # Una base en memoria existe solo dentro de su conexión, así que usa una única conexión.
+    def __init__(self, sqlite_config, pool_config):
+        self.path = sqlite_config['path']
+        self.busy_timeout = sqlite_config['busy_timeout']
+        self.statement_cache_size = pool_config['statement_cache_size']
+        self.pool_size = 1 if self.path == MEMORY_PATH else pool_config['pool_size']
+        self._idle = queue.LifoQueue() # Conexiones libres (la última devuelta es la primera en reutilizarse).
+        self._connections = []         # Todas las conexiones abiertas (para cerrarlas al final).
+        self._connected = False
+        self._lock = threading.Lock()
+
+    # Método para abrir la base de datos: crea el archivo y el esquema si no existen.
+    # Devuelve True si la base quedó disponible, False en caso contrario.
+    def connect(self):
+        with self._lock:
+            if self._connected:
+                return True
+            try:
+                if self.path != MEMORY_PATH:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                cnx = self._open()
+                if self.path != MEMORY_PATH:
+                    cnx.execute("PRAGMA journal_mode=WAL") # Queda guardado en el archivo.
+                with open(SCHEMA_PATH, encoding="utf-8") as f:
+                    cnx.executescript(f.read())
+                self._idle.put(cnx)
+                self._connected = True
+                print(f"Base de datos SQLite abierta: {self.path}")
+                return True
+            except (sqlite3.Error, OSError) as e:
+                print(f"Error de conexión: {e}")
+                return False
+
+    # Método privado que abre una conexión nueva al archivo.
+    # - isolation_level=None: cada sentencia se confirma sola ('autocommit'), como en MySQL;
+    #   las transacciones se abren explícitamente con 'begin'.
+    # - check_same_thread=False: la conexión la usa un solo hilo a la vez, pero no siempre el mismo.
+    def _open(self):
+        cnx = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                              detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                              cached_statements=self.statement_cache_size)
+        cnx.row_factory = _dict_row
+        cnx.execute("PRAGMA foreign_keys = ON")
+        cnx.execute("PRAGMA synchronous = NORMAL") # En modo WAL no se pierden datos si se corta el proceso.
+        self._connections.append(cnx)
+        return cnx
+
+    # Método que entrega una conexión libre, o abre una nueva (DatabaseConnector ya limita
+    # cuántas se usan a la vez con 'pool_size').
+    def checkout(self):
+        if not self._connected and not self.connect():
+            raise sqlite3.OperationalError(f"No se pudo abrir la base de datos {self.path}.")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._open()
+
+    # Método que devuelve una conexión para reutilizarla.
+    def release(self, cnx):
+        self._idle.put(cnx)
+
+    # Método que devuelve las sentencias de una conexión. SQLite guarda por su cuenta las
+    # sentencias preparadas de cada conexión ('cached_statements'), así que no hace falta otra caché.
+    def statements(self, cnx):
+        return SQLiteStatements(cnx)
+
+    # Métodos para las transacciones. 'BEGIN IMMEDIATE' toma el bloqueo de escritura al empezar,
+    # así dos transacciones no leen el mismo saldo para luego chocar al escribirlo.
+    def begin(self, cnx):
+        cnx.execute("BEGIN IMMEDIATE")
+
+    def commit(self, cnx):
+        cnx.execute("COMMIT")
+
+    def rollback(self, cnx):
+        if cnx.in_transaction:
+            cnx.execute("ROLLBACK")
+
+    # Un archivo local no se "desconecta": ningún error se reintenta como una conexión perdida.
+    @staticmethod
+    def is_disconnect(error):
+        return False
+
+    # Método para cerrar todas las conexiones.
+    def disconnect(self):
+        with self._lock:
+            for cnx in self._connections:
+                cnx.close()
+            self._connections = []
+            self._idle = queue.LifoQueue()
+            self._connected = False
+
+
+# --- Definición de la Clase SQLiteStatements ---
+# Ejecuta sentencias en una conexión de SQLite, con la misma interfaz que StatementCache
+# (la usan DatabaseConnector y StatementCursor).
+class SQLiteStatements:
+    def __init__(self, cnx):
+        self.cnx = cnx
+        self._active = None # Último cursor usado (puede tener filas sin leer).
+
+    # Método para ejecutar una sentencia. Devuelve el cursor, listo para leer sus filas.
+    def execute(self, sql, params=None):
+        self.finish()
+        self._active = self.cnx.execute(translate(sql), tuple(params or ()))
+        return self._active
+
+    # Método para ejecutar una sentencia con muchas filas de parámetros (ej. un INSERT masivo).
+    # Las filas se insertan una por una (sin red de por medio, no hay viajes que ahorrar) para
+    # conocer el ID de la primera: como en MySQL, 'lastrowid' queda con el ID de la primera fila.
+    def execute_many(self, sql, seq_params):
+        self.finish()
+        sql = translate(sql)
+        cursor = self.cnx.cursor()
+        result = BatchResult()
+        for params in seq_params:
+            cursor.execute(sql, tuple(params))
+            if result.lastrowid is None:
+                result.lastrowid = cursor.lastrowid
+            result.rowcount += cursor.rowcount
+        cursor.close()
+        return result
+
+    # Métodos para leer las filas de un cursor devuelto por 'execute' (ya son diccionarios).
+    def fetchall(self, cursor):
+        return cursor.fetchall()
+
+    def fetchone(self, cursor):
+        return cursor.fetchone()
+
+    def fetchmany(self, cursor, size):
+        return cursor.fetchmany(size)
+
+    # Método para descartar las filas que hayan quedado sin leer del último cursor
+    # (una lectura a medio terminar mantiene abierta su vista de la base de datos).
+    def finish(self):
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+
+
+# --- Definición de la Clase BatchResult ---
+# Resultado de 'execute_many': el ID de la primera fila insertada y la cantidad de filas.
+class BatchResult:
+    description = None # No devuelve filas.
+
+    def __init__(self):
+        self.lastrowid = None
+        self.rowcount = 0
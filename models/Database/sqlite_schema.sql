@@ -0,0 +1,95 @@
+-- Esquema de la base de datos para el motor SQLite (ver sqlite_backend.py).
+-- Es el mismo esquema que dejan las migraciones de MySQL (models/Database/migrations), ya
+-- completo: las tablas, los mismos índices y los juegos base. Los ENUM pasan a TEXT con CHECK.
+-- Las fechas por defecto usan la hora local, como los TIMESTAMP de MySQL.
+-- Se aplica al abrir la base (todas las sentencias son 'IF NOT EXISTS'), y registra las
+-- migraciones equivalentes en 'schema_version' para que el migrador no las aplique.
+-- Al agregar una migración, hay que agregar aquí su equivalente y registrar su versión.
+
+CREATE TABLE IF NOT EXISTS usuarios (
+    idcedula INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre VARCHAR(100) NOT NULL,
+    tipo_usuario TEXT CHECK (tipo_usuario IN ('superadministrador','administrador','usuario','invitado')),
+    saldo DECIMAL(15,2) DEFAULT 0.00,
+    correo VARCHAR(100) UNIQUE NOT NULL,
+    celular BIGINT,
+    edad INT NOT NULL CHECK (edad >= 18),
+    apodo VARCHAR(50),
+    fecha_registro TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    estado TEXT CHECK (estado IN ('activo','inactivo')),
+    contraseña VARCHAR(100) NOT NULL,
+    avatar_hash CHAR(64) NULL
+);
+
+CREATE TABLE IF NOT EXISTS juegos (
+    idjuego INTEGER PRIMARY KEY AUTOINCREMENT,
+    monto_minimo DECIMAL(10,2),
+    nombre TEXT CHECK (nombre IN ('tragamonedas','poker (solitario)','ruleta')),
+    estado TEXT DEFAULT 'disponible' CHECK (estado IN ('disponible', 'mantenimiento', 'deshabilitado')),
+    dificultad TEXT DEFAULT 'medio' CHECK (dificultad IN ('facil', 'medio', 'dificil')),
+    probabilidad_ganar DECIMAL(5,4) DEFAULT 0.45,
+    categoria_probabilidad TEXT GENERATED ALWAYS AS (
+        CASE
+            WHEN probabilidad_ganar < 0.2 THEN 'muy_baja'
+            WHEN probabilidad_ganar < 0.35 THEN 'baja'
+            WHEN probabilidad_ganar < 0.5 THEN 'media'
+            WHEN probabilidad_ganar < 0.65 THEN 'alta'
+            ELSE 'muy_alta'
+        END
+    ) STORED
+);
+
+-- Los juegos base solo se insertan si la tabla está vacía.
+INSERT INTO juegos (nombre, monto_minimo, dificultad, probabilidad_ganar, estado)
+SELECT * FROM (
+    SELECT 'poker (solitario)' AS nombre, 10.00 AS monto_minimo, 'dificil' AS dificultad, 0.55 AS probabilidad_ganar, 'disponible' AS estado
+    UNION ALL SELECT 'tragamonedas', 10.00, 'facil', 0.25, 'disponible'
+    UNION ALL SELECT 'ruleta', 12.00, 'medio', 0.48, 'disponible'
+) AS base
+WHERE NOT EXISTS (SELECT 1 FROM juegos);
+
+CREATE TABLE IF NOT EXISTS apuestas (
+    idapuesta INTEGER PRIMARY KEY AUTOINCREMENT,
+    idcedula INT NOT NULL REFERENCES usuarios(idcedula) ON DELETE CASCADE,
+    idjuego INT NOT NULL REFERENCES juegos(idjuego) ON DELETE CASCADE,
+    monto DECIMAL(20,2),
+    resultado DECIMAL(10,2),
+    ganancia DECIMAL(10,2),
+    fecha_apuesta TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    id_externo CHAR(32) NULL
+);
+CREATE INDEX IF NOT EXISTS idx_apuestas_usuario_fecha ON apuestas (idcedula, fecha_apuesta);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_apuestas_id_externo ON apuestas (id_externo);
+
+CREATE TABLE IF NOT EXISTS transacciones (
+    idtransaccion INTEGER PRIMARY KEY AUTOINCREMENT,
+    idcedula INT NOT NULL REFERENCES usuarios(idcedula) ON DELETE CASCADE,
+    tipo TEXT CHECK (tipo IN ('deposito', 'retiro', 'apuesta')),
+    metododepago TEXT CHECK (metododepago IN ('PSE', 'transferencia de ciertos bancos')),
+    fecha_transaccion TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    monto_transaccion DECIMAL(20,2),
+    estado TEXT CHECK (estado IN ('pendiente', 'completado', 'rechazado'))
+);
+CREATE INDEX IF NOT EXISTS idx_transacciones_usuario_fecha ON transacciones (idcedula, fecha_transaccion);
+
+CREATE TABLE IF NOT EXISTS avatares (
+    hash CHAR(64) NOT NULL,
+    tamano SMALLINT NOT NULL,
+    datos MEDIUMBLOB NOT NULL,
+    PRIMARY KEY (hash, tamano)
+);
+
+-- Migraciones de MySQL que este esquema ya incluye (ver migrator.py).
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT PRIMARY KEY,
+    nombre VARCHAR(255) NOT NULL,
+    aplicada_en TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+INSERT OR IGNORE INTO schema_version (version, nombre) VALUES
+    (1, 'esquema_inicial'),
+    (2, 'indice_apuestas_usuario_fecha'),
+    (3, 'indice_transacciones_usuario_fecha'),
+    (4, 'tabla_avatares'),
+    (5, 'mover_imagenes_a_avatares'),
+    (6, 'quitar_ruta_imagen'),
+    (7, 'id_externo_apuestas');
@@ -0,0 +1,163 @@
+# models/Database/statement_cache.py
+# Este archivo define la caché de sentencias preparadas y cursores de cada conexión.
+# Antes, cada consulta creaba un cursor nuevo (y mysql.connector hace un ping al servidor
+# cada vez que se crea uno) y el servidor volvía a analizar el texto SQL en cada llamada.
+# Ahora cada conexión del pool guarda sus sentencias preparadas por texto SQL: la primera
+# vez se preparan en el servidor y las siguientes solo se envían los parámetros.
+# Los cursores también se reutilizan mientras la conexión viva.
+#
+# Las sentencias preparadas pertenecen a la sesión del servidor: si la conexión se reconecta
+# (cambia su 'connection_id') la caché se descarta y se arma de nuevo. Por eso el pool se crea
+# con 'pool_reset_session=False' (reiniciar la sesión también borraría las sentencias).
+
+# --- Importación de Bibliotecas ---
+from collections import OrderedDict # Para descartar primero la sentencia usada hace más tiempo.
+
+from mysql.connector import Error # Para reconocer los errores de preparación.
+from mysql.connector.constants import FieldType # Tipos de columna del protocolo de MySQL.
+from mysql.connector.cursor import MySQLCursorPrepared # Para distinguir los cursores preparados.
+
+# Códigos de error del servidor relacionados con las sentencias preparadas.
+ER_UNKNOWN_STMT_HANDLER = 1243 # La sentencia ya no existe en el servidor (ej. la sesión se reinició).
+ER_UNSUPPORTED_PS = 1295       # Esta sentencia no se puede preparar (ej. algunos comandos de esquema).
+
+# Tipos de columna que el protocolo binario ya entrega convertidos a Python (números y fechas).
+# El resto (DECIMAL, textos, BLOB...) llega como bytes y se convierte igual que en una consulta normal.
+BINARY_CONVERTED_TYPES = {
+    FieldType.TINY, FieldType.SHORT, FieldType.INT24, FieldType.LONG, FieldType.LONGLONG,
+    FieldType.FLOAT, FieldType.DOUBLE, FieldType.DATE, FieldType.DATETIME, FieldType.TIMESTAMP, FieldType.TIME,
+}
+
+
+# --- Definición de la Clase StatementCache ---
+# Sentencias preparadas y cursores reutilizables de una conexión.
+# Una conexión la usa un solo hilo a la vez (el que la sacó del pool), así que no necesita bloqueos.
+class StatementCache:
+    ATTRIBUTE = '_statement_cache' # Atributo de la conexión donde se guarda su caché.
+
+    def __init__(self, cnx, size):
+        self.cnx = cnx
+        self.connection_id = cnx.connection_id
+        self.size = size                 # Máximo de sentencias preparadas en esta conexión.
+        self._prepared = OrderedDict()   # Texto SQL -> (texto SQL, cursor preparado).
+        self._unpreparable = set()       # Textos SQL que el servidor no admite como sentencia preparada.
+        self._plain = {}                 # Cursores normales reutilizables (con o sin diccionarios).
+        self._active = None              # Último cursor usado (puede tener filas sin leer).
+
+    # Método para obtener la caché de una conexión (o crearla si no existe o la conexión se reconectó).
+    # 'cnx' puede ser una conexión del pool (que envuelve la conexión real) o una conexión directa.
+    @classmethod
+    def for_connection(cls, cnx, size):
+        raw = getattr(cnx, '_cnx', cnx)
+        cache = getattr(raw, cls.ATTRIBUTE, None)
+        if cache is None or cache.connection_id != raw.connection_id:
+            cache = cls(raw, size)
+            setattr(raw, cls.ATTRIBUTE, cache)
+        return cache
+
+    # Método para ejecutar una sentencia con una sentencia preparada de la caché.
+    # Devuelve el cursor, listo para leer sus filas con 'fetchall', 'fetchone' o 'fetchmany'.
+    # Si la sentencia no se puede preparar, se ejecuta con un cursor normal (y se recuerda).
+    def execute(self, sql, params=None):
+        self.finish()
+        params = tuple(params or ())
+        if self.size <= 0 or sql in self._unpreparable:
+            return self._execute_plain(sql, params)
+
+        canonical, cursor = self._prepared_cursor(sql)
+        try:
+            # Pasamos siempre el mismo objeto de texto: el cursor compara por identidad
+            # para decidir si tiene que volver a preparar la sentencia.
+            cursor.execute(canonical, params)
+        except Error as e:
+            if e.errno == ER_UNSUPPORTED_PS:
+                self._drop(sql)
+                self._unpreparable.add(sql)
+                return self._execute_plain(sql, params)
+            if e.errno == ER_UNKNOWN_STMT_HANDLER: # El servidor la descartó: la preparamos de nuevo.
+                self._drop(sql)
+                canonical, cursor = self._prepared_cursor(sql)
+                cursor.execute(canonical, params)
+            else:
+                raise
+        self._active = cursor
+        return cursor
+
+    # Método para ejecutar una sentencia con muchas filas de parámetros (ej. un INSERT masivo).
+    # Usa un cursor normal: mysql.connector convierte un INSERT ... VALUES en un único INSERT
+    # con todas las filas (un solo viaje al servidor), mientras que una sentencia preparada
+    # se ejecutaría una vez por fila. 'lastrowid' queda con el ID de la primera fila insertada.
+    def execute_many(self, sql, seq_params):
+        self.finish()
+        cursor = self.plain_cursor()
+        cursor.executemany(sql, seq_params)
+        self._active = cursor
+        return cursor
+
+    # Método para obtener un cursor normal reutilizable de la conexión.
+    def plain_cursor(self, dictionary=True):
+        cursor = self._plain.get(dictionary)
+        if cursor is None:
+            cursor = self._plain[dictionary] = self.cnx.cursor(dictionary=dictionary)
+        return cursor
+
+    # Métodos para leer las filas de un cursor devuelto por 'execute', siempre como diccionarios.
+    def fetchall(self, cursor):
+        return self._to_dicts(cursor, cursor.fetchall())
+
+    def fetchone(self, cursor):
+        row = cursor.fetchone()
+        return self._to_dicts(cursor, [row])[0] if row else None
+
+    def fetchmany(self, cursor, size):
+        return self._to_dicts(cursor, cursor.fetchmany(size))
+
+    # Método para descartar las filas que hayan quedado sin leer del último cursor.
+    # La conexión no acepta otra sentencia (ni volver al pool) con un resultado a medio leer.
+    def finish(self):
+        if self._active is not None and self.cnx.unread_result:
+            self._active.fetchall()
+        self._active = None
+
+    # Método privado que devuelve (texto SQL, cursor preparado) para una sentencia, creando el
+    # cursor si hace falta. Si la caché está llena, cierra la sentencia usada hace más tiempo.
+    def _prepared_cursor(self, sql):
+        entry = self._prepared.get(sql)
+        if entry is not None:
+            self._prepared.move_to_end(sql)
+            return entry
+        if len(self._prepared) >= self.size:
+            _, (_, oldest) = self._prepared.popitem(last=False)
+            oldest.close() # Libera la sentencia en el servidor.
+        entry = self._prepared[sql] = (sql, self.cnx.cursor(prepared=True))
+        return entry
+
+    # Método privado que quita una sentencia de la caché.
+    def _drop(self, sql):
+        entry = self._prepared.pop(sql, None)
+        if entry is not None:
+            entry[1].close()
+
+    # Método privado que ejecuta una sentencia con el cursor normal reutilizable.
+    def _execute_plain(self, sql, params):
+        cursor = self.plain_cursor()
+        cursor.execute(sql, params)
+        self._active = cursor
+        return cursor
+
+    # Método privado que convierte las filas de un cursor preparado (tuplas, con textos y decimales
+    # como bytes) en diccionarios con los mismos tipos que devuelve una consulta normal.
+    def _to_dicts(self, cursor, rows):
+        if not isinstance(cursor, MySQLCursorPrepared):
+            return rows
+        description = cursor.description
+        names = cursor.column_names
+        to_python = self.cnx.converter.to_python
+        return [
+            {name: (to_python(column, value)
+                    if isinstance(value, (bytes, bytearray)) and column[1] not in BINARY_CONVERTED_TYPES
+                    else value)
+             for name, column, value in zip(names, description, row)}
+            for row in rows
+        ]
+
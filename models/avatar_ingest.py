@@ -0,0 +1,107 @@
+# models/avatar_ingest.py
+# Este archivo define la preparación de las imágenes de perfil que suben los usuarios.
+# Una foto de teléfono de 24 MP tarda segundos en decodificarse y redimensionarse; si
+# se hace en el hilo de Tk, la ventana de registro se congela. Por eso:
+# - La imagen se prepara en un proceso aparte (ProcessPoolExecutor), así ni siquiera
+#   compite con la ventana por el GIL de Python.
+# - Los JPEG se decodifican en modo "draft": la librería reduce la imagen 2, 4 u 8 veces
+#   mientras la decodifica, en lugar de decodificar los 24 MP y luego achicarlos.
+# - Se respeta la orientación EXIF (las fotos de teléfono suelen venir "acostadas").
+# - Se limitan el tamaño del archivo y la cantidad de píxeles, para que una imagen
+#   enorme o maliciosa ("bomba de descompresión") no agote la memoria.
+# - Pillow se importa con la primera imagen (ver '_pillow'), no al iniciar la aplicación.
+
+# --- Importación de Bibliotecas ---
+import io # Para trabajar con los datos binarios de la imagen en memoria.
+import multiprocessing # Para crear los procesos con 'spawn' (sin heredar hilos ni conexiones).
+
+from models.config.settings import Config # Importamos los límites de las imágenes desde settings.py.
+
+# Tamaño de la vista previa que muestra la ventana de registro.
+PREVIEW_SIZE = 100
+
+
+# Función que importa Pillow la primera vez que se necesita y le fija el límite de píxeles.
+# Devuelve los módulos Image (para decodificar) e ImageOps (para aplicar la orientación EXIF).
+def _pillow():
+    from PIL import Image, ImageOps # Importamos Pillow aquí para que solo se cargue al procesar una imagen.
+    # Pillow se niega a abrir imágenes con más del doble de este número de píxeles.
+    Image.MAX_IMAGE_PIXELS = Config.AVATAR_CONFIG['max_pixels']
+    return Image, ImageOps
+
+
+# Función para comprobar los límites de una imagen antes de decodificarla.
+# Solo lee la cabecera del archivo (Pillow no decodifica los píxeles hasta que se le piden).
+# Lanza ValueError con un mensaje para el usuario si la imagen no es aceptable.
+def check_avatar_limits(image_data):
+    if len(image_data) > Config.AVATAR_CONFIG['max_bytes']:
+        raise ValueError(f"La imagen supera el tamaño máximo de {Config.AVATAR_CONFIG['max_bytes'] // (1024 * 1024)} MB.")
+    Image, _ = _pillow()
+    try:
+        img = Image.open(io.BytesIO(image_data))
+    except Image.DecompressionBombError:
+        raise ValueError("La imagen tiene demasiados píxeles.")
+    except Exception:
+        raise ValueError("El archivo no es una imagen válida.")
+    if img.width * img.height > Config.AVATAR_CONFIG['max_pixels']:
+        raise ValueError("La imagen tiene demasiados píxeles.")
+    return img
+
+
+# Función para decodificar una imagen al tamaño mínimo necesario para obtener 'target_size' píxeles.
+# Devuelve la imagen ya orientada según su EXIF y en modo RGBA.
+def decode_avatar(image_data, target_size):
+    img = check_avatar_limits(image_data)
+    _, ImageOps = _pillow()
+    # En JPEG, 'draft' elige la mayor reducción (1/2, 1/4, 1/8) que sigue dejando al menos
+    # 'target_size' píxeles por lado. En otros formatos no hace nada.
+    img.draft('RGB', (target_size, target_size))
+    img = ImageOps.exif_transpose(img) # Gira la imagen según la orientación de la cámara.
+    return img.convert('RGBA')
+
+
+# Función para obtener una vista previa rápida de la imagen (una imagen de Pillow), o None.
+# Solo se hace con JPEG, que gracias al modo "draft" se decodifica en milisegundos aunque sea
+# enorme; para otros formatos la vista previa llega con el resultado del proceso de preparación.
+def make_preview(image_data, size=PREVIEW_SIZE):
+    img = check_avatar_limits(image_data)
+    if img.format != 'JPEG':
+        return None
+    img = decode_avatar(image_data, size)
+    Image, _ = _pillow()
+    img.thumbnail((size, size), Image.Resampling.LANCZOS)
+    return img
+
+
+# Función que prepara un avatar completo: huella y variantes PNG (ver avatar_store).
+# Es la tarea que se ejecuta en el proceso de preparación.
+def ingest_avatar(image_data):
+    # Importamos aquí para evitar una importación circular (avatar_store usa 'decode_avatar').
+    from models.avatar_store import render_avatar_variants
+    return render_avatar_variants(image_data)
+
+
+# --- Definición de la Clase AvatarIngest ---
+# Envía la preparación de avatares a un pool de procesos. El pool se crea la primera vez
+# que se usa, así iniciar la aplicación no cuesta nada si nadie se registra.
+class AvatarIngest:
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or Config.AVATAR_CONFIG['workers']
+        self._pool = None
+
+    # Método para preparar un avatar en segundo plano. Devuelve un 'Future' cuyo resultado
+    # es la tupla (hash, {tamaño: bytes PNG}).
+    def submit(self, image_data):
+        if self._pool is None:
+            # Importamos el pool aquí para que su módulo solo se cargue al preparar la primera imagen.
+            from concurrent.futures import ProcessPoolExecutor
+            # 'spawn' crea un intérprete limpio: el proceso no hereda la ventana de Tk ni los hilos de la BD.
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool.submit(ingest_avatar, image_data)
+
+    # Método para detener el pool de procesos al cerrar la aplicación.
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
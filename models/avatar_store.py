@@ -0,0 +1,77 @@
+# models/avatar_store.py
+# Este archivo define el almacén de imágenes de perfil (avatares).
+# Las imágenes viven en su propia tabla ('avatares'), fuera de la fila del usuario,
+# y se identifican por una huella (hash SHA-256) de su contenido: dos usuarios que
+# suben la misma imagen comparten una sola copia. Cada imagen se guarda ya
+# redimensionada a los tamaños que muestra la aplicación y en formato PNG, que
+# Tkinter puede mostrar directamente, sin decodificarla ni redimensionarla otra vez.
+
+# --- Importación de Bibliotecas ---
+import hashlib # Para calcular la huella del contenido de la imagen.
+import io # Para trabajar con los datos binarios de la imagen en memoria.
+
+from models.avatar_ingest import decode_avatar # Decodificación con límites, modo "draft" y orientación EXIF.
+
+# Tamaños (en píxeles, lado mayor) en los que se guarda cada avatar.
+AVATAR_SIZES = (100, 200)
+# Tamaño que muestra el Dashboard.
+DASHBOARD_AVATAR_SIZE = 100
+
+
+# Función para preparar las variantes de un avatar a partir de la imagen original.
+# La imagen se decodifica una sola vez, al tamaño mínimo necesario para la variante más grande
+# (ver avatar_ingest.decode_avatar), y con su orientación EXIF aplicada.
+# Devuelve una tupla (hash, {tamaño: bytes PNG}).
+def render_avatar_variants(image_data, sizes=AVATAR_SIZES):
+    from PIL import Image # Importamos Pillow aquí para que solo se cargue al procesar una imagen.
+
+    image_hash = hashlib.sha256(image_data).hexdigest()
+    img = decode_avatar(image_data, max(sizes))
+    variants = {}
+    for size in sorted(sizes, reverse=True):
+        # 'thumbnail' ajusta la imagen para que quepa en el tamaño manteniendo su proporción.
+        # Cada variante parte de la anterior (más grande), que ya está casi a su tamaño.
+        img = img.copy()
+        img.thumbnail((size, size), Image.Resampling.LANCZOS)
+        byte_arr = io.BytesIO()
+        img.save(byte_arr, format='PNG', optimize=True)
+        variants[size] = byte_arr.getvalue()
+    return image_hash, variants
+
+
+# --- Definición de la Clase AvatarStore ---
+# Guarda y lee las variantes de los avatares en la tabla 'avatares'.
+class AvatarStore:
+    # El constructor (__init__) inicializa el almacén con un conector a la base de datos.
+    def __init__(self, db_connector):
+        self.db = db_connector # Almacena la instancia del conector de la base de datos.
+
+    # Método para guardar una imagen de perfil. Devuelve su hash, o None si la imagen no es válida.
+    # Si la misma imagen ya estaba guardada, no se vuelve a escribir (INSERT IGNORE).
+    # La aplicación prepara las imágenes en segundo plano (ver AvatarIngest) y usa 'save_variants';
+    # este método hace todo el trabajo en el hilo que lo llama.
+    def save(self, image_data):
+        try:
+            image_hash, variants = render_avatar_variants(image_data)
+        except Exception as e:
+            # Si hay un error al procesar la imagen (ej. no es un formato válido), no la guardamos.
+            print(f"Error al procesar la imagen: {e}")
+            return None
+        if not self.save_variants(image_hash, variants):
+            return None
+        return image_hash
+
+    # Método para guardar variantes ya preparadas (ver 'render_avatar_variants').
+    # Si la misma imagen ya estaba guardada, no se vuelve a escribir (INSERT IGNORE).
+    def save_variants(self, image_hash, variants):
+        for size, data in variants.items():
+            query = "INSERT IGNORE INTO avatares (hash, tamano, datos) VALUES (%s, %s, %s)"
+            if not self.db.execute_update(query, (image_hash, size, data)):
+                return False
+        return True
+
+    # Método para obtener una variante de un avatar (bytes PNG), o None si no existe.
+    def get(self, image_hash, size=DASHBOARD_AVATAR_SIZE):
+        query = "SELECT datos FROM avatares WHERE hash = %s AND tamano = %s"
+        result = self.db.execute_query(query, (image_hash, size))
+        return result[0]['datos'] if result else None
@@ -0,0 +1,249 @@
+# models/bet_journal.py
+# Este archivo define el diario local de apuestas ("write-behind").
+# Antes, cada jugada esperaba su INSERT en MySQL: si el servidor estaba lento el juego se
+# trababa, y si no respondía la apuesta se perdía. Ahora cada jugada se anota primero en un
+# archivo local (una línea JSON, con fsync: sobrevive a un corte de luz) y un hilo en segundo
+# plano la guarda en la base de datos en tandas, junto con su cambio de saldo (ver
+# LedgerModel.place_journaled_bets). Cada jugada lleva un identificador propio ('id_externo'),
+# así reenviar una tanda nunca la guarda dos veces. Al iniciar, las jugadas que quedaron
+# sin confirmar en el archivo se vuelven a enviar.
+# Para acotar lo que está en juego sin guardar, el diario no acepta jugadas nuevas si ya hay
+# demasiadas pendientes (en cantidad o en monto apostado).
+#
+# Formato del archivo (una línea por registro):
+#     {"tipo": "apuesta", "id_externo": ..., "idcedula": ..., "idjuego": ..., "monto": "10.00", ...,
+#      "fecha_apuesta": "AAAA-MM-DD HH:MM:SS"}
+#     {"tipo": "confirmada", "ids": [...]}   (o "rechazada": se guardan aparte, en *.rejected.jsonl)
+
+# --- Importación de Bibliotecas ---
+import datetime # Para la fecha de cada jugada (la de cuando se jugó, no la de cuando se guarda).
+import json # Para escribir y leer cada registro del diario.
+import os # Para fsync, crear la carpeta del diario y reemplazar el archivo al compactarlo.
+import threading # Hilo que guarda las tandas y condición para despertarlo.
+import time # Para la espera entre reintentos.
+import uuid # Para el identificador propio de cada jugada.
+from decimal import Decimal # Los montos se guardan como texto y se leen como Decimal, sin perder precisión.
+
+from models.config.settings import Config # Importamos la configuración del diario desde settings.py.
+from models.ledger_model import InsufficientFundsError # Tandas rechazadas por falta de saldo.
+
+# Espera máxima (en segundos) entre reintentos cuando la base de datos no responde.
+RETRY_BACKOFF_MAX = 8
+# Formato de la fecha de cada jugada (el mismo que devuelve la base de datos).
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+# --- Definición de la Excepción JournalFullError ---
+# Se lanza cuando hay demasiadas jugadas sin guardar en la base de datos y no se aceptan más.
+class JournalFullError(Exception):
+    pass
+
+
+# --- Definición de la Clase BetJournal ---
+class BetJournal:
+    # - ledger_model: modelo que guarda las tandas en la base de datos.
+    # - on_flushed(user_id, nuevo_saldo, apuestas): se llama (desde el hilo del diario) al guardar una tanda.
+    # - on_rejected(user_id, entradas, error): se llama si la base de datos rechaza una tanda por falta de saldo.
+    def __init__(self, ledger_model, path=None, on_flushed=None, on_rejected=None):
+        config = Config.BET_JOURNAL_CONFIG
+        self.ledger_model = ledger_model
+        self.path = path or config['path']
+        self.rejected_path = os.path.splitext(self.path)[0] + ".rejected.jsonl"
+        self.batch_size = config['batch_size']
+        self.flush_interval = config['flush_interval']
+        self.max_pending_bets = config['max_pending_bets']
+        self.max_pending_amount = config['max_pending_amount']
+        self.on_flushed = on_flushed
+        self.on_rejected = on_rejected
+
+        self._cond = threading.Condition() # Protege la lista de pendientes y el archivo.
+        self._pending = []                 # Jugadas anotadas y aún no guardadas, en orden.
+        self._file = None
+        self._thread = None
+        self._closing = False
+
+    # Método para abrir el diario: recupera las jugadas sin confirmar de una ejecución anterior
+    # (que se enviarán primero) y arranca el hilo que guarda las tandas.
+    def start(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._pending = self._replay()
+        self._compact()
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="bet-journal", daemon=True)
+        self._thread.start()
+        if self._pending:
+            print(f"Diario de apuestas: {len(self._pending)} jugadas pendientes de una ejecución anterior.")
+
+    # Método para saber si el diario acepta 'count' jugadas más de 'amount' cada una.
+    def has_room(self, amount, count=1):
+        return self._fits(count, Decimal(amount) * count)
+
+    # Método para anotar jugadas ya resueltas. Cuando vuelve, las jugadas están escritas en disco.
+    # - bets: lista de tuplas (monto, resultado, ganancia), en el orden en que se jugaron.
+    # Cada jugada guarda la fecha en que se jugó: si se guarda más tarde (la base de datos no
+    # respondía, o se reenvía al iniciar), conserva su lugar en el historial.
+    # Devuelve la lista de entradas anotadas. Lanza JournalFullError si no hay lugar.
+    def append(self, user_id, game_id, bets):
+        played_at = datetime.datetime.now().strftime(DATE_FORMAT)
+        entries = [{
+            'tipo': 'apuesta',
+            'id_externo': uuid.uuid4().hex,
+            'idcedula': user_id,
+            'idjuego': game_id,
+            'monto': Decimal(amount),
+            'resultado': result,
+            'ganancia': Decimal(winnings),
+            'fecha_apuesta': played_at,
+        } for amount, result, winnings in bets]
+        with self._cond:
+            if self._file is None:
+                raise RuntimeError("El diario de apuestas no está abierto.")
+            if not self._fits(len(entries), sum((entry['monto'] for entry in entries), Decimal('0'))):
+                raise JournalFullError("Hay demasiadas jugadas sin guardar. Espera a que se restablezca la conexión.")
+            self._write([self._encode(entry) for entry in entries])
+            self._pending.extend(entries)
+            self._cond.notify()
+        return entries
+
+    # Método para obtener el cambio de saldo de las jugadas de un usuario que aún no se guardaron.
+    # El saldo que devuelve la base de datos no las incluye todavía.
+    def pending_delta(self, user_id):
+        with self._cond:
+            return sum((entry['ganancia'] - entry['monto'] for entry in self._pending
+                        if entry['idcedula'] == user_id), Decimal('0'))
+
+    # Método para cerrar el diario al salir de la aplicación: intenta guardar lo pendiente
+    # durante 'timeout' segundos. Lo que no se alcance a guardar queda en el archivo para la próxima vez.
+    # Si el hilo sigue guardando una tanda al vencer el plazo, el archivo queda abierto para que
+    # pueda anotar su confirmación (si no, la tanda se reenviaría al iniciar).
+    def close(self, timeout=5):
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return
+        with self._cond:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # Método privado que indica si caben 'count' jugadas más que suman 'amount' sin superar los límites.
+    def _fits(self, count, amount):
+        with self._cond:
+            pending_amount = sum((entry['monto'] for entry in self._pending), Decimal('0'))
+            return (len(self._pending) + count <= self.max_pending_bets
+                    and pending_amount + amount <= self.max_pending_amount)
+
+    # Método privado que ejecuta el hilo del diario: toma tandas de jugadas pendientes y las guarda.
+    def _run(self):
+        backoff = self.flush_interval
+        while True:
+            with self._cond:
+                if not self._pending and not self._closing:
+                    self._cond.wait(self.flush_interval)
+                if not self._pending:
+                    if self._closing:
+                        return
+                    continue
+                batch = list(self._pending[:self.batch_size])
+
+            if self._flush(batch):
+                backoff = self.flush_interval
+            else:
+                if self._closing:
+                    return
+                # La base de datos no responde: esperamos cada vez más antes de reintentar.
+                time.sleep(backoff)
+                backoff = min(backoff * 2, RETRY_BACKOFF_MAX)
+
+    # Método privado que guarda una tanda, agrupada por usuario (en el orden en que se jugaron).
+    # Devuelve False si la base de datos falló y hay que reintentar.
+    def _flush(self, batch):
+        by_user = {}
+        for entry in batch:
+            by_user.setdefault(entry['idcedula'], []).append(entry)
+        for user_id, entries in by_user.items():
+            try:
+                new_balance, saved = self.ledger_model.place_journaled_bets(user_id, entries)
+            except InsufficientFundsError as e:
+                # El saldo ya no cubre estas jugadas (ej. se gastó desde otra terminal): no se pueden
+                # guardar nunca. Las pasamos al archivo de rechazadas y avisamos.
+                self._confirm(entries, rejected=True)
+                if self.on_rejected:
+                    self.on_rejected(user_id, entries, e)
+                continue
+            except Exception as e:
+                print(f"Diario de apuestas: no se pudo guardar la tanda, se reintentará: {e}")
+                return False
+            self._confirm(entries)
+            if self.on_flushed:
+                self.on_flushed(user_id, new_balance, saved)
+        return True
+
+    # Método privado que anota en el diario que unas jugadas ya se guardaron (o se rechazaron)
+    # y las quita de las pendientes. Si no queda ninguna pendiente, compacta el archivo.
+    def _confirm(self, entries, rejected=False):
+        ids = {entry['id_externo'] for entry in entries}
+        with self._cond:
+            if rejected:
+                # Las jugadas rechazadas se conservan aparte (el diario se compacta y las perdería).
+                with open(self.rejected_path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(self._encode(entry)) + "\n" for entry in entries))
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._write([{'tipo': 'rechazada' if rejected else 'confirmada', 'ids': sorted(ids)}])
+            self._pending = [entry for entry in self._pending if entry['id_externo'] not in ids]
+            if not self._pending:
+                self._file.close()
+                self._compact()
+                self._file = open(self.path, "a", encoding="utf-8")
+
+    # Método privado que escribe registros en el archivo y espera a que estén en disco (fsync).
+    def _write(self, records):
+        self._file.write("".join(json.dumps(record) + "\n" for record in records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    # Método privado que lee el archivo y devuelve las jugadas que no tienen confirmación.
+    # Una última línea cortada (la aplicación se cerró mientras la escribía) se ignora.
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return []
+        pending = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('tipo') == 'apuesta':
+                    pending[record['id_externo']] = self._decode(record)
+                elif record.get('tipo') in ('confirmada', 'rechazada'):
+                    for entry_id in record['ids']:
+                        pending.pop(entry_id, None)
+        return list(pending.values())
+
+    # Método privado que reescribe el archivo solo con las jugadas pendientes.
+    # Se escribe un archivo nuevo y se reemplaza el anterior en un solo paso (os.replace),
+    # así un corte a mitad de camino nunca deja el diario a medias.
+    def _compact(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(self._encode(entry)) + "\n" for entry in self._pending))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    # Métodos privados para convertir una entrada a JSON (montos como texto) y de vuelta.
+    @staticmethod
+    def _encode(entry):
+        return dict(entry, monto=str(entry['monto']), ganancia=str(entry['ganancia']))
+
+    # Las jugadas anotadas antes de que el diario guardara la fecha toman la de cuando se leen.
+    @staticmethod
+    def _decode(record):
+        entry = dict(record, monto=Decimal(record['monto']), ganancia=Decimal(record['ganancia']))
+        entry.setdefault('fecha_apuesta', datetime.datetime.now().strftime(DATE_FORMAT))
+        return entry
@@ -41,6 +41,119 @@ class BetModel:
         # Ejecutamos la consulta con todos los parámetros.
         return self.db.execute_query(query, tuple(params))
 
+    # Consulta base del historial de apuestas, ya enriquecido con el nombre del juego.
+    # El JOIN con 'juegos' se resuelve en el servidor, así todo el historial llega en un solo viaje
+    # a la base de datos (antes se hacía una consulta extra por cada apuesta para buscar el juego).
+    HISTORY_QUERY = """
+        SELECT a.idapuesta, a.idjuego, COALESCE(j.nombre, 'Desconocido') AS nombre_juego,
+               a.monto, a.resultado, a.ganancia, a.fecha_apuesta
+        FROM apuestas a
+        LEFT JOIN juegos j ON j.idjuego = a.idjuego
+        WHERE a.idcedula = %s
+    """
+
+    # Metodo privado que arma el filtro común del historial (usuario y rango de fechas opcional).
+    def _history_filter(self, user_id, start_date, end_date):
+        query = self.HISTORY_QUERY
+        params = [user_id] # Lista para almacenar los parámetros de la consulta.
+
+        # Si se proporciona una fecha de inicio, añadimos la condición al WHERE.
+        if start_date:
+            query += " AND a.fecha_apuesta >= %s"
+            params.append(start_date)
+        # Si se proporciona una fecha de fin, añadimos la condición al WHERE.
+        if end_date:
+            query += " AND a.fecha_apuesta <= %s"
+            params.append(end_date)
+        return query, params
+
+    # Metodo para obtener el historial completo de apuestas de un usuario (usado por las exportaciones).
+    def get_bet_history_by_user(self, user_id, start_date=None, end_date=None):
+        query, params = self._history_filter(user_id, start_date, end_date)
+        # Ejecutamos la consulta con todos los parámetros.
+        return self.db.execute_query(query, tuple(params))
+
+    # Metodo para contar las apuestas del historial (se usa para mostrar el progreso de una exportación).
+    def count_bet_history_by_user(self, user_id, start_date=None, end_date=None):
+        query, params = self._history_filter(user_id, start_date, end_date)
+        result = self.db.execute_query(f"SELECT COUNT(*) AS total FROM ({query}) AS historial", tuple(params))
+        return result[0]['total'] if result else 0
+
+    # Metodo para obtener los subtotales del historial por juego (cantidad, total apostado y total ganado).
+    # La suma se hace en el servidor: el reporte no necesita recorrer las filas para calcularla.
+    def get_bet_totals_by_game(self, user_id, start_date=None, end_date=None):
+        query, params = self._history_filter(user_id, start_date, end_date)
+        query = f"""
+            SELECT nombre_juego, COUNT(*) AS apuestas, SUM(monto) AS total_apostado, SUM(ganancia) AS total_ganado
+            FROM ({query}) AS historial
+            GROUP BY idjuego, nombre_juego
+            ORDER BY nombre_juego
+        """
+        return self.db.execute_query(query, tuple(params))
+
+    # Metodo para obtener los totales del historial (cantidad, total apostado y total ganado).
+    def get_bet_totals(self, user_id, start_date=None, end_date=None):
+        query, params = self._history_filter(user_id, start_date, end_date)
+        query = f"""
+            SELECT COUNT(*) AS apuestas, COALESCE(SUM(monto), 0) AS total_apostado, COALESCE(SUM(ganancia), 0) AS total_ganado
+            FROM ({query}) AS historial
+        """
+        result = self.db.execute_query(query, tuple(params))
+        return result[0] if result else None
+
+    # Metodo para recorrer el historial de apuestas en bloques, sin cargarlo entero en memoria.
+    # Devuelve un generador de filas (ver DatabaseConnector.fetch_iter).
+    def iter_bet_history_by_user(self, user_id, start_date=None, end_date=None, chunk_size=1000):
+        query, params = self._history_filter(user_id, start_date, end_date)
+        query += " ORDER BY a.fecha_apuesta DESC, a.idapuesta DESC"
+        return self.db.fetch_iter(query, tuple(params), chunk_size)
+
+    # Metodo para obtener una página del historial de apuestas, de la más reciente a la más antigua.
+    # Usa paginación por clave ("keyset"/"seek") sobre (fecha_apuesta, idapuesta): en lugar de
+    # OFFSET, que obliga al servidor a recorrer y descartar todas las filas anteriores, se pide
+    # "las N filas siguientes a esta clave", que cuesta lo mismo en la página 1 que en la 1000.
+    # - cursor: tupla (fecha_apuesta, idapuesta) de la última fila conocida, o None para empezar.
+    # - before: si es True, devuelve las filas más recientes que el cursor (página anterior).
+    # Las filas siempre se devuelven ordenadas de la más reciente a la más antigua.
+    def get_bet_history_page(self, user_id, start_date=None, end_date=None, cursor=None, limit=100, before=False):
+        query, params = self._history_filter(user_id, start_date, end_date)
+        if cursor is not None:
+            fecha, bet_id = cursor
+            operator = ">" if before else "<"
+            query += f" AND (a.fecha_apuesta {operator} %s OR (a.fecha_apuesta = %s AND a.idapuesta {operator} %s))"
+            params.extend([fecha, fecha, bet_id])
+        order = "ASC" if before else "DESC"
+        query += f" ORDER BY a.fecha_apuesta {order}, a.idapuesta {order} LIMIT %s"
+        params.append(limit)
+
+        rows = self.db.execute_query(query, tuple(params))
+        if rows is None:
+            return None
+        return rows[::-1] if before else rows # La página anterior se leyó al revés: la devolvemos en orden.
+
+    # Metodo para obtener las apuestas registradas después de una dada ("filas desde el id X"),
+    # de la más reciente a la más antigua. Los IDs son autoincrementales, así que son exactamente
+    # las apuestas nuevas; la condición usa la clave primaria y no recorre el resto del historial.
+    # - since_id: mayor idapuesta ya conocido, o None para traer las más recientes.
+    def get_bet_history_since(self, user_id, start_date=None, end_date=None, since_id=None, limit=100):
+        query, params = self._history_filter(user_id, start_date, end_date)
+        if since_id is not None:
+            query += " AND a.idapuesta > %s"
+            params.append(since_id)
+        query += " ORDER BY a.fecha_apuesta DESC, a.idapuesta DESC LIMIT %s"
+        params.append(limit)
+        return self.db.execute_query(query, tuple(params))
+
+    # Metodo para obtener el estado actual de algunas apuestas del historial (ej. las que muestra una tabla).
+    # Las que ya no existen, o ya no cumplen el filtro de fechas, no vienen en el resultado.
+    def get_bet_history_by_ids(self, user_id, bet_ids, start_date=None, end_date=None):
+        if not bet_ids:
+            return []
+        query, params = self._history_filter(user_id, start_date, end_date)
+        query += f" AND a.idapuesta IN ({', '.join(['%s'] * len(bet_ids))})"
+        params.extend(bet_ids)
+        return self.db.execute_query(query, tuple(params))
+
     # Metodo para crear una nueva apuesta en la base de datos.
     def create_bet(self, user_id, game_id, amount, result, winnings):
         query = """
@@ -1,4 +1,5 @@
 import os
+from decimal import Decimal
 from dotenv import load_dotenv
 
 # Cargar las variables de entorno desde el archivo .env
@@ -15,4 +16,79 @@ class Config:
         'user': os.getenv('DB_USER', 'root'),
         'password': os.getenv('DB_PASSWORD', ''),
         'database': os.getenv('DB_NAME', 'casino_vicario')
-    }
\ No newline at end of file
+    }
+
+    # Motor de base de datos: 'mysql' (un servidor MySQL, ver DB_CONFIG) o 'sqlite' (un archivo
+    # local, sin servidor: para un kiosco con una sola terminal o para pruebas, ver SQLITE_CONFIG).
+    DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+
+    # Parámetros del motor SQLite (ver models/Database/sqlite_backend.py).
+    # 'path': archivo de la base de datos (':memory:' para una base en memoria, que se pierde al cerrar).
+    # 'busy_timeout': segundos que una escritura espera a que otra termine antes de fallar.
+    SQLITE_CONFIG = {
+        'path': os.path.expanduser(os.getenv('SQLITE_PATH', '~/.casino_vicario/casino.db')),
+        'busy_timeout': float(os.getenv('SQLITE_BUSY_TIMEOUT', '5'))
+    }
+
+    # Si es True, al iniciar la aplicación se aplican las migraciones pendientes del esquema
+    # (ver models/Database/migrator.py). Con DB_AUTO_MIGRATE=0 se aplican a mano desde la consola.
+    DB_AUTO_MIGRATE = os.getenv('DB_AUTO_MIGRATE', '1') == '1'
+
+    # Parámetros del pool de conexiones a MySQL.
+    # El pool valida cada conexión al entregarla (ping) y la reconecta si el servidor
+    # la cerró (por ejemplo, tras 'wait_timeout'). Si la reconexión falla, se reintenta
+    # con espera exponencial: reconnect_backoff, 2x, 4x... hasta reconnect_backoff_max segundos.
+    # 'statement_cache_size': sentencias preparadas que guarda cada conexión (0 para no preparar).
+    DB_POOL_CONFIG = {
+        'pool_name': os.getenv('DB_POOL_NAME', 'casino_vicario_pool'),
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+        'reconnect_attempts': int(os.getenv('DB_RECONNECT_ATTEMPTS', '5')),
+        'reconnect_backoff': float(os.getenv('DB_RECONNECT_BACKOFF', '0.5')),
+        'reconnect_backoff_max': float(os.getenv('DB_RECONNECT_BACKOFF_MAX', '8')),
+        'statement_cache_size': int(os.getenv('DB_STATEMENT_CACHE_SIZE', '32'))
+    }
+
+    # Parámetros de las estadísticas de consultas (ver models/Database/query_stats.py).
+    # Las consultas que tardan 'slow_threshold_ms' o más se anotan en el registro de consultas
+    # lentas (se guardan las últimas 'slow_log_size'; también en 'slow_log_path', si se indica).
+    # 'show_menu': mostrar el menú "Diagnóstico" al iniciar (si no, se muestra con Ctrl+Shift+D).
+    QUERY_STATS_CONFIG = {
+        'enabled': os.getenv('QUERY_STATS', '1') == '1',
+        'slow_threshold_ms': float(os.getenv('SLOW_QUERY_MS', '200')),
+        'slow_log_size': int(os.getenv('SLOW_QUERY_LOG_SIZE', '200')),
+        'slow_log_path': os.getenv('SLOW_QUERY_LOG_PATH') or None,
+        'show_menu': os.getenv('DIAGNOSTICS_MENU', '0') == '1'
+    }
+
+    # Parámetros del catálogo de juegos en memoria (ver models/game_catalog.py).
+    # 'ttl': cada cuántos segundos se recarga el catálogo completo.
+    # 'status_refresh': cada cuántos segundos se revisa solo el 'estado' de los juegos,
+    # para bloquear pronto un juego que pasa a mantenimiento.
+    GAME_CATALOG_CONFIG = {
+        'ttl': float(os.getenv('GAME_CATALOG_TTL', '600')),
+        'status_refresh': float(os.getenv('GAME_CATALOG_STATUS_REFRESH', '5'))
+    }
+
+    # Límites para las imágenes de perfil que suben los usuarios (ver models/avatar_ingest.py).
+    # 'max_bytes': tamaño máximo del archivo. 'max_pixels': ancho x alto máximo de la imagen;
+    # protege contra "bombas de descompresión" (archivos pequeños que al abrirse ocupan gigas).
+    # 'workers': procesos dedicados a preparar las imágenes.
+    AVATAR_CONFIG = {
+        'max_bytes': int(os.getenv('AVATAR_MAX_BYTES', str(15 * 1024 * 1024))),
+        'max_pixels': int(os.getenv('AVATAR_MAX_PIXELS', '50000000')),
+        'workers': int(os.getenv('AVATAR_WORKERS', '1'))
+    }
+
+    # Parámetros del diario de apuestas (ver models/bet_journal.py).
+    # Cada jugada se anota primero en 'path' (en disco, con fsync) y un hilo la guarda en la
+    # base de datos en tandas de hasta 'batch_size' jugadas, cada 'flush_interval' segundos.
+    # Si la base de datos no responde, las jugadas se acumulan en el diario hasta
+    # 'max_pending_bets' jugadas o 'max_pending_amount' en apuestas sin guardar; a partir
+    # de ahí no se aceptan jugadas nuevas hasta que se guarden las pendientes.
+    BET_JOURNAL_CONFIG = {
+        'path': os.path.expanduser(os.getenv('BET_JOURNAL_PATH', '~/.casino_vicario/bet_journal.jsonl')),
+        'batch_size': int(os.getenv('BET_JOURNAL_BATCH_SIZE', '200')),
+        'flush_interval': float(os.getenv('BET_JOURNAL_FLUSH_INTERVAL', '0.2')),
+        'max_pending_bets': int(os.getenv('BET_JOURNAL_MAX_PENDING_BETS', '1000')),
+        'max_pending_amount': Decimal(os.getenv('BET_JOURNAL_MAX_PENDING_AMOUNT', '10000'))
+    }
@@ -0,0 +1,99 @@
+# models/game_catalog.py
+# Este archivo define el catálogo de juegos en memoria.
+# La tabla 'juegos' tiene muy pocas filas y casi nunca cambia, así que en lugar de
+# consultarla en cada jugada o en cada reporte, se carga una vez al iniciar y se
+# sirve desde memoria. El catálogo se recarga por completo cada cierto tiempo (TTL)
+# o cuando se le pide, y revisa el 'estado' de los juegos con más frecuencia para
+# que un juego en mantenimiento deje de poder jugarse en pocos segundos.
+
+# --- Importación de Bibliotecas ---
+import time # Para medir la antigüedad de los datos en caché.
+
+from models.config.settings import Config # Importamos los tiempos de refresco desde settings.py.
+
+# Estado en el que un juego puede jugarse.
+ESTADO_DISPONIBLE = 'disponible'
+
+
+# --- Definición de la Clase GameCatalog ---
+# Envuelve al GameModel y guarda en memoria los juegos indexados por ID y por nombre.
+# Los diccionarios se reemplazan enteros al refrescar (nunca se modifican en el sitio),
+# así los hilos que leen nunca ven un catálogo a medio actualizar.
+class GameCatalog:
+    def __init__(self, game_model, ttl=None, status_refresh=None):
+        self.game_model = game_model # El Modelo de Juego, usado solo para recargar el catálogo.
+        self.ttl = ttl if ttl is not None else Config.GAME_CATALOG_CONFIG['ttl']
+        self.status_refresh = status_refresh if status_refresh is not None else Config.GAME_CATALOG_CONFIG['status_refresh']
+        self._by_id = {}          # idjuego -> datos del juego.
+        self._by_name = {}        # nombre -> datos del juego.
+        self._loaded_at = None    # Momento de la última carga completa.
+        self._refresh_job = None  # Identificador del refresco periódico programado con 'after'.
+
+    # Método para cargar (o recargar) el catálogo completo desde la base de datos.
+    # Si la consulta falla, se conserva el catálogo anterior. Devuelve True si se cargó.
+    def load(self):
+        games = self.game_model.get_all_games()
+        if games is None:
+            print("Error: No se pudo cargar el catálogo de juegos.")
+            return False
+        self._by_id = {game['idjuego']: game for game in games}
+        self._by_name = {game['nombre']: game for game in games}
+        self._loaded_at = time.monotonic()
+        return True
+
+    # Método para cargar el catálogo solo si todavía no se ha cargado nunca.
+    def ensure_loaded(self):
+        if self._loaded_at is None:
+            return self.load()
+        return True
+
+    # Método para forzar una recarga del catálogo (ej. después de editar un juego).
+    def refresh(self):
+        return self.load()
+
+    # Método para actualizar solo el estado de los juegos, sin recargar el resto de columnas.
+    def refresh_statuses(self):
+        statuses = self.game_model.get_game_statuses()
+        if statuses is None:
+            return False
+        by_id = {}
+        for row in statuses:
+            game = self._by_id.get(row['idjuego'])
+            if game is None: # Apareció un juego nuevo: hace falta una carga completa.
+                return self.load()
+            by_id[row['idjuego']] = dict(game, estado=row['estado'])
+        self._by_id = by_id
+        self._by_name = {game['nombre']: game for game in by_id.values()}
+        return True
+
+    # Método que decide qué refresco toca: completo si venció el TTL, o solo de estados.
+    # Se ejecuta en un hilo de trabajo, nunca en el hilo de Tk.
+    def refresh_if_stale(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl:
+            return self.load()
+        return self.refresh_statuses()
+
+    # Método para programar el refresco periódico en segundo plano.
+    # Usa 'root.after' para el temporizador y el ejecutor de BD para la consulta.
+    def start_background_refresh(self, root, db_executor):
+        def tick():
+            db_executor.submit(self.refresh_if_stale, key="game_catalog")
+            self._refresh_job = root.after(int(self.status_refresh * 1000), tick)
+        self._refresh_job = root.after(int(self.status_refresh * 1000), tick)
+
+    # Método para obtener un juego por su ID (desde memoria).
+    def get_by_id(self, game_id):
+        return self._by_id.get(game_id)
+
+    # Método para obtener un juego por su nombre (ej. 'tragamonedas').
+    def get_by_name(self, name):
+        return self._by_name.get(name)
+
+    # Método para obtener todos los juegos del catálogo.
+    def all_games(self):
+        return list(self._by_id.values())
+
+    # Método para saber si un juego puede jugarse en este momento.
+    def is_available(self, game_id):
+        game = self._by_id.get(game_id)
+        return game is not None and game['estado'] == ESTADO_DISPONIBLE
@@ -23,6 +23,12 @@ class GameModel:
         result = self.db.execute_query(query, (game_id,)) # El '%s' es un placeholder para el parámetro.
         return result[0] if result else None # Devuelve el primer juego encontrado o None si no hay.
 
+    # Método para obtener solo el estado de cada juego (disponible, mantenimiento, deshabilitado).
+    # Es una consulta muy ligera que el catálogo de juegos usa para detectar cambios de estado.
+    def get_game_statuses(self):
+        query = "SELECT idjuego, estado FROM juegos"
+        return self.db.execute_query(query)
+
     # TODO: Implement create_game, update_game, delete_game
     # Estos métodos se implementarían para añadir nuevos juegos, actualizar información
     # de juegos existentes o eliminar juegos de la base de datos.
\ No newline at end of file
@@ -0,0 +1,186 @@
+# models/ledger_model.py
+# Este archivo define el Modelo de movimientos de dinero (el "libro mayor").
+# Toda operación que cambia el saldo de un usuario pasa por aquí: el cambio de saldo
+# y su registro (una apuesta o una transacción) se guardan juntos en una sola
+# transacción de la base de datos, o no se guarda ninguno.
+# El saldo se modifica con una actualización relativa ('saldo = saldo + cambio') en
+# lugar de escribir un saldo calculado en Python: así dos terminales abiertas con la
+# misma cuenta no se pisan entre sí, y la condición 'saldo >= requerido' impide que
+# el saldo quede negativo aunque los datos en memoria estén desactualizados.
+
+
+# --- Definición de la Excepción InsufficientFundsError ---
+# Se lanza cuando la base de datos rechaza un movimiento por falta de saldo.
+# 'saldo' es el saldo real del usuario en ese momento (o None si el usuario no existe).
+class InsufficientFundsError(Exception):
+    def __init__(self, saldo):
+        super().__init__("Saldo insuficiente")
+        self.saldo = saldo
+
+
+# --- Definición de la Clase LedgerModel ---
+# Esta clase sigue el principio de Responsabilidad Única (SRP)
+# al encargarse exclusivamente de los movimientos de saldo.
+class LedgerModel:
+    # El constructor (__init__) inicializa el modelo con un conector a la base de datos.
+    # Esto es un ejemplo de Inyección de Dependencias.
+    def __init__(self, db_connector):
+        self.db = db_connector # Almacena la instancia del conector de la base de datos.
+
+    # Método para registrar una apuesta ya resuelta: descuenta el monto, suma la ganancia
+    # y guarda la apuesta. Requiere que el saldo alcance para el monto apostado.
+    # Devuelve una tupla (nuevo saldo según la base de datos, apuesta registrada).
+    def place_bet(self, user_id, game_id, amount, result, winnings):
+        with self.db.transaction() as cursor:
+            self._move(cursor, user_id, winnings - amount, required=amount)
+            cursor.execute(
+                """
+                INSERT INTO apuestas (idcedula, idjuego, monto, resultado, ganancia)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                (user_id, game_id, amount, result, winnings)
+            )
+            # Una sola lectura trae la apuesta (con la fecha que le asignó el servidor) y el saldo final.
+            cursor.execute(
+                """
+                SELECT a.idapuesta, a.idjuego, a.monto, a.resultado, a.ganancia, a.fecha_apuesta, u.saldo
+                FROM apuestas a JOIN usuarios u ON u.idcedula = a.idcedula
+                WHERE a.idapuesta = %s
+                """,
+                (cursor.lastrowid,)
+            )
+            bet = cursor.fetchone()
+        return bet.pop('saldo'), bet
+
+    # Método para registrar varias apuestas ya resueltas (ej. una tanda de jugadas automáticas)
+    # en una sola transacción: un solo cambio de saldo y un solo INSERT con todas las filas.
+    # - bets: lista de tuplas (monto, resultado, ganancia), en el orden en que se jugaron.
+    # El saldo debe cubrir la peor racha de la tanda (la mayor caída acumulada, contando cada
+    # apuesta antes de su ganancia), así ninguna jugada habría quedado sin saldo si se hubieran
+    # guardado una por una.
+    # Devuelve una tupla (nuevo saldo según la base de datos, lista de apuestas registradas en orden).
+    def place_bets(self, user_id, game_id, bets):
+        if not bets:
+            raise ValueError("No hay apuestas para registrar.")
+        delta, drawdown = self._balance_change(bets)
+
+        with self.db.transaction() as cursor:
+            self._move(cursor, user_id, delta, required=drawdown)
+            cursor.executemany(
+                """
+                INSERT INTO apuestas (idcedula, idjuego, monto, resultado, ganancia)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                [(user_id, game_id, amount, result, winnings) for amount, result, winnings in bets]
+            )
+            # 'lastrowid' es el ID de la primera fila del INSERT. Mientras dure la transacción la fila
+            # del usuario está bloqueada, así que sus apuestas desde ese ID son exactamente las de la tanda.
+            cursor.execute(
+                """
+                SELECT a.idapuesta, a.idjuego, a.monto, a.resultado, a.ganancia, a.fecha_apuesta, u.saldo
+                FROM apuestas a JOIN usuarios u ON u.idcedula = a.idcedula
+                WHERE a.idcedula = %s AND a.idapuesta >= %s
+                ORDER BY a.idapuesta
+                LIMIT %s
+                """,
+                (user_id, cursor.lastrowid, len(bets))
+            )
+            saved = cursor.fetchall()
+        new_balance = saved[0]['saldo']
+        for bet in saved:
+            del bet['saldo']
+        return new_balance, saved
+
+    # Método para registrar apuestas anotadas en el diario local (ver BetJournal), de forma idempotente:
+    # cada apuesta lleva su 'id_externo' y las que ya estaban guardadas (ej. la tanda se envió, pero
+    # la aplicación se cerró antes de anotar la confirmación) no se vuelven a guardar ni a cobrar.
+    # - entries: lista de diccionarios con id_externo, idjuego, monto, resultado, ganancia y
+    #   fecha_apuesta (cuándo se jugó), en orden.
+    # Devuelve una tupla (nuevo saldo según la base de datos, lista de apuestas de la tanda ya guardadas).
+    def place_journaled_bets(self, user_id, entries):
+        if not entries:
+            raise ValueError("No hay apuestas para registrar.")
+        ids = [entry['id_externo'] for entry in entries]
+        placeholders = ', '.join(['%s'] * len(ids))
+
+        with self.db.transaction() as cursor:
+            cursor.execute(f"SELECT id_externo FROM apuestas WHERE id_externo IN ({placeholders})", tuple(ids))
+            saved_ids = {row['id_externo'] for row in cursor.fetchall()}
+            new_entries = [entry for entry in entries if entry['id_externo'] not in saved_ids]
+            if new_entries:
+                delta, drawdown = self._balance_change(
+                    [(entry['monto'], entry['resultado'], entry['ganancia']) for entry in new_entries])
+                self._move(cursor, user_id, delta, required=drawdown)
+                # Si otra escritura guardó la misma apuesta entre tanto, la clave única hace fallar
+                # la transacción completa (y el saldo vuelve atrás); al reintentar, ya se la omite.
+                cursor.executemany(
+                    """
+                    INSERT INTO apuestas (idcedula, idjuego, monto, resultado, ganancia, id_externo, fecha_apuesta)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    [(user_id, entry['idjuego'], entry['monto'], entry['resultado'], entry['ganancia'],
+                      entry['id_externo'], entry['fecha_apuesta']) for entry in new_entries]
+                )
+            cursor.execute(
+                f"""
+                SELECT a.idapuesta, a.idjuego, a.monto, a.resultado, a.ganancia, a.fecha_apuesta, a.id_externo
+                FROM apuestas a
+                WHERE a.id_externo IN ({placeholders})
+                ORDER BY a.idapuesta
+                """,
+                tuple(ids)
+            )
+            saved = cursor.fetchall()
+            cursor.execute("SELECT saldo FROM usuarios WHERE idcedula = %s", (user_id,))
+            new_balance = cursor.fetchone()['saldo']
+        return new_balance, saved
+
+    # Método para registrar un depósito: suma el monto al saldo y guarda la transacción.
+    # Devuelve una tupla (nuevo saldo según la base de datos, transacción registrada).
+    def deposit(self, user_id, amount, payment_method, status='completado'):
+        with self.db.transaction() as cursor:
+            self._move(cursor, user_id, amount)
+            cursor.execute(
+                """
+                INSERT INTO transacciones (idcedula, tipo, metododepago, monto_transaccion, estado)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                (user_id, 'deposito', payment_method, amount, status)
+            )
+            # Una sola lectura trae la transacción (con la fecha que le asignó el servidor) y el saldo final.
+            cursor.execute(
+                """
+                SELECT t.idtransaccion, t.tipo, t.metododepago, t.fecha_transaccion, t.monto_transaccion, t.estado, u.saldo
+                FROM transacciones t JOIN usuarios u ON u.idcedula = t.idcedula
+                WHERE t.idtransaccion = %s
+                """,
+                (cursor.lastrowid,)
+            )
+            transaction = cursor.fetchone()
+        return transaction.pop('saldo'), transaction
+
+    # Método privado que calcula el cambio de saldo de una tanda de apuestas (monto, resultado, ganancia)
+    # y el saldo mínimo que necesita: la mayor caída acumulada, contando cada apuesta antes de su ganancia.
+    # Devuelve una tupla (cambio total, saldo requerido).
+    @staticmethod
+    def _balance_change(bets):
+        delta, drawdown = 0, 0
+        for amount, result, winnings in bets:
+            delta -= amount
+            drawdown = max(drawdown, -delta) # Peor momento: justo después de descontar la apuesta.
+            delta += winnings
+        return delta, drawdown
+
+    # Método privado que aplica un cambio de saldo dentro de la transacción en curso.
+    # La actualización bloquea la fila del usuario hasta el commit, así que el saldo que
+    # se lee después en la misma transacción es exactamente el que resulta de este movimiento.
+    # - required: saldo mínimo que debe tener el usuario antes del movimiento.
+    def _move(self, cursor, user_id, delta, required=0):
+        cursor.execute(
+            "UPDATE usuarios SET saldo = saldo + %s WHERE idcedula = %s AND saldo >= %s AND saldo + %s >= 0",
+            (delta, user_id, required, delta)
+        )
+        if cursor.rowcount != 1: # La condición no se cumplió: no hay saldo suficiente (o el usuario no existe).
+            cursor.execute("SELECT saldo FROM usuarios WHERE idcedula = %s", (user_id,))
+            row = cursor.fetchone()
+            raise InsufficientFundsError(row['saldo'] if row else None)
@@ -0,0 +1,240 @@
+# models/slot_engine.py
+# Este archivo define las reglas de la máquina tragamonedas: los símbolos, las tiras de
+# los rodillos y la tabla de pagos. No depende de Tkinter ni de la base de datos, así lo
+# usan por igual el juego, el simulador de RTP (ver slot_simulator) y cualquier otro
+# proceso que necesite evaluar jugadas.
+# Cada rodillo es una "tira" de paradas (como en una máquina real): la cantidad de paradas
+# de cada símbolo es su peso, así la probabilidad de cada símbolo es configurable por juego.
+# La tira incluye un símbolo vacío que nunca forma premio; con él (o concentrando los pesos
+# en pocos símbolos) se ajusta la frecuencia de premios a la 'probabilidad_ganar' del juego.
+# El resultado de cada combinación posible se calcula una sola vez (tabla de resultados),
+# así girar y evaluar una jugada cuesta lo mismo sin importar la configuración.
+
+# --- Importación de Bibliotecas ---
+import random # Para elegir la parada de cada rodillo.
+from fractions import Fraction # Para calcular los valores teóricos de forma exacta.
+from itertools import product # Para recorrer todas las combinaciones posibles de los rodillos.
+
+# Símbolos que pagan (en el orden de sus índices).
+SYMBOLS = ["🍒", "🍋", "🍊", "🍇", "🔔", "💎", "7️⃣"]
+# Símbolo vacío: ocupa paradas en la tira pero nunca forma premio. Su índice es len(SYMBOLS).
+BLANK_SYMBOL = "➖"
+BLANK = len(SYMBOLS)
+# Todos los símbolos que pueden aparecer en un rodillo.
+ALL_SYMBOLS = SYMBOLS + [BLANK_SYMBOL]
+# Cantidad de rodillos.
+REELS = 3
+# Cantidad de paradas de cada tira generada a partir de pesos.
+STRIP_STOPS = 1000
+# Diferencia máxima aceptada entre la frecuencia de premios de un juego y su 'probabilidad_ganar'.
+HIT_FREQUENCY_TOLERANCE = 0.005
+
+# --- Tabla de Pagos ---
+# Multiplicador de la apuesta que se paga en cada caso. La ganancia incluye la apuesta:
+# con una apuesta de $10, un JACKPOT paga $30 (el saldo sube $20).
+JACKPOT_MULTIPLIER = 3 # Tres símbolos iguales.
+PAIR_MULTIPLIER = 2    # Dos símbolos iguales y contiguos (rodillos 1-2 o 2-3).
+
+# Pesos configurados a mano por juego (nombre del juego -> pesos de cada rodillo, uno por
+# símbolo de ALL_SYMBOLS). Los juegos que no aparecen aquí derivan sus pesos de su
+# 'probabilidad_ganar' (ver 'SlotEngine.for_game').
+REEL_WEIGHTS = {}
+
+
+# Función que evalúa una combinación de símbolos (índices en ALL_SYMBOLS) según la tabla de pagos.
+# Devuelve el multiplicador que paga (0 si es una pérdida).
+def payout_multiplier(reels):
+    first, second, third = reels
+    if first == second == third != BLANK:
+        return JACKPOT_MULTIPLIER
+    if (first == second != BLANK) or (second == third != BLANK):
+        return PAIR_MULTIPLIER
+    return 0
+
+
+# Función privada que calcula la frecuencia de premios para unos pesos (iguales en los tres rodillos).
+# Se usa para buscar los pesos que dan una frecuencia dada; no necesita ser exacta.
+def _hit_frequency(weights):
+    total = float(sum(weights))
+    p = [w / total for w in weights]
+    hits = 0.0
+    for reels in product(range(len(ALL_SYMBOLS)), repeat=REELS):
+        if payout_multiplier(reels):
+            hits += p[reels[0]] * p[reels[1]] * p[reels[2]]
+    return hits
+
+
+# Función privada que busca por bisección el valor de 'x' en [low, high] para el que
+# frequency(x) vale 'target'. 'frequency' debe ser creciente en x.
+def _bisect(frequency, target, low, high, iterations=60):
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        if frequency(middle) < target:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+# Función que calcula los pesos de los rodillos para que la frecuencia de premios sea 'target'.
+# Con los 7 símbolos igual de probables (y sin vacíos) la frecuencia es 13/49 (~0.265):
+# - Para frecuencias menores, se agregan paradas vacías (bisección sobre su proporción).
+# - Para frecuencias mayores, los pesos se concentran en los primeros símbolos
+#   (peso del símbolo i proporcional a r**-i, bisección sobre r).
+# Devuelve los pesos de un rodillo (uno por símbolo de ALL_SYMBOLS), iguales para los tres.
+def weights_for_hit_frequency(target):
+    uniform = [1.0] * len(SYMBOLS) + [0.0]
+    base = _hit_frequency(uniform)
+    if not 0 < target < 1:
+        raise ValueError(f"Frecuencia de premios inválida: {target}")
+    if target <= base:
+        # La frecuencia baja a medida que crece la proporción de vacíos: buscamos sobre 1 - vacíos.
+        def with_blanks(paying):
+            return [paying / len(SYMBOLS)] * len(SYMBOLS) + [1 - paying]
+        paying = _bisect(lambda x: _hit_frequency(with_blanks(x)), target, 0.0, 1.0)
+        return with_blanks(paying)
+
+    def skewed(ratio):
+        return [ratio ** -i for i in range(len(SYMBOLS))] + [0.0]
+    ratio = _bisect(lambda r: _hit_frequency(skewed(r)), target, 1.0, 1000.0)
+    return skewed(ratio)
+
+
+# --- Definición de la Clase SlotEngine ---
+# Una configuración de la máquina: las tiras de los tres rodillos y su tabla de resultados.
+class SlotEngine:
+    # - strips: lista con la tira de cada rodillo (cada tira es una lista de índices de ALL_SYMBOLS).
+    def __init__(self, strips):
+        if len(strips) != REELS or not all(strips):
+            raise ValueError(f"Se necesitan {REELS} tiras con al menos una parada cada una.")
+        self.strips = [list(strip) for strip in strips]
+        # Tabla de resultados: multiplicador de cada combinación posible de símbolos, en una lista
+        # indexada por (primero * S + segundo) * S + tercero, con S = len(ALL_SYMBOLS).
+        self.outcome_table = [payout_multiplier(reels)
+                              for reels in product(range(len(ALL_SYMBOLS)), repeat=REELS)]
+
+    # Método para crear una configuración a partir de pesos: un peso por símbolo de ALL_SYMBOLS,
+    # ya sea una sola lista (igual para los tres rodillos) o una lista por rodillo.
+    # Los pesos se reparten en 'stops' paradas por tira (método del mayor resto).
+    @classmethod
+    def from_weights(cls, weights, stops=STRIP_STOPS):
+        if weights and not isinstance(weights[0], (list, tuple)):
+            weights = [weights] * REELS
+        return cls([_strip_from_weights(reel_weights, stops) for reel_weights in weights])
+
+    # Método para crear la configuración cuya frecuencia de premios es 'hit_frequency'.
+    @classmethod
+    def for_hit_frequency(cls, hit_frequency, stops=STRIP_STOPS):
+        return cls.from_weights(weights_for_hit_frequency(hit_frequency), stops)
+
+    # Método para crear la configuración de un juego (un diccionario con 'nombre' y 'probabilidad_ganar').
+    # Si el juego tiene pesos configurados en REEL_WEIGHTS se usan esos, y se avisa si su frecuencia
+    # de premios no coincide con la 'probabilidad_ganar' configurada en la base de datos;
+    # si no, los pesos se derivan de la 'probabilidad_ganar'.
+    @classmethod
+    def for_game(cls, game):
+        probabilidad = game.get('probabilidad_ganar')
+        weights = REEL_WEIGHTS.get(game.get('nombre'))
+        if weights is not None:
+            engine = cls.from_weights(weights)
+            if probabilidad is not None and abs(engine.hit_frequency() - float(probabilidad)) > HIT_FREQUENCY_TOLERANCE:
+                print(f"Advertencia: la frecuencia de premios de '{game['nombre']}' ({engine.hit_frequency():.4f}) "
+                      f"no coincide con su probabilidad_ganar ({float(probabilidad):.4f}).")
+            return engine
+        if probabilidad is None:
+            return DEFAULT_ENGINE
+        return cls.for_hit_frequency(float(probabilidad))
+
+    # Método para girar los rodillos: elige una parada de cada tira.
+    # Devuelve los índices (en ALL_SYMBOLS) de los símbolos que salieron.
+    # - rng: generador de números aleatorios (por defecto, el del módulo 'random').
+    def spin(self, rng=random):
+        return tuple(strip[rng.randrange(len(strip))] for strip in self.strips)
+
+    # Método que evalúa una jugada con la tabla de resultados. Devuelve el multiplicador pagado.
+    def evaluate(self, reels):
+        size = len(ALL_SYMBOLS)
+        return self.outcome_table[(reels[0] * size + reels[1]) * size + reels[2]]
+
+    # Método para jugar varias jugadas seguidas (modo automático) en una sola llamada.
+    # Los montos se expresan en apuestas (1 = el monto de una jugada):
+    # - stop_on_win: se detiene después de la primera jugada que paga algo.
+    # - max_net_loss: se detiene cuando la pérdida neta acumulada llega a este valor.
+    # - budget: saldo disponible; no se juega una jugada que el saldo ya no cubre.
+    # Devuelve la lista de jugadas hechas, cada una una tupla (índices de los símbolos, multiplicador).
+    def play_many(self, spins, stop_on_win=False, max_net_loss=None, budget=None, rng=random):
+        outcomes = []
+        net = 0 # Resultado neto acumulado (ganancias menos apuestas).
+        for _ in range(spins):
+            if budget is not None and budget + net < 1:
+                break
+            reels = self.spin(rng)
+            multiplier = self.evaluate(reels)
+            outcomes.append((reels, multiplier))
+            net += multiplier - 1
+            if stop_on_win and multiplier > 0:
+                break
+            if max_net_loss is not None and -net >= max_net_loss:
+                break
+        return outcomes
+
+    # Método que devuelve los símbolos a mostrar para una jugada.
+    @staticmethod
+    def symbols(reels):
+        return [ALL_SYMBOLS[index] for index in reels]
+
+    # Método que devuelve la probabilidad exacta de cada símbolo en cada rodillo.
+    def symbol_probabilities(self):
+        return [[Fraction(strip.count(symbol), len(strip)) for symbol in range(len(ALL_SYMBOLS))]
+                for strip in self.strips]
+
+    # Método que devuelve los valores teóricos exactos de esta configuración.
+    # Devuelve un diccionario con:
+    # - rtp: retorno al jugador (lo que se paga en promedio por cada unidad apostada).
+    # - hit_frequency: probabilidad de que una jugada pague algo.
+    # - variance: varianza del multiplicador pagado (su raíz es la volatilidad).
+    # - distribution: {multiplicador: probabilidad}.
+    def stats(self):
+        first, second, third = self.symbol_probabilities()
+        distribution = {}
+        for reels in product(range(len(ALL_SYMBOLS)), repeat=REELS):
+            p = first[reels[0]] * second[reels[1]] * third[reels[2]]
+            if p:
+                multiplier = self.evaluate(reels)
+                distribution[multiplier] = distribution.get(multiplier, 0) + p
+        rtp = sum(multiplier * p for multiplier, p in distribution.items())
+        second_moment = sum(multiplier * multiplier * p for multiplier, p in distribution.items())
+        return {
+            'rtp': rtp,
+            'hit_frequency': sum(p for multiplier, p in distribution.items() if multiplier > 0),
+            'variance': second_moment - rtp * rtp,
+            'distribution': dict(sorted(distribution.items())),
+        }
+
+    # Método que devuelve la frecuencia de premios exacta de esta configuración (como número decimal).
+    def hit_frequency(self):
+        return float(self.stats()['hit_frequency'])
+
+
+# Función privada que reparte unos pesos en una tira de 'stops' paradas (método del mayor resto).
+def _strip_from_weights(weights, stops):
+    if len(weights) != len(ALL_SYMBOLS):
+        raise ValueError(f"Se necesita un peso por símbolo ({len(ALL_SYMBOLS)}).")
+    total = float(sum(weights))
+    if total <= 0:
+        raise ValueError("Los pesos deben sumar más que cero.")
+    exact = [w / total * stops for w in weights]
+    counts = [int(value) for value in exact]
+    by_remainder = sorted(range(len(exact)), key=lambda i: exact[i] - counts[i], reverse=True)
+    for i in by_remainder[:stops - sum(counts)]:
+        counts[i] += 1
+    return [symbol for symbol, count in enumerate(counts) for _ in range(count)]
+
+
+# Configuración original de la máquina: los 7 símbolos igual de probables, sin vacíos.
+DEFAULT_ENGINE = SlotEngine([list(range(len(SYMBOLS)))] * REELS)
+
+
+# Función que devuelve los valores teóricos exactos de una configuración (por defecto, la original).
+def theoretical_stats(engine=DEFAULT_ENGINE):
+    return engine.stats()
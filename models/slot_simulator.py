@@ -0,0 +1,181 @@
+# models/slot_simulator.py
+# Este archivo define el simulador de Monte Carlo de la máquina tragamonedas.
+# Juega cientos de millones de jugadas con las reglas de slot_engine, sin interfaz ni
+# base de datos, y mide lo que la tabla de pagos realmente devuelve: RTP (retorno al
+# jugador), frecuencia de premios, volatilidad e intervalos de confianza. Sirve para
+# validar la configuración de un juego (ej. 'probabilidad_ganar' en la tabla 'juegos')
+# antes de que un cambio llegue a los jugadores.
+# Las jugadas se evalúan en lotes con NumPy con la misma tabla de resultados que usa el juego
+# (un millón de jugadas son unas pocas operaciones sobre arreglos) y los lotes se reparten
+# en un pool de procesos.
+#
+# Uso:
+#     python -m models.slot_simulator --spins 200000000
+#     python -m models.slot_simulator --spins 50000000 --probabilidad 0.25
+#     python -m models.slot_simulator --spins 50000000 --workers 8 --seed 42 --db
+
+# --- Importación de Bibliotecas ---
+import argparse # Para leer los parámetros de la línea de comandos.
+import math # Para la raíz cuadrada de la varianza.
+import multiprocessing # Para crear los procesos con 'spawn' (igual en Windows que en Linux).
+import os # Para saber cuántos procesadores hay.
+import time # Para medir la duración de la simulación.
+from concurrent.futures import ProcessPoolExecutor # Pool de procesos que devuelve objetos 'Future'.
+from statistics import NormalDist # Para el valor crítico de los intervalos de confianza.
+
+import numpy as np # Arreglos y generadores de números aleatorios vectorizados.
+
+from models import slot_engine # Reglas de la máquina: símbolos y tabla de pagos.
+
+# Jugadas que se evalúan de una sola vez (cada lote ocupa unos pocos MB).
+DEFAULT_BATCH_SIZE = 1_000_000
+# Nombre del juego en la tabla 'juegos' que se simula.
+GAME_NAME = 'tragamonedas'
+
+
+# Función que simula un bloque de jugadas (es la tarea que se ejecuta en cada proceso).
+# Devuelve cuántas veces se pagó cada multiplicador: counts[m] = jugadas que pagaron m veces la apuesta.
+# - engine: configuración de la máquina (tiras y tabla de resultados, ver slot_engine.SlotEngine).
+# - seed: semilla independiente del bloque (np.random.SeedSequence).
+def simulate_chunk(spins, seed, engine=slot_engine.DEFAULT_ENGINE, batch_size=DEFAULT_BATCH_SIZE):
+    rng = np.random.default_rng(seed)
+    strips = [np.asarray(strip, dtype=np.intp) for strip in engine.strips]
+    outcome_table = np.asarray(engine.outcome_table, dtype=np.intp)
+    symbols = len(slot_engine.ALL_SYMBOLS)
+    size = int(outcome_table.max()) + 1
+    counts = np.zeros(size, dtype=np.int64)
+    remaining = spins
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        # Igual que SlotEngine.spin/evaluate, pero para todo el lote: una parada al azar de cada
+        # tira y el índice de la combinación en la tabla de resultados.
+        combination = np.zeros(batch, dtype=np.intp)
+        for strip in strips:
+            combination = combination * symbols + strip[rng.integers(0, len(strip), size=batch)]
+        counts += np.bincount(outcome_table[combination], minlength=size)
+        remaining -= batch
+    return counts
+
+
+# Función que reparte la simulación en bloques y la ejecuta (en un pool de procesos si workers > 1).
+# Cada bloque recibe su propia semilla derivada de 'seed', así el resultado es reproducible
+# y los bloques no comparten secuencias de números aleatorios.
+# Devuelve el arreglo de conteos por multiplicador (ver 'simulate_chunk').
+def simulate(spins, workers=1, seed=None, batch_size=DEFAULT_BATCH_SIZE, engine=slot_engine.DEFAULT_ENGINE):
+    # Varios bloques por proceso, para que ninguno quede esperando al final.
+    chunks = max(1, min(workers * 4, spins // batch_size))
+    sizes = [spins // chunks + (1 if i < spins % chunks else 0) for i in range(chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+
+    if workers <= 1:
+        return sum(simulate_chunk(size, child, engine, batch_size) for size, child in zip(sizes, seeds))
+    # 'spawn' crea intérpretes limpios: no heredan hilos ni conexiones del proceso principal.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(simulate_chunk, size, child, engine, batch_size) for size, child in zip(sizes, seeds)]
+        return sum(future.result() for future in futures)
+
+
+# Función que calcula las estadísticas de una simulación a partir de sus conteos.
+# - confidence: nivel de confianza de los intervalos (ej. 0.95).
+# Devuelve un diccionario con spins, rtp, hit_frequency, volatility (desviación estándar del
+# multiplicador por jugada), sus intervalos de confianza (tuplas) y la distribución observada.
+def summarize(counts, confidence=0.95):
+    counts = np.asarray(counts, dtype=np.int64)
+    spins = int(counts.sum())
+    multipliers = np.arange(len(counts))
+    rtp = float((multipliers * counts).sum()) / spins
+    variance = float((multipliers * multipliers * counts).sum()) / spins - rtp * rtp
+    volatility = math.sqrt(max(variance, 0.0))
+    hit_frequency = float(counts[1:].sum()) / spins
+
+    # Intervalos de confianza por aproximación normal (con cientos de millones de jugadas es exacta a efectos prácticos).
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rtp_margin = z * volatility / math.sqrt(spins)
+    hit_margin = z * math.sqrt(hit_frequency * (1 - hit_frequency) / spins)
+    return {
+        'spins': spins,
+        'confidence': confidence,
+        'rtp': rtp,
+        'rtp_ci': (rtp - rtp_margin, rtp + rtp_margin),
+        'hit_frequency': hit_frequency,
+        'hit_frequency_ci': (hit_frequency - hit_margin, hit_frequency + hit_margin),
+        'volatility': volatility,
+        'distribution': {int(m): int(c) for m, c in enumerate(counts) if c},
+    }
+
+
+# Función que arma el reporte de texto de una simulación, comparándola con los valores teóricos
+# de la configuración simulada y, si se indica, con la 'probabilidad_ganar' configurada del juego.
+def format_report(stats, engine=slot_engine.DEFAULT_ENGINE, probabilidad_ganar=None, elapsed=None):
+    theory = engine.stats()
+    level = f"{stats['confidence']:.0%}"
+    lines = [f"Jugadas simuladas: {stats['spins']:,}"]
+    if elapsed:
+        lines[0] += f" en {elapsed:.1f} s ({stats['spins'] / elapsed:,.0f} jugadas/s)"
+    lines += [
+        f"RTP:                 {stats['rtp']:.6f}  (IC {level}: {stats['rtp_ci'][0]:.6f} - {stats['rtp_ci'][1]:.6f})"
+        f"  teórico {float(theory['rtp']):.6f}",
+        f"Frecuencia de premio: {stats['hit_frequency']:.6f}  (IC {level}: {stats['hit_frequency_ci'][0]:.6f} - "
+        f"{stats['hit_frequency_ci'][1]:.6f})  teórica {float(theory['hit_frequency']):.6f}",
+        f"Volatilidad:         {stats['volatility']:.6f}  teórica {math.sqrt(theory['variance']):.6f}",
+        "Distribución (multiplicador: frecuencia observada / teórica):",
+    ]
+    for multiplier, count in stats['distribution'].items():
+        lines.append(f"  x{multiplier}: {count / stats['spins']:.6f} / {float(theory['distribution'].get(multiplier, 0)):.6f}")
+    if probabilidad_ganar is not None:
+        low, high = stats['hit_frequency_ci']
+        verdict = "dentro" if low <= probabilidad_ganar <= high else "FUERA"
+        lines.append(f"probabilidad_ganar configurada: {probabilidad_ganar:.4f} -> {verdict} del IC de la frecuencia de premio")
+    return "\n".join(lines)
+
+
+# Función que lee los datos de un juego (incluida su 'probabilidad_ganar') desde la base de datos.
+def load_game(game_name=GAME_NAME):
+    # Importamos aquí: el simulador no necesita la base de datos salvo que se pida '--db'.
+    from models.Database.database_manager import DatabaseConnector
+    from models.game_model import GameModel
+
+    db = DatabaseConnector()
+    try:
+        for game in GameModel(db).get_all_games() or []:
+            if game['nombre'] == game_name:
+                return game
+        return None
+    finally:
+        db.disconnect()
+
+
+# --- Punto de Entrada de la Línea de Comandos ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulador de Monte Carlo del RTP de la máquina tragamonedas.")
+    parser.add_argument("--spins", type=int, default=10_000_000, help="cantidad de jugadas a simular")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="procesos a usar")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH_SIZE, help="jugadas por lote de NumPy")
+    parser.add_argument("--seed", type=int, default=None, help="semilla (para repetir una simulación)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="nivel de confianza de los intervalos")
+    parser.add_argument("--probabilidad", type=float, default=None,
+                        help="simular las tiras derivadas de esta probabilidad_ganar (por defecto, la configuración original)")
+    parser.add_argument("--db", action="store_true", help="simular el juego tal como está configurado en la base de datos")
+    args = parser.parse_args(argv)
+
+    # Elegimos la configuración a simular: la del juego en la base de datos, la derivada de una
+    # probabilidad dada, o la original (7 símbolos igual de probables).
+    engine, probabilidad_ganar = slot_engine.DEFAULT_ENGINE, args.probabilidad
+    if args.db:
+        game = load_game()
+        if game is None:
+            parser.error(f"No se encontró el juego '{GAME_NAME}' en la base de datos.")
+        engine = slot_engine.SlotEngine.for_game(game)
+        if game['probabilidad_ganar'] is not None:
+            probabilidad_ganar = float(game['probabilidad_ganar'])
+    elif probabilidad_ganar is not None:
+        engine = slot_engine.SlotEngine.for_hit_frequency(probabilidad_ganar)
+
+    start = time.perf_counter()
+    counts = simulate(args.spins, args.workers, args.seed, args.batch, engine)
+    elapsed = time.perf_counter() - start
+    print(format_report(summarize(counts, args.confidence), engine, probabilidad_ganar, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -41,6 +41,98 @@ class TransactionModel:
         # Ejecutamos la consulta con todos los parámetros.
         return self.db.execute_query(query, tuple(params))
 
+    # Método privado que arma la consulta de transacciones de un usuario con el filtro de fechas opcional.
+    def _user_filter(self, user_id, start_date, end_date):
+        query = "SELECT idtransaccion, tipo, metododepago, fecha_transaccion, monto_transaccion, estado FROM transacciones WHERE idcedula = %s"
+        params = [user_id]
+        if start_date:
+            query += " AND fecha_transaccion >= %s"
+            params.append(start_date)
+        if end_date:
+            query += " AND fecha_transaccion <= %s"
+            params.append(end_date)
+        return query, params
+
+    # Método para contar las transacciones de un usuario (se usa para mostrar el progreso de una exportación).
+    def count_transactions_by_user(self, user_id, start_date=None, end_date=None):
+        query, params = self._user_filter(user_id, start_date, end_date)
+        result = self.db.execute_query(f"SELECT COUNT(*) AS total FROM ({query}) AS historial", tuple(params))
+        return result[0]['total'] if result else 0
+
+    # Método para obtener los subtotales de las transacciones por tipo y estado (cantidad y monto).
+    # La suma se hace en el servidor: el reporte no necesita recorrer las filas para calcularla.
+    def get_transaction_totals_by_type(self, user_id, start_date=None, end_date=None):
+        query, params = self._user_filter(user_id, start_date, end_date)
+        query = f"""
+            SELECT tipo, estado, COUNT(*) AS transacciones, SUM(monto_transaccion) AS total
+            FROM ({query}) AS historial
+            GROUP BY tipo, estado
+            ORDER BY tipo, estado
+        """
+        return self.db.execute_query(query, tuple(params))
+
+    # Método para obtener los totales de las transacciones (cantidad y monto).
+    def get_transaction_totals(self, user_id, start_date=None, end_date=None):
+        query, params = self._user_filter(user_id, start_date, end_date)
+        query = f"""
+            SELECT COUNT(*) AS transacciones, COALESCE(SUM(monto_transaccion), 0) AS total
+            FROM ({query}) AS historial
+        """
+        result = self.db.execute_query(query, tuple(params))
+        return result[0] if result else None
+
+    # Método para recorrer las transacciones de un usuario en bloques, sin cargarlas enteras en memoria.
+    # Devuelve un generador de filas (ver DatabaseConnector.fetch_iter).
+    def iter_transactions_by_user(self, user_id, start_date=None, end_date=None, chunk_size=1000):
+        query, params = self._user_filter(user_id, start_date, end_date)
+        query += " ORDER BY fecha_transaccion DESC, idtransaccion DESC"
+        return self.db.fetch_iter(query, tuple(params), chunk_size)
+
+    # Método para obtener una página de transacciones de un usuario, de la más reciente a la más antigua.
+    # Usa paginación por clave ("keyset"/"seek") sobre (fecha_transaccion, idtransaccion) en lugar de OFFSET,
+    # así cada página cuesta lo mismo sin importar cuán profundo esté en el historial.
+    # - cursor: tupla (fecha_transaccion, idtransaccion) de la última fila conocida, o None para empezar.
+    # - before: si es True, devuelve las transacciones más recientes que el cursor (página anterior).
+    def get_transactions_page(self, user_id, start_date=None, end_date=None, cursor=None, limit=100, before=False):
+        query, params = self._user_filter(user_id, start_date, end_date)
+        # Condición de la clave: filas posteriores (o anteriores) al cursor.
+        if cursor is not None:
+            fecha, transaction_id = cursor
+            operator = ">" if before else "<"
+            query += f" AND (fecha_transaccion {operator} %s OR (fecha_transaccion = %s AND idtransaccion {operator} %s))"
+            params.extend([fecha, fecha, transaction_id])
+        order = "ASC" if before else "DESC"
+        query += f" ORDER BY fecha_transaccion {order}, idtransaccion {order} LIMIT %s"
+        params.append(limit)
+
+        rows = self.db.execute_query(query, tuple(params))
+        if rows is None:
+            return None
+        return rows[::-1] if before else rows # La página anterior se leyó al revés: la devolvemos en orden.
+
+    # Método para obtener las transacciones registradas después de una dada ("filas desde el id X"),
+    # de la más reciente a la más antigua. Los IDs son autoincrementales, así que son exactamente
+    # las transacciones nuevas; la condición usa la clave primaria y no recorre el resto del historial.
+    # - since_id: mayor idtransaccion ya conocido, o None para traer las más recientes.
+    def get_transactions_since(self, user_id, start_date=None, end_date=None, since_id=None, limit=100):
+        query, params = self._user_filter(user_id, start_date, end_date)
+        if since_id is not None:
+            query += " AND idtransaccion > %s"
+            params.append(since_id)
+        query += " ORDER BY fecha_transaccion DESC, idtransaccion DESC LIMIT %s"
+        params.append(limit)
+        return self.db.execute_query(query, tuple(params))
+
+    # Método para obtener el estado actual de algunas transacciones (ej. las que muestra una tabla).
+    # Las que ya no existen, o ya no cumplen el filtro de fechas, no vienen en el resultado.
+    def get_transactions_by_ids(self, user_id, transaction_ids, start_date=None, end_date=None):
+        if not transaction_ids:
+            return []
+        query, params = self._user_filter(user_id, start_date, end_date)
+        query += f" AND idtransaccion IN ({', '.join(['%s'] * len(transaction_ids))})"
+        params.extend(transaction_ids)
+        return self.db.execute_query(query, tuple(params))
+
     # Método para crear una nueva transacción en la base de datos.
     def create_transaction(self, transaction_data):
         query = """
@@ -1,6 +1,5 @@
 from models.Database.database_manager import DatabaseConnector # Importamos el conector de la base de datos.
-from PIL import Image # Importamos la clase Image de la biblioteca Pillow (PIL) para manipular imágenes.
-import io # Importamos el módulo 'io' para trabajar con datos binarios de la imagen en memoria.
+from models.avatar_store import AvatarStore # Almacén de imágenes de perfil (tabla 'avatares').
 
 # --- Definición de la Clase UserModel ---
 # Esta clase es el Modelo para la gestión de datos de usuarios.
@@ -11,45 +10,23 @@ class UserModel:
     # Esto es un ejemplo de Inyección de Dependencias.
     def __init__(self, db_connector):
         self.db = db_connector # Almacena la instancia del conector de la base de datos.
+        self.avatar_store = AvatarStore(db_connector) # Guarda las imágenes de perfil fuera de la fila del usuario.
 
     # Método para crear un nuevo usuario en la base de datos.
-    # Recibe los datos del usuario y, opcionalmente, los datos binarios de una imagen de perfil.
-    def create_user(self, user_data, image_data=None):
-        processed_image_data = None # Variable para guardar la imagen procesada (más pequeña).
-        if image_data: # Si se proporcionaron datos de imagen...
-            try:
-                # 1. Abrir la imagen desde los datos binarios que vienen de la interfaz.
-                # 'io.BytesIO' permite a Pillow leer los bytes como si fuera un archivo.
-                img = Image.open(io.BytesIO(image_data))
-                
-                # 2. Definir un tamaño máximo para la imagen de perfil (ej. 200x200 píxeles).
-                max_size = (200, 200)
-
-                # 3. Redimensionar la imagen manteniendo su proporción original.
-                # 'img.thumbnail' ajusta la imagen para que quepa en 'max_size'.
-                # 'Image.Resampling.LANCZOS' es un filtro de alta calidad para el redimensionamiento.
-                img.thumbnail(max_size, Image.Resampling.LANCZOS)
-
-                # Convertir a modo RGB si la imagen está en RGBA (con canal alfa),
-                # ya que JPEG no soporta canales alfa.
-                if img.mode == 'RGBA':
-                    img = img.convert('RGB')
-
-                # 4. Convertir la imagen redimensionada de nuevo a datos binarios.
-                # La guardamos en formato JPEG para una buena compresión.
-                byte_arr = io.BytesIO()
-                img.save(byte_arr, format='JPEG')
-                processed_image_data = byte_arr.getvalue() # Obtenemos los bytes finales de la imagen.
-            except Exception as e:
-                # Si hay un error al procesar la imagen (ej. no es un formato válido),
-                # imprimimos el error y no guardamos la imagen.
-                print(f"Error al procesar la imagen: {e}")
-                processed_image_data = None
-        
-        # Asignamos los datos de la imagen (procesados o None) a la información del usuario.
-        user_data['ruta_imagen'] = processed_image_data
-        # DEBUG: Imprimimos la longitud de los datos de la imagen procesada para depuración.
-        print(f"DEBUG: UserModel - processed_image_data length: {len(processed_image_data) if processed_image_data else 'None'}")
+    # Recibe los datos del usuario y, opcionalmente, su imagen de perfil: los datos binarios
+    # originales ('image_data') o, mejor, la imagen ya preparada en segundo plano ('avatar',
+    # una tupla (hash, {tamaño: bytes PNG}), ver AvatarIngest).
+    def create_user(self, user_data, image_data=None, avatar=None):
+        avatar_hash = None # Huella de la imagen de perfil en el almacén de avatares.
+        if avatar: # Si la imagen ya viene preparada, solo hay que guardarla.
+            avatar_hash, variants = avatar
+            if not self.avatar_store.save_variants(avatar_hash, variants):
+                avatar_hash = None
+        elif image_data: # Si se proporcionaron datos de imagen...
+            # El almacén la guarda ya redimensionada a los tamaños que muestra la aplicación.
+            # Si la imagen no es válida, el usuario se crea sin imagen de perfil.
+            avatar_hash = self.avatar_store.save(image_data)
+        user_data['avatar_hash'] = avatar_hash
 
         # --- Preparar la Consulta SQL para Insertar el Nuevo Usuario ---
         # Extraemos los datos del diccionario user_data.
@@ -59,11 +36,12 @@ class UserModel:
         edad = user_data.get('edad')
         celular = user_data.get('celular')
         apodo = user_data.get('apodo')
-        ruta_imagen = user_data.get('ruta_imagen') # Esto serán los datos binarios o None.
+        avatar_hash = user_data.get('avatar_hash') # Huella de la imagen o None.
 
+        # La fecha de registro no se indica: la base de datos le asigna su valor por defecto (la fecha actual).
         query = """
-        INSERT INTO usuarios (nombre, tipo_usuario, saldo, correo, celular, edad, apodo, fecha_registro, estado, contraseña, ruta_imagen)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, DEFAULT, %s, %s, %s)
+        INSERT INTO usuarios (nombre, tipo_usuario, saldo, correo, celular, edad, apodo, estado, contraseña, avatar_hash)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
         # Definimos valores por defecto para un nuevo usuario.
         tipo_usuario = 'usuario'
@@ -72,7 +50,7 @@ class UserModel:
 
         # Creamos una tupla con los parámetros para la consulta SQL.
         params = (
-            nombre, tipo_usuario, saldo, email, celular, edad, apodo, estado, contraseña, ruta_imagen
+            nombre, tipo_usuario, saldo, email, celular, edad, apodo, estado, contraseña, avatar_hash
         )
 
         # Ejecutamos la consulta de inserción en la base de datos.
@@ -80,8 +58,20 @@ class UserModel:
         success = self.db.execute_update(query, params)
         return success # Devolvemos True si la inserción fue exitosa, False en caso contrario.
 
+    # Columnas que devuelven las consultas de usuario.
+    # La imagen de perfil no está en la fila del usuario: solo su huella ('avatar_hash'),
+    # con la que se pide al almacén de avatares el tamaño exacto que se va a mostrar.
+    USER_COLUMNS = "idcedula, nombre, tipo_usuario, saldo, correo, celular, edad, apodo, fecha_registro, estado, avatar_hash"
+
     # Método para obtener un usuario por su email y contraseña (para el login).
     def get_user_by_email_and_password(self, email, password):
-        query = "SELECT idcedula, nombre, tipo_usuario, saldo, correo, celular, edad, apodo, fecha_registro, estado, ruta_imagen FROM usuarios WHERE correo = %s AND contraseña = %s"
+        query = f"SELECT {self.USER_COLUMNS} FROM usuarios WHERE correo = %s AND contraseña = %s"
         result = self.db.execute_query(query, (email, password)) # Ejecutamos la consulta.
         return result[0] if result else None # Devuelve el primer usuario encontrado o None.
+
+    # Método para obtener un usuario por su ID (cédula).
+    # Se usa para refrescar los datos del usuario logueado (ej. el saldo tras una jugada).
+    def get_user_by_id(self, user_id):
+        query = f"SELECT {self.USER_COLUMNS} FROM usuarios WHERE idcedula = %s"
+        result = self.db.execute_query(query, (user_id,)) # Ejecutamos la consulta.
+        return result[0] if result else None # Devuelve el usuario encontrado o None.
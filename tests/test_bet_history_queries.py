@@ -0,0 +1,79 @@
+# tests/test_bet_history_queries.py
+# Este archivo verifica que cargar y exportar el historial de apuestas haga siempre la misma
+# cantidad de consultas, sin importar cuántas apuestas tenga el usuario: el nombre de cada
+# juego llega con un JOIN en el servidor, y no con una consulta a 'juegos' por cada apuesta.
+# Cada acción se ejecuta con su controlador real sobre la base en memoria de los benchmarks
+# (ver benchmarks/fake_db.py), una vez con un historial chico y otra con uno grande.
+#
+# Uso:
+#     python -m pytest tests
+#     python -m unittest discover tests
+
+# --- Importación de Bibliotecas ---
+import os # Para las rutas de los archivos exportados.
+import tempfile # Carpeta temporal para los reportes.
+import unittest
+from unittest import mock # Para contar las llamadas a GameModel.get_game_by_id.
+
+from benchmarks.fake_db import FakeDatabaseConnector
+from benchmarks.headless import HeadlessApp # Controladores reales con vistas sin pantalla.
+from models.game_model import GameModel
+
+# Tamaños de historial con los que se ejecuta cada acción.
+SMALL_HISTORY = 10
+LARGE_HISTORY = 2000
+
+
+# Función que devuelve cuántas sentencias lleva registradas el conector.
+def _query_count(db):
+    return sum(statement['calls'] for statement in db.stats.snapshot())
+
+
+# --- Definición de la Clase BetHistoryQueryCountTest ---
+class BetHistoryQueryCountTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory(prefix="casino_tests_")
+        self.addCleanup(self.workdir.cleanup)
+
+    # Acciones verificadas: nombre -> (función que la ejecuta sobre una HeadlessApp con la sesión
+    # iniciada, consultas que debe hacer). La tabla pide solo su primera página; el PDF cuenta las
+    # filas, las lee en un solo recorrido y pide los totales por juego y generales; el Excel cuenta
+    # y lee.
+    def _actions(self):
+        return {
+            'load_user_bets': (lambda app: app.bet_controller.load_user_bets(), 1),
+            'export_pdf': (lambda app: app.bet_controller.export_bets_to_pdf(os.path.join(self.workdir.name, "bets.pdf")), 4),
+            'export_excel': (lambda app: app.bet_controller.export_bets_to_excel(os.path.join(self.workdir.name, "bets.xlsx")), 2),
+        }
+
+    # Método privado que ejecuta una acción con un historial de 'bets' apuestas.
+    # Devuelve (consultas hechas, llamadas a get_game_by_id).
+    def _run(self, name, action, bets):
+        db = FakeDatabaseConnector(latency_ms=0)
+        self.addCleanup(db.disconnect)
+        user = db.seed(bets=bets, transactions=0)
+        app = HeadlessApp(db)
+        app.session.login(user) # Sin LoginController: la precarga del login no interviene.
+        db.stats.reset()
+
+        with mock.patch.object(GameModel, 'get_game_by_id', autospec=True,
+                               side_effect=GameModel.get_game_by_id) as get_game_by_id:
+            action(app)
+
+        self.assertEqual(app.ui.of_kind('error'), [], f"'{name}' mostró un error")
+        return _query_count(db), get_game_by_id.call_count
+
+    def test_query_count_does_not_grow_with_history(self):
+        for name, (action, expected_queries) in self._actions().items():
+            with self.subTest(action=name):
+                small_queries, small_lookups = self._run(name, action, SMALL_HISTORY)
+                large_queries, large_lookups = self._run(name, action, LARGE_HISTORY)
+
+                self.assertEqual(small_queries, expected_queries, f"'{name}' con {SMALL_HISTORY} apuestas")
+                self.assertEqual(large_queries, expected_queries, f"'{name}' con {LARGE_HISTORY} apuestas")
+                self.assertEqual(small_lookups, 0)
+                self.assertEqual(large_lookups, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
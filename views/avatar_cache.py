@@ -0,0 +1,39 @@
+from collections import OrderedDict # Diccionario que recuerda el orden de uso (para descartar el más antiguo).
+
+# Cantidad máxima de imágenes de perfil que se guardan en memoria.
+AVATAR_CACHE_SIZE = 16
+
+# --- Definición de la Clase AvatarCache ---
+# Caché LRU ("el menos usado recientemente se descarta primero") de imágenes de perfil.
+# Cada entrada se identifica por (id de usuario, huella del contenido): si el usuario
+# cambia su imagen, cambia la huella y la entrada vieja deja de usarse.
+# Guarda los bytes de la imagen y la imagen ya lista para Tkinter (PhotoImage),
+# así volver a mostrar la misma imagen (ej. tras una jugada) no requiere ningún trabajo.
+class AvatarCache:
+    def __init__(self, max_entries=AVATAR_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # (user_id, hash) -> (bytes, PhotoImage).
+
+    # Método para obtener la imagen lista para mostrar, o None si no está en la caché.
+    def get(self, user_id, image_hash):
+        entry = self._entries.get((user_id, image_hash))
+        if entry is None:
+            return None
+        self._entries.move_to_end((user_id, image_hash)) # Marcamos la entrada como usada recientemente.
+        return entry[1]
+
+    # Método para obtener los bytes originales de la imagen, o None si no está en la caché.
+    def get_bytes(self, user_id, image_hash):
+        entry = self._entries.get((user_id, image_hash))
+        return entry[0] if entry else None
+
+    # Método para guardar una imagen; si se supera el límite, se descarta la menos usada.
+    def put(self, user_id, image_hash, data, photo):
+        self._entries[(user_id, image_hash)] = (data, photo)
+        self._entries.move_to_end((user_id, image_hash))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # Método para vaciar la caché.
+    def clear(self):
+        self._entries.clear()
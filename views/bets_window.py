@@ -1,7 +1,7 @@
 import tkinter as tk # Importamos la biblioteca principal para crear interfaces gráficas.
 from tkinter import ttk, filedialog # Importamos ttk para widgets con estilos modernos y filedialog para diálogos de archivo.
 import datetime # Importamos datetime para trabajar con fechas.
-from tkcalendar import DateEntry # Importamos DateEntry de tkcalendar para un selector de fechas amigable.
+from views.date_picker import LazyDateEntry # Selector de fechas de tkcalendar, que se carga al usarlo por primera vez.
 
 # Importamos los Modelos y el Controlador necesarios para esta vista.
 # Esto es parte del patrón Modelo-Vista-Controlador (MVC).
@@ -9,6 +9,7 @@ from models.user_model import UserModel
 from models.game_model import GameModel
 from models.bet_model import BetModel
 from controllers.bet_controller import BetController
+from views.paged_treeview import PagedTreeview
 
 # --- Definición de la Clase BetsWindow ---
 # Esta clase representa la Vista (GUI) para mostrar el historial de apuestas del usuario.
@@ -36,11 +37,12 @@ class BetsWindow:
             widget.destroy()
 
         self.create_widgets() # Llamamos a un método para construir todos los elementos de la GUI.
+        # 'add' evita reemplazar lo que otras vistas ya asociaron al mismo evento del notebook.
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed, add="+")
         
-        # Si se pasa un usuario al inicializar la ventana, lo establecemos en el controlador.
+        # Si se pasa un usuario al inicializar la ventana, iniciamos la sesión con él.
         if user_placeholder:
-            self.controller.set_current_user(user_placeholder)
-        self.load_bets() # Cargamos las apuestas iniciales del usuario.
+            self.controller.session.login(user_placeholder) # El controlador carga sus apuestas.
 
     # Metodo para crear y organizar todos los widgets (botones, etiquetas, tablas) de la ventana.
     def create_widgets(self):
@@ -57,12 +59,12 @@ class BetsWindow:
 
         # Etiqueta y selector de fecha "Desde".
         ttk.Label(filter_frame, text="Desde:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        self.start_date_entry = DateEntry(filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
+        self.start_date_entry = LazyDateEntry(filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2)
         self.start_date_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
 
         # Etiqueta y selector de fecha "Hasta".
         ttk.Label(filter_frame, text="Hasta:").grid(row=0, column=2, padx=5, pady=5, sticky="w")
-        self.end_date_entry = DateEntry(filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
+        self.end_date_entry = LazyDateEntry(filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2)
         self.end_date_entry.grid(row=0, column=3, padx=5, pady=5, sticky="ew")
 
         # Botón para aplicar el filtro de fechas.
@@ -72,15 +74,16 @@ class BetsWindow:
         # --- Tabla (Treeview) para Mostrar Apuestas ---
         # Definimos las columnas que tendrá nuestra tabla de apuestas.
         columns = ("ID", "Juego", "Monto", "Resultado", "Ganancia", "Fecha")
-        # Creamos el widget Treeview, que es una tabla avanzada de Tkinter.
-        self.tree = ttk.Treeview(frame, columns=columns, show="headings", height=10)
-
-        # Configuramos los encabezados de cada columna.
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100) # Definimos un ancho para cada columna.
-
-        self.tree.pack(pady=10, fill=tk.BOTH, expand=True) # Empaquetamos la tabla.
+        # Usamos una tabla paginada: solo se cargan las apuestas que el usuario va viendo al desplazarse.
+        self.table = PagedTreeview(
+            frame, columns,
+            row_key=lambda bet: bet['idapuesta'],
+            row_cursor=lambda bet: (bet['fecha_apuesta'], bet['idapuesta']),
+            row_values=self._bet_values,
+            height=10
+        )
+        self.tree = self.table.tree # Acceso directo al Treeview interno.
+        self.table.frame.pack(pady=10, fill=tk.BOTH, expand=True) # Empaquetamos la tabla.
 
         # --- Botones de Exportación ---
         # Creamos un marco para agrupar los botones de exportación.
@@ -93,25 +96,50 @@ class BetsWindow:
         ttk.Button(export_frame, text="Exportar a Excel", command=self.export_to_excel).pack(side=tk.LEFT, padx=5, expand=True)
         # --- Fin Botones de Exportación ---
 
+        # --- Progreso de Exportación ---
+        # Barra de progreso que solo se muestra mientras se exporta un reporte.
+        self.progress_frame = ttk.Frame(frame)
+        self.progress_label = ttk.Label(self.progress_frame, text="")
+        self.progress_label.pack(side=tk.LEFT, padx=5)
+        self.progress_bar = ttk.Progressbar(self.progress_frame, orient=tk.HORIZONTAL, mode="determinate", length=300)
+        self.progress_bar.pack(side=tk.LEFT, padx=5, fill="x", expand=True)
+        # --- Fin Progreso de Exportación ---
+
         # Botón para volver al Dashboard.
-        ttk.Button(frame, text="Volver", command=self.back_to_dashboard).pack(pady=10)
+        self.back_button = ttk.Button(frame, text="Volver", command=self.back_to_dashboard)
+        self.back_button.pack(pady=10)
 
     # Metodo para mostrar las apuestas en la tabla (Treeview).
-    def display_bets(self, bets):
-        # Limpiamos cualquier entrada existente en la tabla antes de añadir nuevas.
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Insertamos cada apuesta en la tabla.
-        for bet in bets:
-            self.tree.insert("", "end", values=(
-                bet['idapuesta'],
-                bet['nombre_juego'], # Usamos el nombre del juego enriquecido por el controlador.
-                f"${bet['monto']:.2f}", # Formateamos el monto como moneda.
-                bet['resultado'],
-                f"${bet['ganancia']:.2f}", # Formateamos la ganancia como moneda.
-                bet['fecha_apuesta']
-            ))
+    # Recibe la función que obtiene cada página de apuestas; la tabla la llama al desplazarse.
+    # Recibe también la función que obtiene los cambios, que la tabla usa al refrescarse.
+    def display_bets(self, page_loader, sync_loader=None):
+        self.table.reset(page_loader, sync_loader)
+
+    # Metodo para refrescar la tabla con los cambios (filas nuevas, modificadas o borradas), sin recargarla.
+    def refresh_bets(self):
+        self.table.refresh()
+
+    # Metodo que se ejecuta al cambiar de pestaña: si el usuario vuelve a esta pestaña, refrescamos
+    # las apuestas (pueden haber cambiado, ej. desde otra terminal con la misma cuenta).
+    def on_tab_changed(self, event):
+        if self.notebook.select() == str(self.root):
+            self.controller.refresh_user_bets()
+
+    # Metodo para agregar una apuesta recién registrada al principio de la tabla.
+    def add_bet(self, bet):
+        self.table.add_newest(bet)
+
+    # Metodo que convierte una apuesta en los valores de una fila de la tabla.
+    @staticmethod
+    def _bet_values(bet):
+        return (
+            bet['idapuesta'],
+            bet['nombre_juego'], # Usamos el nombre del juego que trae la consulta del historial.
+            f"${bet['monto']:.2f}", # Formateamos el monto como moneda.
+            bet['resultado'],
+            f"${bet['ganancia']:.2f}", # Formateamos la ganancia como moneda.
+            bet['fecha_apuesta']
+        )
 
     # Metodo para cargar las apuestas del usuario.
     # Simplemente delega la tarea al controlador.
@@ -133,45 +161,37 @@ class BetsWindow:
 
     # Metodo que se ejecuta cuando el usuario hace clic en "Exportar a PDF".
     def export_to_pdf(self):
-        # Obtenemos las apuestas actualmente mostradas en la tabla.
-        # Asumimos que la tabla refleja con precisión los datos filtrados.
-        bets_to_export = []
-        for item_id in self.tree.get_children():
-            values = self.tree.item(item_id, 'values')
-            # Reconstruimos un diccionario de apuesta para el exportador.
-            bets_to_export.append({
-                'idapuesta': values[0],
-                'nombre_juego': values[1],
-                'monto': float(values[2].replace('$', '')), # Convertimos el monto a float, quitando el '$’.
-                'resultado': values[3],
-                'ganancia': float(values[4].replace('$', '')), # Convertimos la ganancia a float, quitando el '$’.
-                'fecha_apuesta': values[5]
-            })
-        
         # Abrimos un diálogo para que el usuario elija dónde guardar el archivo PDF.
         file_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF files", "*.pdf")])
         if file_path: # Si el usuario seleccionó una ruta...
-            self.controller.export_bets_to_pdf(bets_to_export, file_path) # Le pedimos al controlador que exporte.
+            # El controlador genera el reporte del filtro actual en un proceso aparte.
+            self.controller.export_bets_to_pdf(file_path)
 
     # Metodo que se ejecuta cuando el usuario hace clic en "Exportar a Excel".
     def export_to_excel(self):
-        # Obtenemos las apuestas actualmente mostradas en la tabla.
-        bets_to_export = []
-        for item_id in self.tree.get_children():
-            values = self.tree.item(item_id, 'values')
-            bets_to_export.append({
-                'idapuesta': values[0],
-                'nombre_juego': values[1],
-                'monto': float(values[2].replace('$', '')), # Convertimos el monto a float, quitando el '$’.
-                'resultado': values[3],
-                'ganancia': float(values[4].replace('$', '')), # Convertimos la ganancia a float, quitando el '$’.
-                'fecha_apuesta': values[5]
-            })
-
         # Abrimos un diálogo para que el usuario elija dónde guardar el archivo Excel.
         file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")])
         if file_path: # Si el usuario seleccionó una ruta...
-            self.controller.export_bets_to_excel(bets_to_export, file_path) # Le pedimos al controlador que exporte.
+            # El controlador lee las apuestas del filtro actual y escribe el archivo en segundo plano.
+            self.controller.export_bets_to_excel(file_path)
+
+    # Metodo para mostrar el avance de una exportación ('total' es None mientras se cuenta).
+    def show_export_progress(self, done, total):
+        if not self.progress_frame.winfo_ismapped():
+            self.progress_frame.pack(pady=5, fill="x", before=self.back_button)
+        if total:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate", maximum=total, value=done)
+            self.progress_label.configure(text=f"Exportando {done} de {total} apuestas...")
+        else:
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+            self.progress_label.configure(text="Preparando exportación...")
+
+    # Metodo para ocultar la barra de progreso al terminar la exportación.
+    def hide_export_progress(self):
+        self.progress_bar.stop()
+        self.progress_frame.pack_forget()
 
     # Método para volver a la pestaña del Dashboard.
     def back_to_dashboard(self):
@@ -0,0 +1,77 @@
+import datetime # Para leer y escribir la fecha mientras el calendario no existe.
+import tkinter as tk # Importamos la biblioteca principal para crear interfaces gráficas.
+from tkinter import ttk # Importamos ttk para widgets con estilos modernos.
+
+# Formato de las fechas de los selectores (el 'date_pattern' de tkcalendar equivalente).
+DATE_FORMAT = '%Y-%m-%d'
+DATE_PATTERN = 'yyyy-mm-dd'
+
+# --- Definición de la Clase LazyDateEntry ---
+# Selector de fechas que carga tkcalendar recién cuando el usuario lo usa.
+# Hasta entonces muestra un campo con el mismo aspecto (un Combobox con la fecha de hoy),
+# así las ventanas con filtros de fecha se construyen sin importar tkcalendar al iniciar.
+# Al primer clic (o al llegar con Tab) se reemplaza por el DateEntry de tkcalendar,
+# con los mismos argumentos y la fecha que tenía el campo.
+# Ofrece 'get_date' y 'set_date' como DateEntry, tanto antes como después del reemplazo.
+class LazyDateEntry(ttk.Frame):
+    # 'options': los argumentos para DateEntry (ej. width, background, top_level).
+    def __init__(self, parent, width=12, **options):
+        super().__init__(parent)
+        self.options = dict(options, width=width, date_pattern=DATE_PATTERN)
+        self.calendar = None # El DateEntry real, una vez creado.
+        self.last_date = datetime.date.today() # Última fecha válida del campo provisional.
+        self.text = tk.StringVar(value=self.last_date.strftime(DATE_FORMAT))
+        self.placeholder = ttk.Combobox(self, width=width, textvariable=self.text)
+        self.placeholder.pack(fill="x", expand=True)
+        self.placeholder.bind("<Button-1>", self._on_click)
+        self.placeholder.bind("<FocusIn>", self._on_focus)
+
+    # Método privado que crea el DateEntry real en lugar del campo provisional.
+    def _load(self):
+        if self.calendar is not None:
+            return self.calendar
+        # Importamos tkcalendar aquí para que solo se cargue al usar un selector de fechas.
+        from tkcalendar import DateEntry
+        date = self.get_date()
+        self.calendar = DateEntry(self, **self.options)
+        if date:
+            self.calendar.set_date(date)
+        else:
+            self.calendar.delete(0, "end") # El campo estaba vacío: el calendario también.
+        self.placeholder.destroy()
+        self.calendar.pack(fill="x", expand=True)
+        return self.calendar
+
+    # Un clic abre directamente el calendario, como lo haría el DateEntry.
+    def _on_click(self, event):
+        calendar = self._load()
+        calendar.focus_set()
+        calendar.drop_down()
+        return "break"
+
+    def _on_focus(self, event):
+        self._load().focus_set()
+
+    # Método para obtener la fecha seleccionada (datetime.date), o None si el campo está vacío.
+    # Si el texto escrito no es una fecha, el campo vuelve a la última fecha válida y se
+    # devuelve esa (como DateEntry).
+    def get_date(self):
+        if self.calendar is not None:
+            return self.calendar.get_date()
+        text = self.text.get().strip()
+        if not text:
+            return None
+        try:
+            self.last_date = datetime.datetime.strptime(text, DATE_FORMAT).date()
+        except ValueError:
+            self.text.set(self.last_date.strftime(DATE_FORMAT))
+        return self.last_date
+
+    # Método para cambiar la fecha; con None se deja el campo vacío.
+    def set_date(self, date):
+        if self.calendar is not None:
+            self.calendar.set_date(date)
+        else:
+            if date:
+                self.last_date = date
+            self.text.set(date.strftime(DATE_FORMAT) if date else "")
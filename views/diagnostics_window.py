@@ -0,0 +1,115 @@
+import tkinter as tk # Importamos la biblioteca principal para crear interfaces gráficas.
+from tkinter import ttk, filedialog, messagebox # Widgets con estilo, diálogo para guardar y mensajes emergentes.
+
+# --- Definición de la Clase DiagnosticsWindow ---
+# Ventana del menú "Diagnóstico": muestra las estadísticas de las consultas a la base de datos
+# (ver models/Database/query_stats.py). Se puede filtrar por la acción del controlador que hizo
+# las consultas, ver el registro de consultas lentas y guardar todo en un archivo JSON.
+class DiagnosticsWindow:
+    # Columnas de la tabla de sentencias: (título, clave en las estadísticas, ancho).
+    STATEMENT_COLUMNS = (
+        ("Sentencia", 'sql', 360), ("Llamadas", 'calls', 70), ("Errores", 'errors', 60), ("Filas", 'rows', 70),
+        ("Total ms", 'total_ms', 80), ("Media ms", 'avg_ms', 70), ("p95 ms", 'p95_ms', 60), ("Máx ms", 'max_ms', 70),
+    )
+    SLOW_COLUMNS = (
+        ("Hora", 'at', 140), ("ms", 'ms', 70), ("Filas", 'rows', 60), ("Acción", 'action', 200),
+        ("Modelo", 'model', 200), ("Sentencia", 'sql', 360),
+    )
+    ALL_ACTIONS = "(todas)"
+
+    # Recibe la ventana raíz y las estadísticas del conector (DatabaseConnector.stats).
+    def __init__(self, root, stats):
+        self.stats = stats
+        self.window = tk.Toplevel(root)
+        self.window.title("Diagnóstico de consultas")
+        self.window.geometry("1000x520")
+        self.create_widgets()
+        self.refresh()
+
+    # Método para crear y organizar los widgets de la ventana.
+    def create_widgets(self):
+        frame = ttk.Frame(self.window, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        # --- Barra de Herramientas ---
+        toolbar = ttk.Frame(frame)
+        toolbar.pack(fill="x", pady=(0, 10))
+        ttk.Label(toolbar, text="Acción:").pack(side=tk.LEFT)
+        self.action_var = tk.StringVar(value=self.ALL_ACTIONS)
+        self.action_combo = ttk.Combobox(toolbar, textvariable=self.action_var, state="readonly", width=45)
+        self.action_combo.pack(side=tk.LEFT, padx=5)
+        self.action_combo.bind("<<ComboboxSelected>>", lambda event: self.refresh())
+        ttk.Button(toolbar, text="Actualizar", command=self.refresh).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text="Reiniciar", command=self.reset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text="Guardar en archivo...", command=self.dump).pack(side=tk.RIGHT)
+
+        # --- Pestañas: Sentencias y Consultas Lentas ---
+        tabs = ttk.Notebook(frame)
+        tabs.pack(fill=tk.BOTH, expand=True)
+        self.statements_table = self._create_table(tabs, self.STATEMENT_COLUMNS)
+        self.slow_table = self._create_table(tabs, self.SLOW_COLUMNS)
+        tabs.add(self.statements_table.master, text="Sentencias")
+        tabs.add(self.slow_table.master, text=f"Consultas lentas (>= {self.stats.slow_threshold_ms:.0f} ms)")
+
+        # Al seleccionar una sentencia, mostramos de dónde se llamó.
+        self.sites_label = ttk.Label(frame, text="", justify=tk.LEFT)
+        self.sites_label.pack(fill="x", pady=(10, 0))
+        self.statements_table.bind("<<TreeviewSelect>>", self.show_sites)
+
+    # Método privado que crea una tabla con barra de desplazamiento dentro de su propio marco.
+    def _create_table(self, parent, columns):
+        container = ttk.Frame(parent)
+        table = ttk.Treeview(container, columns=[title for title, _, _ in columns], show="headings")
+        for title, _, width in columns:
+            table.heading(title, text=title)
+            table.column(title, width=width, stretch=(title == "Sentencia"))
+        scrollbar = ttk.Scrollbar(container, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=scrollbar.set)
+        table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill="y")
+        return table
+
+    # Método para volver a leer las estadísticas y mostrarlas.
+    def refresh(self):
+        self.action_combo['values'] = [self.ALL_ACTIONS] + self.stats.actions()
+        action = self.action_var.get()
+        self.statements = self.stats.snapshot(action=None if action == self.ALL_ACTIONS else action)
+        self._fill(self.statements_table, self.STATEMENT_COLUMNS, self.statements)
+        slow = self.stats.slow_queries()
+        if action != self.ALL_ACTIONS:
+            slow = [entry for entry in slow if entry['action'] == action]
+        self._fill(self.slow_table, self.SLOW_COLUMNS, slow)
+        self.sites_label.config(text="")
+
+    # Método privado que reemplaza las filas de una tabla.
+    def _fill(self, table, columns, rows):
+        table.delete(*table.get_children())
+        for index, row in enumerate(rows):
+            table.insert("", tk.END, iid=str(index), values=[row[key] for _, key, _ in columns])
+
+    # Método que muestra los orígenes (acción del controlador -> método del modelo) de la sentencia seleccionada.
+    def show_sites(self, event=None):
+        selection = self.statements_table.selection()
+        if not selection:
+            return
+        sites = self.statements[int(selection[0])]['sites']
+        self.sites_label.config(text="\n".join(
+            f"{site['calls']:>6}  {site['action']} -> {site['model']}" for site in sites[:5]))
+
+    # Método para borrar las estadísticas acumuladas.
+    def reset(self):
+        self.stats.reset()
+        self.refresh()
+
+    # Método para guardar las estadísticas en un archivo JSON elegido por el usuario.
+    def dump(self):
+        file_path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".json",
+                                                 filetypes=[("JSON files", "*.json")])
+        if not file_path:
+            return
+        try:
+            self.stats.dump(file_path)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo guardar el archivo: {e}", parent=self.window)
+            return
+        messagebox.showinfo("Diagnóstico", f"Estadísticas guardadas en {file_path}", parent=self.window)
@@ -0,0 +1,53 @@
+from tkinter import ttk # Importamos ttk para los marcos de las pestañas.
+
+# --- Definición de la Clase LazyTabs ---
+# Pestañas del notebook que se construyen al usarlas por primera vez.
+# Cada pestaña se registra con una función 'fábrica' que recibe su marco y devuelve la vista
+# (con sus modelos y su controlador). La vista se construye la primera vez que el usuario
+# selecciona la pestaña, o la primera vez que alguien pide su vista o su controlador
+# (ej. para entregarle un evento). Una pestaña que nunca se abre solo cuesta su marco vacío:
+# ni widgets, ni modelos, ni consultas.
+class LazyTabs:
+    def __init__(self, notebook):
+        self.notebook = notebook # El widget de pestañas (ttk.Notebook).
+        self._tabs = {}          # Nombre -> (marco, fábrica).
+        self._views = {}         # Nombre -> vista ya construida.
+        # 'add' evita reemplazar lo que otras vistas asocien al mismo evento del notebook.
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed, add="+")
+
+    # Método para registrar una pestaña. La fábrica recibe el marco de la pestaña y devuelve su vista.
+    def add(self, name, text, factory):
+        frame = ttk.Frame(self.notebook, width=400, height=280)
+        frame.pack(fill="both", expand=True)
+        self.notebook.add(frame, text=text)
+        self._tabs[name] = (frame, factory)
+
+    # Método para saber si la vista de una pestaña ya se construyó.
+    def is_built(self, name):
+        return name in self._views
+
+    # Método para obtener la vista de una pestaña, construyéndola si todavía no existe.
+    def view(self, name):
+        if name not in self._views:
+            frame, factory = self._tabs[name]
+            self._views[name] = factory(frame)
+        return self._views[name]
+
+    # Método para obtener el controlador de una pestaña (construye la pestaña si hace falta).
+    def controller(self, name):
+        return self.view(name).controller
+
+    # Métodos para recorrer solo lo que ya se construyó (ej. al cerrar la aplicación).
+    def built_views(self):
+        return list(self._views.values())
+
+    def built_controllers(self):
+        return [view.controller for view in self._views.values()]
+
+    # Método privado que construye la pestaña que el usuario acaba de seleccionar.
+    def _on_tab_changed(self, event):
+        selected = self.notebook.select()
+        for name, (frame, _factory) in self._tabs.items():
+            if str(frame) == selected:
+                self.view(name)
+                break
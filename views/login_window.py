@@ -62,15 +62,12 @@ class LoginWindow:
 
     # Método que se llama desde el controlador cuando el inicio de sesión es exitoso.
     def on_login_success(self, user):
-        messagebox.showinfo("Login", f"¡Bienvenido, {user['nombre']}!") # Mostramos un mensaje de bienvenida.
         self.email.delete(0, tk.END)     # Limpiamos el campo de email.
         self.password.delete(0, tk.END) # Limpiamos el campo de contraseña.
         self.notebook.select(2)         # Cambiamos a la pestaña del Dashboard (asumiendo que es la tercera pestaña, índice 2).
-        
-        # Si el controlador tiene una referencia al controlador del dashboard,
-        # le pasamos los datos del usuario para que el dashboard se actualice.
-        if hasattr(self.controller, 'dashboard_controller') and self.controller.dashboard_controller:
-            self.controller.dashboard_controller.set_current_user(user)
+        # El Dashboard ya recibió al usuario por la sesión compartida (ver LoginController).
+        # El mensaje de bienvenida se muestra después: así el Dashboard aparece sin esperar al usuario.
+        messagebox.showinfo("Login", f"¡Bienvenido, {user['nombre']}!") # Mostramos un mensaje de bienvenida.
 
     # Método que se ejecuta cuando el usuario hace clic en el botón "Registrar".
     def open_register(self):
@@ -0,0 +1,214 @@
+import tkinter as tk # Importamos la biblioteca principal para crear interfaces gráficas.
+from tkinter import ttk # Importamos ttk para widgets con estilos modernos.
+
+# Fracción de la tabla (desde el borde) a partir de la cual se pide la siguiente página al desplazarse.
+SCROLL_EDGE = 0.1
+
+# --- Definición de la Clase PagedTreeview ---
+# Tabla (Treeview) "virtualizada" para historiales largos.
+# En lugar de insertar todo el historial, pide páginas a medida que el usuario se desplaza
+# y mantiene como máximo 'max_rows' filas en el widget: al llegar al final se agrega la
+# página siguiente y se descartan filas del principio, y al volver arriba se recuperan.
+# La tabla no sabe nada de la base de datos: recibe un 'page_loader' con la forma
+#     page_loader(cursor, before, limit, on_done)
+# que debe llamar a 'on_done(filas)' en el hilo de Tk (ver DatabaseExecutor).
+# Las filas se identifican por su clave (ej. idapuesta), que es el 'iid' del Treeview. Para
+# refrescar la tabla sin borrarla, recibe además un 'sync_loader' opcional con la forma
+#     sync_loader(since_key, keys, limit, on_done)
+# que debe llamar a 'on_done((filas nuevas desde since_key, estado actual de las filas 'keys'))':
+# solo se insertan las filas nuevas, se actualizan las que cambiaron y se quitan las que ya no están.
+class PagedTreeview:
+    # - columns: nombres de las columnas a mostrar.
+    # - row_key: función que devuelve el identificador único de una fila (ej. idapuesta).
+    # - row_cursor: función que devuelve la clave de paginación de una fila (ej. (fecha, id)).
+    # - row_values: función que convierte una fila en la tupla de valores a mostrar.
+    def __init__(self, parent, columns, row_key, row_cursor, row_values, page_size=100, max_rows=300, height=10):
+        self.row_key = row_key
+        self.row_cursor = row_cursor
+        self.row_values = row_values
+        self.page_size = page_size
+        self.max_rows = max(max_rows, 2 * page_size) # Siempre caben al menos dos páginas.
+
+        # Marco contenedor con la tabla y su barra de desplazamiento.
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", height=height)
+        # Configuramos los encabezados de cada columna.
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100) # Definimos un ancho para cada columna.
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_yscroll)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.page_loader = None
+        self.sync_loader = None
+        self._cursors = {}        # iid de cada fila mostrada -> su clave de paginación.
+        self._keys = {}           # iid de cada fila mostrada -> su clave (ej. idapuesta).
+        self._values = {}         # iid de cada fila mostrada -> los valores que muestra.
+        self._newest_key = None   # Mayor clave recibida desde el último 'reset' (ver 'refresh').
+        self._syncing = False     # Evita pedir varios refrescos a la vez.
+        self._generation = 0      # Aumenta en cada 'reset' para ignorar páginas de cargas anteriores.
+        self._loading = False     # Evita pedir varias páginas a la vez.
+        self._more_before = False # Hay filas más recientes que la primera mostrada (se descartaron).
+        self._more_after = False  # Puede haber filas más antiguas que la última mostrada.
+
+    # Método para empezar a mostrar una nueva fuente de datos (ej. al aplicar un filtro).
+    def reset(self, page_loader, sync_loader=None):
+        self._generation += 1
+        self._drop(self.tree.get_children())
+        self.page_loader = page_loader
+        self.sync_loader = sync_loader
+        self._newest_key = None
+        self._loading = False
+        self._syncing = False
+        self._more_before = False
+        self._more_after = True
+        self._request(before=False)
+
+    # Método para vaciar la tabla (ej. al cerrar sesión).
+    def clear(self):
+        self._generation += 1
+        self._drop(self.tree.get_children())
+        self.page_loader = None
+        self.sync_loader = None
+        self._newest_key = None
+        self._loading = False
+        self._syncing = False
+
+    # Método para refrescar la tabla con los cambios de la fuente de datos, sin volver a cargarla.
+    # Pide las filas con clave mayor que la más nueva recibida y el estado actual de las filas
+    # mostradas (como máximo 'max_rows'), así el costo depende de lo que cambió y de lo que se ve,
+    # no del tamaño del historial.
+    def refresh(self):
+        if self.sync_loader is None or self._syncing or self._loading: # Si llega una página, esperamos.
+            return
+        checked = dict(self._keys) # Filas cuyo estado se consulta (las que lleguen mientras tanto no).
+        self._syncing = True
+        generation = self._generation
+        self.sync_loader(self._newest_key, list(checked.values()), self.page_size,
+                         lambda result: self._on_sync(generation, checked, result))
+
+    # Método para agregar una fila recién creada (la más reciente) sin volver a cargar la tabla.
+    # Si la tabla no está mostrando el principio del historial, no se agrega: llegará con la
+    # página anterior cuando el usuario vuelva a subir.
+    def add_newest(self, row):
+        if self.page_loader is None or self._more_before:
+            return
+        self._upsert(row, 0)
+        excess = len(self.tree.get_children()) - self.max_rows
+        if excess > 0: # Descartamos filas del final; se recuperarán al volver a bajar.
+            self._drop(self.tree.get_children()[-excess:])
+            self._more_after = True
+
+    # Método privado que pide la página siguiente (before=False) o la anterior (before=True).
+    def _request(self, before):
+        if self._loading or self.page_loader is None:
+            return
+        children = self.tree.get_children()
+        cursor = None
+        if children:
+            cursor = self._cursors[children[0] if before else children[-1]]
+        self._loading = True
+        generation = self._generation
+        self.page_loader(cursor, before, self.page_size,
+                         lambda rows: self._on_page(generation, before, rows))
+
+    # Método privado que inserta una página recibida y descarta las filas que sobran.
+    def _on_page(self, generation, before, rows):
+        if generation != self._generation: # La página pertenece a una carga anterior.
+            return
+        self._loading = False
+        rows = rows or []
+        old_count = len(self.tree.get_children())
+        top_index = self.tree.yview()[0] * old_count # Primera fila visible antes de modificar la tabla.
+
+        if before:
+            for index, row in enumerate(rows): # Las filas nuevas van arriba, en su orden.
+                self._upsert(row, index)
+            self._more_before = len(rows) == self.page_size
+            top_index += len(rows)
+            excess = old_count + len(rows) - self.max_rows
+            if excess > 0: # Descartamos filas del final; se recuperarán al volver a bajar.
+                self._drop(self.tree.get_children()[-excess:])
+                self._more_after = True
+        else:
+            for row in rows:
+                self._upsert(row, "end")
+            self._more_after = len(rows) == self.page_size
+            excess = old_count + len(rows) - self.max_rows
+            if excess > 0: # Descartamos filas del principio; se recuperarán al volver a subir.
+                self._drop(self.tree.get_children()[:excess])
+                self._more_before = True
+                top_index -= excess
+
+        # Mantenemos a la vista las mismas filas que el usuario estaba mirando.
+        new_count = len(self.tree.get_children())
+        if new_count and old_count:
+            self.tree.yview_moveto(max(top_index, 0) / new_count)
+
+    # Método privado que aplica un refresco recibido: (filas nuevas, estado actual de las filas 'checked').
+    def _on_sync(self, generation, checked, result):
+        if generation != self._generation: # El refresco pertenece a una carga anterior.
+            return
+        self._syncing = False
+        if not result or result[0] is None or result[1] is None: # Error de la consulta: no cambiamos nada.
+            return
+        new_rows, current_rows = result
+        if len(new_rows) >= self.page_size:
+            # Hay al menos una página de filas nuevas: es más simple (y no más caro) volver a empezar.
+            self.reset(self.page_loader, self.sync_loader)
+            return
+
+        # Filas nuevas: llegan de la más reciente a la más antigua; las agregamos arriba en orden.
+        for row in reversed(new_rows):
+            self.add_newest(row)
+            self._note_key(self.row_key(row)) # Aunque no se muestre (ver 'add_newest'), ya no es nueva.
+
+        # Filas mostradas: se actualizan las que cambiaron y se quitan las que ya no están.
+        current = {str(self.row_key(row)): row for row in current_rows}
+        self._drop([iid for iid in checked if iid not in current and self.tree.exists(iid)])
+        for iid, row in current.items():
+            if self.tree.exists(iid):
+                self._upsert(row, 0)
+
+    # Método privado para insertar una fila usando su identificador como 'iid' del Treeview,
+    # o actualizarla en su lugar si ya está en la tabla (ej. llegó por dos páginas solapadas,
+    # o cambió en la base de datos). Solo se toca el widget si los valores cambiaron.
+    def _upsert(self, row, index):
+        iid = str(self.row_key(row))
+        values = self.row_values(row)
+        if self.tree.exists(iid):
+            if self._values.get(iid) != values:
+                self.tree.item(iid, values=values)
+                self._values[iid] = values
+            self._cursors[iid] = self.row_cursor(row)
+            return
+        self.tree.insert("", index, iid=iid, values=values)
+        self._cursors[iid] = self.row_cursor(row)
+        self._keys[iid] = self.row_key(row)
+        self._values[iid] = values
+        self._note_key(self._keys[iid])
+
+    # Método privado que recuerda la mayor clave recibida.
+    def _note_key(self, key):
+        if self._newest_key is None or key > self._newest_key:
+            self._newest_key = key
+
+    # Método privado para quitar filas de la tabla.
+    def _drop(self, iids):
+        self.tree.delete(*iids)
+        for iid in iids:
+            self._cursors.pop(iid, None)
+            self._keys.pop(iid, None)
+            self._values.pop(iid, None)
+
+    # Método privado que recibe los cambios de desplazamiento del Treeview.
+    # Además de mover la barra, pide más filas cuando el usuario se acerca a un borde.
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        first, last = float(first), float(last)
+        if last >= 1 - SCROLL_EDGE and self._more_after:
+            self._request(before=False)
+        elif first <= SCROLL_EDGE and self._more_before:
+            self._request(before=True)
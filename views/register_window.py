@@ -1,7 +1,8 @@
 
 import tkinter as tk # Importamos la biblioteca principal para crear interfaces gráficas.
 from tkinter import ttk, messagebox, filedialog # Importamos ttk para widgets con estilos modernos, messagebox para mensajes emergentes, y filedialog para abrir diálogos de selección de archivo.
-from tkcalendar import DateEntry # Importamos DateEntry de tkcalendar para un selector de fechas amigable.
+from views.date_picker import LazyDateEntry # Selector de fechas de tkcalendar, que se carga al usarlo por primera vez.
+import base64 # Tkinter recibe los datos de una imagen PNG codificados en base64.
 
 # Importamos el Modelo y el Controlador necesarios para esta vista.
 # Esto es parte del patrón Modelo-Vista-Controlador (MVC).
@@ -24,7 +25,7 @@ class RegisterWindow:
         self.controller = RegisterController(self, UserModel(db))
         
         self.image_path = None       # Almacena la ruta del archivo de imagen seleccionado (para mostrar el nombre).
-        self.image_data = None       # Almacena los datos binarios de la imagen seleccionada.
+        self.preview_image = None    # Referencia a la vista previa de la imagen (PhotoImage).
         
         self.create_widgets() # Llamamos a un método para construir todos los elementos de la GUI.
 
@@ -57,7 +58,7 @@ class RegisterWindow:
         dob_row = len(fields) + 1
         ttk.Label(frame, text="Fecha de Nacimiento:").grid(row=dob_row, column=0, pady=5, padx=5, sticky="w")
         # DateEntry de tkcalendar proporciona un calendario flotante para seleccionar la fecha.
-        self.dob_entry = DateEntry(frame, width=27, background='darkblue', foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd', top_level=self.root)
+        self.dob_entry = LazyDateEntry(frame, width=27, background='darkblue', foreground='white', borderwidth=2, top_level=self.root)
         self.dob_entry.grid(row=dob_row, column=1, pady=5, padx=5)
 
         # --- Sección de Carga de Imagen de Perfil ---
@@ -72,10 +73,14 @@ class RegisterWindow:
         
         # Botón para seleccionar una imagen. Al hacer clic, llama al método 'select_image'.
         ttk.Button(image_frame, text="Seleccionar", command=self.select_image).pack(side="right")
+
+        # Vista previa de la imagen seleccionada.
+        self.preview_label = ttk.Label(frame)
+        self.preview_label.grid(row=image_row + 1, column=1, pady=5, padx=5, sticky="w")
         # --- Fin Sección de Carga de Imagen de Perfil ---
 
         # Botón para registrar al nuevo usuario. Al hacer clic, llama al método 'register'.
-        ttk.Button(frame, text="Registrar", command=self.register).grid(row=len(fields) + 3, column=0, columnspan=2, pady=20)
+        ttk.Button(frame, text="Registrar", command=self.register).grid(row=len(fields) + 4, column=0, columnspan=2, pady=20)
 
     # Método para abrir un diálogo de selección de archivo y cargar la imagen de perfil.
     def select_image(self):
@@ -87,27 +92,49 @@ class RegisterWindow:
         if file_path: # Si el usuario seleccionó un archivo...
             try:
                 with open(file_path, 'rb') as f: # Abrimos el archivo en modo binario de lectura.
-                    self.image_data = f.read() # Leemos los datos binarios de la imagen.
-                self.image_path = file_path # Guardamos la ruta del archivo (para mostrar el nombre).
-                self.image_label.config(text=file_path.split('/')[-1]) # Mostramos solo el nombre del archivo.
+                    image_data = f.read() # Leemos los datos binarios de la imagen.
             except Exception as e: # Capturamos cualquier error al leer la imagen.
                 messagebox.showerror("Error", f"No se pudo leer la imagen: {e}")
-                self.image_data = None
-                self.image_path = None
-                self.image_label.config(text="Ninguna imagen seleccionada")
+                self.clear_image()
+                return
+            self.image_path = file_path # Guardamos la ruta del archivo (para mostrar el nombre).
+            # Mostramos solo el nombre del archivo mientras la imagen se prepara en segundo plano.
+            self.image_label.config(text=f"{file_path.split('/')[-1]} (procesando...)")
+            self.controller.prepare_avatar(image_data)
         else: # Si el usuario canceló la selección o no eligió archivo.
-            self.image_data = None
-            self.image_path = None
-            self.image_label.config(text="Ninguna imagen seleccionada")
+            self.clear_image()
+            self.controller.clear_avatar()
+
+    # Método para mostrar la vista previa de la imagen (una imagen de Pillow).
+    def show_preview(self, img):
+        from PIL import ImageTk # Importamos ImageTk aquí: Pillow solo se carga al elegir una imagen.
+        self.preview_image = ImageTk.PhotoImage(img)
+        self.preview_label.config(image=self.preview_image)
+
+    # Método para mostrar la vista previa a partir de una imagen PNG ya redimensionada.
+    def show_preview_png(self, data):
+        self.preview_image = tk.PhotoImage(data=base64.b64encode(data))
+        self.preview_label.config(image=self.preview_image)
+
+    # Método que se llama cuando la imagen de perfil terminó de prepararse.
+    def on_avatar_ready(self):
+        if self.image_path:
+            self.image_label.config(text=self.image_path.split('/')[-1]) # Mostramos solo el nombre del archivo.
+
+    # Método para quitar la imagen seleccionada del formulario.
+    def clear_image(self):
+        self.image_path = None
+        self.preview_image = None
+        self.preview_label.config(image="")
+        self.image_label.config(text="Ninguna imagen seleccionada")
 
     # Método para limpiar todos los campos del formulario de registro.
     def clear_form(self):
         for entry in self.entries.values():
             entry.delete(0, tk.END) # Borra el contenido de cada campo de entrada.
         self.dob_entry.set_date(None) # Limpia el selector de fecha.
-        self.image_data = None
-        self.image_path = None
-        self.image_label.config(text="Ninguna imagen seleccionada") # Restablece la etiqueta de imagen.
+        self.clear_image() # Restablece la imagen de perfil y su vista previa.
+        self.controller.clear_avatar()
 
     # Método que se ejecuta cuando el usuario hace clic en el botón "Registrar".
     def register(self):
@@ -125,5 +152,5 @@ class RegisterWindow:
             'apodo': data['apodo'],
         }
         
-        # Le pedimos al controlador que intente registrar al usuario con estos datos y la imagen.
-        self.controller.register_user(user_data, self.image_data)
+        # Le pedimos al controlador que intente registrar al usuario con estos datos y la imagen ya preparada.
+        self.controller.register_user(user_data)
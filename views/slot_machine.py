@@ -6,7 +6,8 @@ import random # Importamos random para generar resultados aleatorios en el juego
 # Esto es parte del patrón Modelo-Vista-Controlador (MVC).
 from models.user_model import UserModel
 from models.game_model import GameModel
-from controllers.slot_machine_controller import SlotMachineController
+from models.slot_engine import ALL_SYMBOLS # Símbolos de los rodillos (los mismos que usa el juego).
+from controllers.slot_machine_controller import SlotMachineController, AUTOPLAY_MAX_SPINS
 
 # --- Definición de la Clase SlotMachine ---
 # Esta clase representa la Vista (GUI) para la máquina tragamonedas.
@@ -34,9 +35,9 @@ class SlotMachine:
         self.animation_running = False # Una bandera para saber si la animación de los rodillos está activa.
         self.create_widgets() # Llamamos a un método para construir todos los elementos de la GUI.
         
-        # Si hay un usuario al iniciar, lo configuramos en el controlador.
+        # Si hay un usuario al iniciar, iniciamos la sesión con él.
         if user_placeholder:
-            self.controller.set_current_user(user_placeholder)
+            self.controller.session.login(user_placeholder)
 
     # Método para crear y organizar todos los widgets (rodillos, botones, etiquetas) de la ventana.
     def create_widgets(self):
@@ -78,12 +79,31 @@ class SlotMachine:
 
         # Botón para iniciar el juego. Al hacer clic, llama al método 'play'.
         ttk.Button(frame, text="JUGAR", command=self.play).grid(row=4, column=0, pady=10)
+
+        # --- Juego Automático ---
+        # Varias jugadas seguidas con un solo clic: se resuelven y se guardan juntas.
+        auto_frame = ttk.Frame(frame)
+        auto_frame.grid(row=5, column=0, pady=5)
+        ttk.Label(auto_frame, text="Jugadas:").grid(row=0, column=0, padx=5)
+        self.auto_spins = ttk.Spinbox(auto_frame, from_=1, to=AUTOPLAY_MAX_SPINS, increment=10, width=6)
+        self.auto_spins.grid(row=0, column=1, padx=5)
+        self.auto_spins.set(10) # Valor inicial de la cantidad de jugadas.
+        ttk.Label(auto_frame, text="Límite de pérdida:").grid(row=0, column=2, padx=5)
+        self.loss_limit_entry = ttk.Entry(auto_frame, width=8) # Vacío = sin límite.
+        self.loss_limit_entry.grid(row=0, column=3, padx=5)
+        self.stop_on_win_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(auto_frame, text="Parar al ganar", variable=self.stop_on_win_var).grid(row=1, column=0, columnspan=2, pady=5)
+        self.skip_animation_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(auto_frame, text="Sin animación", variable=self.skip_animation_var).grid(row=1, column=2, columnspan=2, pady=5)
+        ttk.Button(auto_frame, text="AUTO", command=self.autoplay).grid(row=0, column=4, rowspan=2, padx=10)
+        # --- Fin Juego Automático ---
+
         # Botón para volver al panel principal.
-        ttk.Button(frame, text="Volver", command=self.back_to_dashboard).grid(row=5, column=0, pady=5)
+        ttk.Button(frame, text="Volver", command=self.back_to_dashboard).grid(row=6, column=0, pady=5)
 
         # Etiqueta para mostrar el resultado de la jugada (ganaste, perdiste, etc.).
         self.result_label = ttk.Label(frame, text="", font=("Arial", 12))
-        self.result_label.grid(row=6, column=0, pady=10)
+        self.result_label.grid(row=7, column=0, pady=10)
 
     # Método para actualizar el texto del saldo en la pantalla.
     def update_saldo(self, new_saldo):
@@ -97,7 +117,9 @@ class SlotMachine:
         self.animation_running = False # La animación ha terminado.
 
     # Método privado para iniciar la animación de los rodillos.
-    def _start_animation(self, bet_amount):
+    # - on_done: función a llamar cuando los rodillos se detienen (por defecto, una jugada normal).
+    # - animation_duration_ms: duración de la animación.
+    def _start_animation(self, bet_amount, on_done=None, animation_duration_ms=1500):
         if self.animation_running: # Si ya está girando, no hacemos nada.
             return
 
@@ -105,15 +127,15 @@ class SlotMachine:
         self.result_label.config(text="") # Borramos el resultado anterior.
         
         # Símbolos que pueden aparecer en los rodillos durante la animación.
-        symbols = ["🍒", "🍋", "🍊", "🍇", "🔔", "💎", "7️⃣"]
+        symbols = ALL_SYMBOLS
         
-        # Duración y pasos para la animación.
-        animation_duration_ms = 1500 # La animación durará 1.5 segundos.
+        # Pasos de la animación.
         steps_per_reel = 10          # Cada rodillo cambiará de símbolo 10 veces.
         delay_per_step_ms = animation_duration_ms // steps_per_reel # El tiempo entre cada cambio de símbolo.
 
         self.reels_stopped_count = 0 # Contador para saber cuántos rodillos se han detenido.
         self.final_bet_amount = bet_amount # Guardamos la apuesta para cuando termine la animación.
+        self.on_animation_done = on_done or self.controller.play_slot_machine
 
         for i in range(3): # Iniciamos la animación para cada uno de los tres rodillos.
             self._animate_reel(i, symbols, steps_per_reel, delay_per_step_ms)
@@ -129,8 +151,10 @@ class SlotMachine:
             # Cuando el rodillo termina de girar.
             self.reels_stopped_count += 1 # Aumentamos el contador de rodillos detenidos.
             if self.reels_stopped_count == 3: # Si todos los rodillos se han detenido...
+                # Los rodillos ya se detuvieron (aunque el controlador rechace la jugada, se puede volver a jugar).
+                self.animation_running = False
                 # Llamamos al controlador para que calcule el resultado final y lo muestre.
-                self.controller.play_slot_machine(self.final_bet_amount)
+                self.on_animation_done(self.final_bet_amount)
 
     # Método que se ejecuta al presionar el botón "JUGAR".
     def play(self):
@@ -138,6 +162,10 @@ class SlotMachine:
             messagebox.showinfo("Juego en curso", "La máquina ya está girando. Espera a que termine.")
             return
 
+        # Si el juego está en mantenimiento o deshabilitado, ni siquiera iniciamos la animación.
+        if self.controller.get_available_game() is None:
+            return
+
         try:
             bet_amount = float(self.bet.get()) # Obtenemos la cantidad apostada del Spinbox.
             # Iniciamos la animación. El controlador se llamará cuando la animación termine.
@@ -147,6 +175,36 @@ class SlotMachine:
         except Exception as e: # Capturamos cualquier otro error.
             messagebox.showerror("Error", str(e))
 
+    # Método que se ejecuta al presionar el botón "AUTO".
+    # La animación es corta (o ninguna, si se marcó "Sin animación"): se muestra solo el resumen de la tanda.
+    def autoplay(self):
+        if self.animation_running:
+            messagebox.showinfo("Juego en curso", "La máquina ya está girando. Espera a que termine.")
+            return
+        if self.controller.get_available_game() is None:
+            return
+
+        try:
+            bet_amount = float(self.bet.get())
+            spins = int(self.auto_spins.get())
+            limit_text = self.loss_limit_entry.get().strip()
+            loss_limit = float(limit_text) if limit_text else None
+        except ValueError:
+            messagebox.showerror("Error", "Valores inválidos. Revisa la apuesta, las jugadas y el límite de pérdida.")
+            return
+        # Un límite de cero o negativo detendría el juego en la primera jugada.
+        if loss_limit is not None and not loss_limit > 0:
+            messagebox.showerror("Error", "El límite de pérdida debe ser mayor que cero.")
+            return
+
+        def run(amount):
+            self.controller.autoplay(amount, spins, self.stop_on_win_var.get(), loss_limit)
+
+        if self.skip_animation_var.get():
+            run(bet_amount)
+        else:
+            self._start_animation(bet_amount, on_done=run, animation_duration_ms=300)
+
     # Método para volver a la pestaña del Dashboard.
     def back_to_dashboard(self):
         # Seleccionamos la pestaña del Dashboard en el notebook.
@@ -1,13 +1,14 @@
 import tkinter as tk # Importamos la biblioteca principal para crear interfaces gráficas.
 from tkinter import ttk, messagebox, filedialog # Importamos ttk para widgets con estilos modernos, messagebox para mensajes emergentes, y filedialog para abrir diálogos de selección de archivo.
 import datetime # Importamos datetime para trabajar con fechas.
-from tkcalendar import DateEntry # Importamos DateEntry de tkcalendar para un selector de fechas amigable.
+from views.date_picker import LazyDateEntry # Selector de fechas de tkcalendar, que se carga al usarlo por primera vez.
 
 # Importamos los Modelos y el Controlador necesarios para esta vista.
 # Esto es parte del patrón Modelo-Vista-Controlador (MVC).
 from models.user_model import UserModel
 from models.transaction_model import TransactionModel
 from controllers.transaction_controller import TransactionController
+from views.paged_treeview import PagedTreeview
 
 # --- Definición de la Clase TransactionsWindow ---
 # Esta clase representa la Vista (GUI) para mostrar el historial de transacciones del usuario.
@@ -36,6 +37,8 @@ class TransactionsWindow:
         self.payment_method_var = tk.StringVar() # Variable para almacenar el método de pago seleccionado.
         
         self.create_widgets() # Llamamos a un método para construir todos los elementos de la GUI.
+        # 'add' evita reemplazar lo que otras vistas ya asociaron al mismo evento del notebook.
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed, add="+")
         
 
 
@@ -77,12 +80,12 @@ class TransactionsWindow:
 
         # Etiqueta y selector de fecha "Desde".
         ttk.Label(filter_frame, text="Desde:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        self.start_date_entry = DateEntry(filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
+        self.start_date_entry = LazyDateEntry(filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2)
         self.start_date_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
 
         # Etiqueta y selector de fecha "Hasta".
         ttk.Label(filter_frame, text="Hasta:").grid(row=0, column=2, padx=5, pady=5, sticky="w")
-        self.end_date_entry = DateEntry(filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
+        self.end_date_entry = LazyDateEntry(filter_frame, width=12, background='darkblue', foreground='white', borderwidth=2)
         self.end_date_entry.grid(row=0, column=3, padx=5, pady=5, sticky="ew")
 
         # Botón para aplicar el filtro de fechas.
@@ -95,18 +98,29 @@ class TransactionsWindow:
         # --- Tabla (Treeview) para Mostrar Transacciones ---
         # Definimos las columnas que tendrá nuestra tabla de transacciones.
         columns = ("ID", "Tipo", "Monto", "Fecha", "Estado")
-        # Creamos el widget Treeview, que es una tabla avanzada de Tkinter.
-        self.tree = ttk.Treeview(frame, columns=columns, show="headings", height=10)
-
-        # Configuramos los encabezados de cada columna.
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100) # Definimos un ancho para cada columna.
-
-        self.tree.pack(pady=10, fill=tk.BOTH, expand=True) # Empaquetamos la tabla.
+        # Usamos una tabla paginada: solo se cargan las transacciones que el usuario va viendo al desplazarse.
+        self.table = PagedTreeview(
+            frame, columns,
+            row_key=lambda trans: trans['idtransaccion'],
+            row_cursor=lambda trans: (trans['fecha_transaccion'], trans['idtransaccion']),
+            row_values=self._transaction_values,
+            height=10
+        )
+        self.tree = self.table.tree # Acceso directo al Treeview interno.
+        self.table.frame.pack(pady=10, fill=tk.BOTH, expand=True) # Empaquetamos la tabla.
+
+        # --- Progreso de Exportación ---
+        # Barra de progreso que solo se muestra mientras se exporta un reporte.
+        self.progress_frame = ttk.Frame(frame)
+        self.progress_label = ttk.Label(self.progress_frame, text="")
+        self.progress_label.pack(side=tk.LEFT, padx=5)
+        self.progress_bar = ttk.Progressbar(self.progress_frame, orient=tk.HORIZONTAL, mode="determinate", length=300)
+        self.progress_bar.pack(side=tk.LEFT, padx=5, fill="x", expand=True)
+        # --- Fin Progreso de Exportación ---
 
         # Botón para volver al Dashboard.
-        ttk.Button(frame, text="Volver", command=self.back_to_dashboard).pack(pady=10)
+        self.back_button = ttk.Button(frame, text="Volver", command=self.back_to_dashboard)
+        self.back_button.pack(pady=10)
 
     # Metodo de validación para asegurar que la entrada sea numerica
     # Se usa con 'validatecommand' en los campos de entrada.
@@ -120,20 +134,35 @@ class TransactionsWindow:
             return False            # Si falla, no es numérico.
 
     # Método para mostrar las transacciones en la tabla (Treeview).
-    def display_transactions(self, transactions):
-        # Limpiamos cualquier entrada existente en la tabla antes de añadir nuevas.
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Insertamos cada transacción en la tabla.
-        for trans in transactions:
-            self.tree.insert("", "end", values=(
-                trans['idtransaccion'],
-                trans['tipo'],
-                f"${trans['monto_transaccion']:.2f}", # Formateamos el monto como moneda.
-                trans['fecha_transaccion'],
-                trans['estado']
-            ))
+    # Recibe la función que obtiene cada página de transacciones; la tabla la llama al desplazarse.
+    # Recibe también la función que obtiene los cambios, que la tabla usa al refrescarse.
+    def display_transactions(self, page_loader, sync_loader=None):
+        self.table.reset(page_loader, sync_loader)
+
+    # Método para refrescar la tabla con los cambios (filas nuevas, modificadas o borradas), sin recargarla.
+    def refresh_transactions(self):
+        self.table.refresh()
+
+    # Método que se ejecuta al cambiar de pestaña: si el usuario vuelve a esta pestaña, refrescamos
+    # las transacciones (pueden haber cambiado, ej. desde otra terminal con la misma cuenta).
+    def on_tab_changed(self, event):
+        if self.notebook.select() == str(self.root):
+            self.controller.refresh_user_transactions()
+
+    # Método para agregar una transacción recién registrada al principio de la tabla.
+    def add_transaction(self, transaction):
+        self.table.add_newest(transaction)
+
+    # Método que convierte una transacción en los valores de una fila de la tabla.
+    @staticmethod
+    def _transaction_values(trans):
+        return (
+            trans['idtransaccion'],
+            trans['tipo'],
+            f"${trans['monto_transaccion']:.2f}", # Formateamos el monto como moneda.
+            trans['fecha_transaccion'],
+            trans['estado']
+        )
 
     # Método para cargar las transacciones del usuario.
     # Simplemente delega la tarea al controlador.
@@ -170,45 +199,37 @@ class TransactionsWindow:
 
     # Método que se ejecuta cuando el usuario hace clic en "Exportar a PDF".
     def export_to_pdf(self):
-        # Obtenemos las transacciones actualmente mostradas en la tabla.
-        # Asumimos que la tabla refleja con precisión los datos filtrados.
-        transactions_to_export = []
-        for item_id in self.tree.get_children():
-            values = self.tree.item(item_id, 'values')
-            # Reconstruimos un diccionario de transacción para el exportador.
-            transactions_to_export.append({
-                'idtransaccion': values[0],
-                'tipo': values[1],
-                'metododepago': "N/A", # El método de pago no está directamente en la tabla, lo marcamos como N/A.
-                'monto_transaccion': float(values[2].replace('$', '')), # Convertimos el monto a float, quitando el '$’.
-                'fecha_transaccion': values[3],
-                'estado': values[4]
-            })
-        
         # Abrimos un diálogo para que el usuario elija dónde guardar el archivo PDF.
         file_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF files", "*.pdf")])
         if file_path: # Si el usuario seleccionó una ruta...
-            self.controller.export_transactions_to_pdf(transactions_to_export, file_path) # Le pedimos al controlador que exporte.
+            # El controlador genera el reporte del filtro actual en un proceso aparte.
+            self.controller.export_transactions_to_pdf(file_path)
 
     # Método que se ejecuta cuando el usuario hace clic en "Exportar a Excel".
     def export_to_excel(self):
-        # Obtenemos las transacciones actualmente mostradas en la tabla.
-        transactions_to_export = []
-        for item_id in self.tree.get_children():
-            values = self.tree.item(item_id, 'values')
-            transactions_to_export.append({
-                'idtransaccion': values[0],
-                'tipo': values[1],
-                'metododepago': "N/A", # El método de pago no está directamente en la tabla, lo marcamos como N/A.
-                'monto_transaccion': float(values[2].replace('$', '')), # Convertimos el monto a float, quitando el '$’.
-                'fecha_transaccion': values[3],
-                'estado': values[4]
-            })
-
         # Abrimos un diálogo para que el usuario elija dónde guardar el archivo Excel.
         file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")])
         if file_path: # Si el usuario seleccionó una ruta...
-            self.controller.export_transactions_to_excel(transactions_to_export, file_path) # Le pedimos al controlador que exporte.
+            # El controlador lee las transacciones del filtro actual y escribe el archivo en segundo plano.
+            self.controller.export_transactions_to_excel(file_path)
+
+    # Método para mostrar el avance de una exportación ('total' es None mientras se cuenta).
+    def show_export_progress(self, done, total):
+        if not self.progress_frame.winfo_ismapped():
+            self.progress_frame.pack(pady=5, fill="x", before=self.back_button)
+        if total:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate", maximum=total, value=done)
+            self.progress_label.configure(text=f"Exportando {done} de {total} transacciones...")
+        else:
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+            self.progress_label.configure(text="Preparando exportación...")
+
+    # Método para ocultar la barra de progreso al terminar la exportación.
+    def hide_export_progress(self):
+        self.progress_bar.stop()
+        self.progress_frame.pack_forget()
 
     # Método para volver a la pestaña del Dashboard.
     def back_to_dashboard(self):
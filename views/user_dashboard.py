@@ -5,10 +5,9 @@ from tkinter import ttk # Importamos ttk para widgets con estilos modernos.
 # Esto es parte del patrón Modelo-Vista-Controlador (MVC).
 from models.user_model import UserModel
 from controllers.dashboard_controller import DashboardController
+from views.avatar_cache import AvatarCache
 
-# Importamos clases de la biblioteca Pillow (PIL) para manipulación de imágenes.
-from PIL import Image, ImageTk, ImageDraw
-import io # Importamos io para trabajar con datos binarios de la imagen en memoria.
+import base64 # Tkinter recibe los datos de la imagen PNG codificados en base64.
 
 # --- Definición de la Clase UserDashboard ---
 # Esta clase representa la Vista (GUI) para el panel de usuario (Dashboard).
@@ -35,38 +34,42 @@ class UserDashboard:
         self.age_label = None
         self.profile_image_label = None
         self.tk_image = None         # Referencia a la imagen de perfil del usuario (PhotoImage).
+        self.avatar_cache = AvatarCache() # Imágenes de perfil ya decodificadas, por usuario y huella.
+        self.avatar_key = None       # (id de usuario, huella) de la imagen que se debe mostrar.
         self.placeholder_tk_image = None # Referencia a la imagen de placeholder.
         
         self._create_placeholder_image() # Llamamos a un método para crear la imagen de placeholder.
 
         self.create_widgets() # Llamamos a un método para construir todos los elementos de la GUI.
         
-        # Si se pasa un usuario al inicializar, lo establecemos en el controlador.
+        # Si se pasa un usuario al inicializar, iniciamos la sesión con él.
         if user_placeholder:
-            self.controller.set_current_user(user_placeholder)
+            self.controller.session.login(user_placeholder)
 
     # Método privado para crear la imagen de placeholder.
     # Intenta cargar una imagen desde 'assets/placeholder.png'; si falla, crea una por defecto.
+    # Tkinter lee el PNG por su cuenta (sin Pillow, que así no se carga al iniciar la aplicación)
+    # y lo reduce por un factor entero hasta que quepa en 100x100.
     def _create_placeholder_image(self):
         placeholder_path = "assets/placeholder.png" # Ruta esperada para la imagen de placeholder.
         try:
-            img = Image.open(placeholder_path) # Intentamos abrir la imagen.
-            img.thumbnail((100, 100), Image.Resampling.LANCZOS) # Redimensionamos la imagen.
-            self.placeholder_tk_image = ImageTk.PhotoImage(img) # Convertimos a formato PhotoImage para Tkinter.
-        except FileNotFoundError:
-            print(f"WARNING: Placeholder image not found at {placeholder_path}. Using default.")
-            # Si el archivo no se encuentra, creamos una imagen de placeholder por defecto.
-            img = Image.new('RGB', (100, 100), color = 'lightgray')
-            d = ImageDraw.Draw(img)
-            d.text((10,40), "No Photo", fill=(0,0,0))
-            self.placeholder_tk_image = ImageTk.PhotoImage(img)
-        except Exception as e:
-            print(f"WARNING: Error loading placeholder image: {e}. Using default.")
-            # Si ocurre otro error al cargar la imagen, también usamos la por defecto.
-            img = Image.new('RGB', (100, 100), color = 'lightgray')
-            d = ImageDraw.Draw(img)
-            d.text((10,40), "No Photo", fill=(0,0,0))
-            self.placeholder_tk_image = ImageTk.PhotoImage(img)
+            img = tk.PhotoImage(file=placeholder_path) # Intentamos abrir la imagen.
+            factor = -(-max(img.width(), img.height()) // 100) # Redondeo hacia arriba.
+            self.placeholder_tk_image = img.subsample(factor) if factor > 1 else img
+        except tk.TclError as e:
+            print(f"WARNING: Error loading placeholder image {placeholder_path}: {e}. Using default.")
+            # Si el archivo no se encuentra o no se puede leer, creamos una imagen de placeholder por defecto.
+            self.placeholder_tk_image = self._default_placeholder_image()
+
+    # Método privado que dibuja la imagen de placeholder por defecto (un recuadro gris con "No Photo").
+    @staticmethod
+    def _default_placeholder_image():
+        # Importamos Pillow aquí: solo hace falta si no se encontró el archivo del placeholder.
+        from PIL import Image, ImageTk, ImageDraw
+        img = Image.new('RGB', (100, 100), color = 'lightgray')
+        d = ImageDraw.Draw(img)
+        d.text((10,40), "No Photo", fill=(0,0,0))
+        return ImageTk.PhotoImage(img)
 
     # Método para crear y organizar todos los widgets del Dashboard.
     def create_widgets(self):
@@ -118,27 +121,47 @@ class UserDashboard:
             self.age_label.config(text=f"Edad: {self.user_data['edad']}")
 
             # --- Mostrar Imagen de Perfil ---
-            if self.user_data['ruta_imagen']: # Si el usuario tiene una imagen de perfil...
-                print(f"DEBUG: ruta_imagen is not empty. Type: {type(self.user_data['ruta_imagen'])}, Length: {len(self.user_data['ruta_imagen']) if self.user_data['ruta_imagen'] else 'None'}")
-                try:
-                    # Abrimos la imagen desde los datos binarios.
-                    img = Image.open(io.BytesIO(self.user_data['ruta_imagen']))
-                    img.thumbnail((100, 100), Image.Resampling.LANCZOS) # Redimensionamos para mostrar.
-                    self.tk_image = ImageTk.PhotoImage(img) # Convertimos a PhotoImage.
-                    self.profile_image_label.config(image=self.tk_image) # Mostramos la imagen.
-                except Exception as e:
-                    print(f"Error al cargar la imagen de perfil: {e}")
-                    self.profile_image_label.config(image=self.placeholder_tk_image) # Si hay error, mostramos el placeholder.
-            else: # Si el usuario no tiene imagen de perfil...
-                self.profile_image_label.config(image=self.placeholder_tk_image) # Mostramos el placeholder.
+            self.show_avatar(self.user_data['idcedula'], self.user_data['avatar_hash'])
         else: # Si no hay datos de usuario (ej. no logueado)...
             # Restablecemos las etiquetas y mostramos el placeholder.
             self.welcome_label.config(text="👋 Bienvenido")
             self.balance_label.config(text="Saldo: $0.00")
             self.email_label.config(text="Email: ")
             self.age_label.config(text="Edad: ")
+            self.avatar_key = None
             self.profile_image_label.config(image=self.placeholder_tk_image)
 
+    # Método para mostrar la imagen de perfil de un usuario.
+    # Si ya está en la caché (mismo usuario y misma huella) se muestra sin ningún trabajo;
+    # si no, se le pide al controlador que la descargue y se mostrará al llegar (ver 'set_avatar').
+    def show_avatar(self, user_id, image_hash):
+        self.avatar_key = (user_id, image_hash)
+        if not image_hash: # Si el usuario no tiene imagen de perfil...
+            self.profile_image_label.config(image=self.placeholder_tk_image) # Mostramos el placeholder.
+            return
+        photo = self.avatar_cache.get(user_id, image_hash)
+        if photo is not None:
+            self.tk_image = photo
+            self.profile_image_label.config(image=self.tk_image)
+            return
+        self.profile_image_label.config(image=self.placeholder_tk_image) # Placeholder mientras llega la imagen.
+        self.controller.load_avatar(user_id, image_hash)
+
+    # Método que recibe una imagen de perfil (PNG ya redimensionado al tamaño del Dashboard)
+    # y la guarda en la caché. Tkinter muestra el PNG directamente: no hay que decodificarlo con Pillow.
+    def set_avatar(self, user_id, image_hash, data):
+        if not data:
+            return
+        try:
+            photo = tk.PhotoImage(data=base64.b64encode(data)) # Convertimos a PhotoImage.
+        except Exception as e:
+            print(f"Error al cargar la imagen de perfil: {e}")
+            return
+        self.avatar_cache.put(user_id, image_hash, data, photo)
+        if self.avatar_key == (user_id, image_hash): # Solo la mostramos si sigue siendo la del usuario actual.
+            self.tk_image = photo
+            self.profile_image_label.config(image=self.tk_image) # Mostramos la imagen.
+
     # Método para cambiar a la pestaña de la máquina tragamonedas.
     def open_slots(self):
         self.notebook.select(3) # Seleccionamos la cuarta pestaña (índice 3).